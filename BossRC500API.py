@@ -0,0 +1,442 @@
+"""
+Boss RC-500 Python API
+----------------------
+Objects for scripts and notebooks, so they don't have to walk ROLAND/WAVE
+or parse MEMORY1.RC0 themselves:
+
+    import BossRC500API as rc
+
+    pedal = rc.Pedal.open()                 # detect, or Pedal.open("E:/")
+    mem = pedal.memories[42]
+    mem.name, mem.tempo, mem.time_signature
+    track = mem.tracks[0]
+    track.duration, track.sample_rate       # from the WAV header
+    track.digest                            # SHA-256 of the file
+    track.levels, track.silent, track.peaks()
+
+    backup = rc.Backup.open("Backups/Boss RC-500 Backup 2026-10-19")
+    for track in backup.tracks.load_levels():
+        print(track.file, track.levels['lufs'])
+
+Nothing is read until it is used, and everything that is read is kept:
+opening a pedal touches no files, mem.name parses MEMORY1.RC0 once for all
+memories, mem.tracks lists only that memory's folders, and track.duration
+reads only the WAV header. Call refresh() to forget cached values.
+
+For many tracks at once, TrackList.load_info() / load_digests() read the
+headers or files on a thread pool, and load_levels() / load_silence() /
+load_peaks() run on the process pool used by the analysis features (numpy
+needed). Values loaded in bulk are the same ones the properties return.
+
+Backup.open() understands backup folders, archives (zip / tar.xz) and dedup
+store snapshots. Tracks in an archive or snapshot have no file on disk, so
+only the index fields (file, slot, track, size) are available for those.
+
+Copyright (C) 2026 [pmonk.com]
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import os
+import json
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+
+import BossRC500Core as rc_core
+import BossRC500Audio as rc_audio
+import BossRC500Archive as rc_archive
+import BossRC500Store as rc_store
+import BossRC500Sync as rc_sync
+
+# Threads for header reads and hashing (I/O bound)
+IO_WORKERS = 8
+
+
+class lazy:
+    """Property computed on first access and then stored on the instance."""
+
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+        value = obj.__dict__[self.name] = self.func(obj)
+        return value
+
+def _forget(obj):
+    """Drops every cached lazy value of obj."""
+    for klass in type(obj).__mro__:
+        for name, attr in vars(klass).items():
+            if isinstance(attr, lazy):
+                obj.__dict__.pop(name, None)
+
+# --- TRACKS ---
+
+class Track:
+    """One WAV file: a pedal track or a track in a backup."""
+
+    def __init__(self, slot, track, path=None, file=None, memory=None, size=None, silent=None):
+        self.slot = slot
+        self.track = str(track)
+        self.path = path
+        self.memory = memory
+        if file is not None:
+            self.__dict__['file'] = file
+        if size is not None:
+            self.__dict__['size'] = size
+        if silent is not None:
+            self.__dict__['silent'] = silent
+        self._peaks = {}
+
+    def __repr__(self):
+        return f"<Track {self.slot:03d}_{self.track} {self.file!r}>"
+
+    def _require_file(self):
+        if not self.path:
+            raise ValueError(f"{self.file} is inside an archive or snapshot; restore or extract it first")
+        return self.path
+
+    @lazy
+    def file(self):
+        """Export filename (001_Name_120bpm_4-4_Track_1.wav)."""
+        metadata = self.memory.source.metadata if self.memory else {}
+        return rc_core.build_export_name(f"{self.slot:03d}", self.track, metadata)
+
+    @lazy
+    def size(self):
+        return os.path.getsize(self._require_file())
+
+    @lazy
+    def info(self):
+        """WAV header: format, channels, sample_rate, bits, frames, duration, data_offset, data_size."""
+        return rc_audio.read_wav_info(self._require_file())
+
+    @property
+    def sample_rate(self):
+        return self.info['sample_rate']
+
+    @property
+    def channels(self):
+        return self.info['channels']
+
+    @property
+    def bits(self):
+        return self.info['bits']
+
+    @property
+    def duration(self):
+        return self.info['duration']
+
+    @lazy
+    def digest(self):
+        """SHA-256 of the whole file (the checksum used by Library Sync)."""
+        return rc_sync.file_digest(self._require_file())
+
+    @lazy
+    def levels(self):
+        """Peak / RMS / LUFS / clipped samples (needs numpy)."""
+        return rc_audio.analyze_track(self._require_file())
+
+    @lazy
+    def silent(self):
+        return rc_audio.is_silent(self._require_file())
+
+    def peaks(self, points=rc_audio.PEAK_POINTS):
+        """Waveform overview: peak level of points equal slices (needs numpy)."""
+        if points not in self._peaks:
+            self._peaks[points] = rc_audio.waveform_peaks(self._require_file(), points)
+        return self._peaks[points]
+
+    def refresh(self):
+        _forget(self)
+        self._peaks = {}
+
+class TrackList(list):
+    """A list of tracks with bulk loaders. Each loader returns the list itself."""
+
+    def files(self):
+        """Tracks that have a file on disk."""
+        return [t for t in self if t.path]
+
+    def _missing(self, name):
+        return [t for t in self.files() if name not in t.__dict__]
+
+    def _threaded(self, name, func, jobs):
+        todo = self._missing(name)
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            for t, value in zip(todo, pool.map(lambda t: _try(func, t.path), todo)):
+                if not isinstance(value, Exception):
+                    t.__dict__[name] = value
+        return self
+
+    def load_info(self, jobs=IO_WORKERS):
+        """Reads the WAV headers of all tracks (a few hundred bytes each)."""
+        return self._threaded('info', rc_audio.read_wav_info, jobs)
+
+    def load_digests(self, jobs=IO_WORKERS):
+        return self._threaded('digest', rc_sync.file_digest, jobs)
+
+    def load_levels(self, jobs=None):
+        todo = self._missing('levels')
+        results = rc_audio.analyze_files([t.path for t in todo], jobs) if todo else {}
+        for t in todo:
+            if 'error' not in results[t.path]:
+                t.__dict__['levels'] = results[t.path]
+        return self
+
+    def load_silence(self, threshold_db=rc_audio.SILENCE_THRESHOLD_DB, jobs=None):
+        todo = self._missing('silent')
+        silent = rc_audio.find_silent([t.path for t in todo], threshold_db, jobs) if todo else set()
+        for t in todo:
+            t.__dict__['silent'] = t.path in silent
+        return self
+
+    def load_peaks(self, points=rc_audio.PEAK_POINTS, jobs=None):
+        todo = [t for t in self.files() if points not in t._peaks]
+        results = rc_audio.peaks_files([t.path for t in todo], points, jobs) if todo else {}
+        for t in todo:
+            if isinstance(results[t.path], list):
+                t._peaks[points] = results[t.path]
+        return self
+
+    def by_slot(self, slots):
+        slots = set(slots)
+        return TrackList(t for t in self if t.slot in slots)
+
+def _try(func, path):
+    try:
+        return func(path)
+    except Exception as e:
+        return e
+
+# --- MEMORIES ---
+
+class Memory:
+    """One memory slot: name, tempo, time signature and its tracks."""
+
+    def __init__(self, source, slot):
+        self.source = source
+        self.slot = slot
+
+    def __repr__(self):
+        return f"<Memory {self.slot:03d} {self.name!r} {self.data.get('bpm', '')} {self.time_signature}>"
+
+    @property
+    def data(self):
+        """The parsed metadata dict (name, bpm, bpm_raw, ts, ts_raw, pattern, kit)."""
+        return self.source.metadata.get(self.slot, {})
+
+    @property
+    def name(self):
+        return self.data.get('name', "")
+
+    @property
+    def tempo(self):
+        """Stored tempo in BPM (float)."""
+        return self.data.get('bpm_raw', 0)
+
+    @property
+    def beat(self):
+        """Raw time signature value from MEMORY1.RC0."""
+        return self.data.get('ts_raw', "")
+
+    @property
+    def time_signature(self):
+        return self.data.get('ts', "")
+
+    @property
+    def pattern(self):
+        return self.data.get('pattern', "")
+
+    @property
+    def kit(self):
+        return self.data.get('kit', "")
+
+    @lazy
+    def tracks(self):
+        return TrackList(self.source.tracks_for(self))
+
+    def refresh(self):
+        _forget(self)
+
+class Memories(Mapping):
+    """Slot -> Memory. Memory objects are created when first looked up."""
+
+    def __init__(self, source):
+        self.source = source
+        self.cache = {}
+
+    def slots(self):
+        return sorted(set(self.source.metadata) | set(self.source.slots_with_tracks()))
+
+    def __getitem__(self, slot):
+        if slot not in self.cache:
+            if slot not in self.source.metadata and slot not in self.source.slots_with_tracks():
+                raise KeyError(slot)
+            self.cache[slot] = Memory(self.source, slot)
+        return self.cache[slot]
+
+    def __iter__(self):
+        return iter(self.slots())
+
+    def __len__(self):
+        return len(self.slots())
+
+    def with_tracks(self):
+        """Memories that hold at least one track."""
+        return [self[s] for s in sorted(self.source.slots_with_tracks())]
+
+class _Source:
+    """Shared by Pedal and Backup: lazy metadata, memories and tracks."""
+
+    @lazy
+    def memories(self):
+        return Memories(self)
+
+    @property
+    def tracks(self):
+        """All tracks, in slot order. Lists folders once; nothing else is read."""
+        return TrackList(t for m in self.memories.with_tracks() for t in m.tracks)
+
+    def refresh(self):
+        _forget(self)
+
+# --- PEDAL ---
+
+class Pedal(_Source):
+    """The pedal's ROLAND/WAVE folder and MEMORY1.RC0."""
+
+    def __init__(self, wave_dir):
+        self.wave_dir = os.path.abspath(wave_dir)
+
+    def __repr__(self):
+        return f"<Pedal {self.wave_dir}>"
+
+    @classmethod
+    def open(cls, path=None):
+        """Opens the pedal at path (drive, mount point or ROLAND/WAVE), else RC500_DRIVE or a drive scan."""
+        if path and os.path.basename(os.path.normpath(path)).upper() == "WAVE" and os.path.isdir(path):
+            return cls(path)
+        wave_dir = rc_core.find_pedal([path] if path else None)
+        if not wave_dir:
+            raise FileNotFoundError(f"Boss RC-500 not found{' at ' + path if path else ''}")
+        return cls(wave_dir)
+
+    @lazy
+    def metadata(self):
+        """{slot: memory dict} parsed from MEMORY1.RC0."""
+        return rc_core.parse_metadata(self.wave_dir, None)
+
+    @lazy
+    def folders(self):
+        """{slot: [track folder paths]} from one listing of ROLAND/WAVE."""
+        folders = {}
+        with os.scandir(self.wave_dir) as it:
+            for entry in it:
+                parts = entry.name.split("_")
+                if entry.is_dir() and len(parts) >= 2 and parts[0].isdigit():
+                    folders.setdefault(int(parts[0]), []).append(entry.path)
+        return {slot: sorted(paths) for slot, paths in folders.items()}
+
+    def slots_with_tracks(self):
+        return self.folders.keys()
+
+    def tracks_for(self, memory):
+        tracks = []
+        for folder in self.folders.get(memory.slot, []):
+            track_num = os.path.basename(folder).split("_")[1]
+            with os.scandir(folder) as it:
+                for entry in sorted(it, key=lambda e: e.name):
+                    if entry.name.lower().endswith(".wav"):
+                        tracks.append(Track(memory.slot, track_num, entry.path, memory=memory,
+                                            size=entry.stat().st_size))
+        return tracks
+
+# --- BACKUPS ---
+
+class Backup(_Source):
+    """A backup folder, archive or dedup store snapshot."""
+
+    def __init__(self, path, kind):
+        self.path = os.path.abspath(path)
+        self.kind = kind
+
+    def __repr__(self):
+        return f"<Backup {self.kind} {self.path}>"
+
+    @classmethod
+    def open(cls, path):
+        if os.path.isdir(path):
+            return cls(path, "folder")
+        if rc_archive.archive_format(path):
+            return cls(path, "archive")
+        if rc_store.is_snapshot(path):
+            return cls(path, "snapshot")
+        raise ValueError(f"Not a backup folder, archive or snapshot: {path}")
+
+    @classmethod
+    def scan(cls, folder):
+        """Every backup directly inside folder (plus the snapshots of a dedup store there)."""
+        found = []
+        for entry in sorted(os.scandir(folder), key=lambda e: e.name):
+            if entry.is_dir() and entry.name == rc_store.STORE_NAME:
+                snap_dir = os.path.join(entry.path, "snapshots")
+                if os.path.isdir(snap_dir):
+                    found += [cls(os.path.join(snap_dir, f), "snapshot") for f in sorted(os.listdir(snap_dir))
+                              if f.endswith(rc_store.SNAPSHOT_EXT)]
+            elif entry.is_dir() and os.path.exists(os.path.join(entry.path, rc_core.MANIFEST_NAME)):
+                found.append(cls(entry.path, "folder"))
+            elif rc_archive.archive_format(entry.path):
+                found.append(cls(entry.path, "archive"))
+        return found
+
+    @lazy
+    def manifest(self):
+        """The manifest / index dict. Folders without one are read from their filenames."""
+        if self.kind == "archive":
+            manifest = rc_archive.read_index(self.path)
+            if manifest is None:
+                raise ValueError(f"No index found in {self.path}")
+            return manifest
+        if self.kind == "snapshot":
+            return rc_store.load_snapshot(self.path)
+        path = os.path.join(self.path, rc_core.MANIFEST_NAME)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return {'memories': {}, 'tracks': rc_core.tracks_from_folder(self.path)}
+
+    @property
+    def generated(self):
+        return self.manifest.get('generated', "")
+
+    @property
+    def source(self):
+        return self.manifest.get('source', "")
+
+    @lazy
+    def metadata(self):
+        return {int(k): v for k, v in self.manifest.get('memories', {}).items()}
+
+    @lazy
+    def entries(self):
+        """{slot: [manifest track entries]}"""
+        by_slot = {}
+        for t in self.manifest.get('tracks', []):
+            by_slot.setdefault(t['slot'], []).append(t)
+        return by_slot
+
+    def slots_with_tracks(self):
+        return self.entries.keys()
+
+    def tracks_for(self, memory):
+        folder = self.path if self.kind == "folder" else None
+        return [Track(memory.slot, t['track'], os.path.join(folder, t['file']) if folder else None,
+                      file=t['file'], memory=memory, size=t.get('size'), silent=t.get('silent'))
+                for t in sorted(self.entries.get(memory.slot, []), key=lambda t: str(t['track']))]
@@ -0,0 +1,146 @@
+"""
+Boss RC-500 Backup Archives
+---------------------------
+Streams a backup straight into one compressed archive and restores
+selected slots from it without extracting the whole thing.
+
+- ZIP (deflate): each member can be opened directly through the central
+  directory, so restoring a few slots only reads those tracks.
+- TAR.XZ (lzma): smaller, but only readable front to back; restore makes a
+  single sequential pass and writes out just the selected tracks.
+
+Every archive carries an index member (the same JSON as RC500_Manifest.json)
+so its contents can be listed without touching the audio.
+
+Copyright (C) 2026 [pmonk.com]
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import io
+import os
+import json
+import time
+import shutil
+import tarfile
+import zipfile
+
+ARCHIVE_FORMATS = {
+    "zip": ".zip",
+    "tar.xz": ".tar.xz",
+}
+
+INDEX_MEMBER = "RC500_Index.json"
+
+# Copy buffer for streaming members in and out of archives
+COPY_BUFFER = 1024 * 1024
+
+
+def archive_format(path):
+    """Returns the ARCHIVE_FORMATS key for a path, or None if it isn't an archive."""
+    lower = path.lower()
+    for fmt, ext in ARCHIVE_FORMATS.items():
+        if lower.endswith(ext):
+            return fmt
+    return None
+
+class ArchiveWriter:
+    """Adds files and in-memory members to a zip or tar.xz archive as a single sequential write."""
+
+    def __init__(self, path, fmt):
+        if fmt not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unknown archive format: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        if fmt == "zip":
+            self.archive = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True)
+        else:
+            self.archive = tarfile.open(path, "w:xz")
+
+    def add_file(self, src, arcname):
+        """Streams a file from disk (or the pedal) into the archive."""
+        if self.fmt == "zip":
+            self.archive.write(src, arcname)
+        else:
+            self.archive.add(src, arcname, recursive=False)
+        return os.path.getsize(src)
+
+    def add_bytes(self, arcname, data):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if self.fmt == "zip":
+            self.archive.writestr(arcname, data)
+        else:
+            info = tarfile.TarInfo(arcname)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self.archive.addfile(info, io.BytesIO(data))
+
+    def add_index(self, manifest):
+        self.add_bytes(INDEX_MEMBER, json.dumps(manifest, indent=2))
+
+    def close(self):
+        self.archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def read_index(path):
+    """Returns the index (manifest dict) stored in an archive, or None."""
+    if archive_format(path) == "zip":
+        with zipfile.ZipFile(path) as zf:
+            try:
+                return json.loads(zf.read(INDEX_MEMBER).decode("utf-8"))
+            except KeyError:
+                return None
+
+    # The tools write the index as the first member, so this stops early
+    with tarfile.open(path, "r|xz") as tf:
+        for member in tf:
+            if member.name == INDEX_MEMBER:
+                return json.loads(tf.extractfile(member).read().decode("utf-8"))
+    return None
+
+def extract_members(path, wanted, logger_func=None):
+    """
+    Streams selected members out of an archive without extracting the rest.
+
+    wanted maps member name -> destination path. Yields (member name,
+    destination) as each one is written. ZIP members are opened directly;
+    TAR.XZ is read in one sequential pass.
+    """
+    remaining = dict(wanted)
+
+    if archive_format(path) == "zip":
+        with zipfile.ZipFile(path) as zf:
+            for name, dest in remaining.items():
+                try:
+                    src = zf.open(name)
+                except KeyError:
+                    if logger_func: logger_func(f"Not in archive: {name}")
+                    continue
+                with src, open(dest, "wb") as out:
+                    shutil.copyfileobj(src, out, COPY_BUFFER)
+                yield name, dest
+        return
+
+    with tarfile.open(path, "r|xz") as tf:
+        for member in tf:
+            if not remaining:
+                break
+            dest = remaining.pop(member.name, None)
+            if dest is None or not member.isfile():
+                continue
+            with tf.extractfile(member) as src, open(dest, "wb") as out:
+                shutil.copyfileobj(src, out, COPY_BUFFER)
+            yield member.name, dest
+
+    if logger_func:
+        for name in remaining:
+            logger_func(f"Not in archive: {name}")
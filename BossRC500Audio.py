@@ -0,0 +1,928 @@
+"""
+Boss RC-500 Audio Helpers
+-------------------------
+Shared WAV reading and level analysis used by the RC-500 tools.
+
+- Reads the pedal's WAV files (PCM 8/16/24/32-bit and 32/64-bit float)
+  in fixed-size blocks so whole files never have to fit in memory.
+- Computes peak, RMS, approximate integrated loudness (ITU-R BS.1770 style)
+  and clipped-sample counts with vectorized numpy math.
+- Detects silent/empty tracks, exiting on the first block with real audio.
+- Computes waveform overviews (peak level per slice of a track).
+- Fingerprints tracks so duplicate loops can be found across slots and backups.
+- Estimates tempo from onset autocorrelation and the measured loop length.
+- Transcodes tracks to other bit depths and sample rates, block by block.
+- Renders per-memory stereo mixdowns and multichannel stem files.
+- Spreads work across a process pool so a full pedal is analyzed in seconds.
+
+numpy is an optional dependency: the backup/restore/delete tools work without
+it, only the analysis features need it (pip install numpy).
+
+Copyright (C) 2026 [pmonk.com]
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import os
+import math
+import json
+import struct
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAVE_NUMPY = np is not None
+
+# Frames read per block. Large enough to keep numpy busy, small enough that
+# even a long stereo loop stays at a few MB of memory per worker.
+BLOCK_FRAMES = 1 << 16
+
+# Anything at or above this (normalized) level counts as a clipped sample.
+CLIP_LEVEL = 1.0 - 1e-4
+
+# Tracks whose peak never rises above this are treated as silent.
+SILENCE_THRESHOLD_DB = -60.0
+
+# Short windows probed across a track before streaming the whole thing.
+SILENCE_PROBES = 8
+SILENCE_PROBE_FRAMES = 4096
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def require_numpy():
+    if not HAVE_NUMPY:
+        raise RuntimeError("numpy is required for audio analysis (pip install numpy).")
+
+# --- WAV READING ---
+
+def read_wav_info(path):
+    """Parses the RIFF header and returns format info plus data chunk location."""
+    with open(path, 'rb') as f:
+        riff = f.read(12)
+        if len(riff) < 12 or riff[:4] != b'RIFF' or riff[8:12] != b'WAVE':
+            raise ValueError(f"Not a WAV file: {os.path.basename(path)}")
+
+        info = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                break
+            chunk_id, chunk_size = struct.unpack('<4sI', header)
+
+            if chunk_id == b'fmt ':
+                fmt = f.read(chunk_size)
+                tag, channels, rate, _, block_align, bits = struct.unpack('<HHIIHH', fmt[:16])
+                if tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+                    # First two bytes of the SubFormat GUID hold the real format tag
+                    tag = struct.unpack('<H', fmt[24:26])[0]
+                info = {
+                    'format': tag,
+                    'channels': channels,
+                    'sample_rate': rate,
+                    'bits': bits,
+                    'block_align': block_align,
+                }
+            elif chunk_id == b'data':
+                if info is None:
+                    raise ValueError(f"Missing fmt chunk: {os.path.basename(path)}")
+                data_offset = f.tell()
+                # Trust the file size over the header for truncated recordings
+                data_size = min(chunk_size, os.path.getsize(path) - data_offset)
+                info['data_offset'] = data_offset
+                info['data_size'] = data_size
+                info['frames'] = data_size // info['block_align'] if info['block_align'] else 0
+                info['duration'] = info['frames'] / info['sample_rate'] if info['sample_rate'] else 0.0
+                return info
+            else:
+                f.seek(chunk_size + (chunk_size & 1), 1)
+                continue
+            if chunk_size & 1:
+                f.seek(1, 1)
+
+    raise ValueError(f"Missing data chunk: {os.path.basename(path)}")
+
+def decode_samples(raw, info):
+    """Converts raw interleaved bytes to a float32 (frames, channels) array in [-1, 1]."""
+    tag, bits, channels = info['format'], info['bits'], info['channels']
+
+    if tag == WAVE_FORMAT_IEEE_FLOAT and bits == 32:
+        samples = np.frombuffer(raw, dtype='<f4')
+    elif tag == WAVE_FORMAT_IEEE_FLOAT and bits == 64:
+        samples = np.frombuffer(raw, dtype='<f8').astype(np.float32)
+    elif tag == WAVE_FORMAT_PCM and bits == 16:
+        samples = np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768.0
+    elif tag == WAVE_FORMAT_PCM and bits == 24:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        packed = (b[:, 0] << 8) | (b[:, 1] << 16) | (b[:, 2] << 24)
+        samples = (packed >> 8).astype(np.float32) / 8388608.0
+    elif tag == WAVE_FORMAT_PCM and bits == 32:
+        samples = np.frombuffer(raw, dtype='<i4').astype(np.float32) / 2147483648.0
+    elif tag == WAVE_FORMAT_PCM and bits == 8:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    else:
+        raise ValueError(f"Unsupported WAV format (tag {tag}, {bits}-bit).")
+
+    return samples.reshape(-1, channels)
+
+def iter_wav_blocks(path, block_frames=BLOCK_FRAMES, info=None):
+    """Yields float32 (frames, channels) blocks of at most block_frames frames."""
+    require_numpy()
+    if info is None:
+        info = read_wav_info(path)
+
+    block_bytes = block_frames * info['block_align']
+    remaining = info['data_size'] - info['data_size'] % info['block_align']
+
+    with open(path, 'rb') as f:
+        f.seek(info['data_offset'])
+        while remaining > 0:
+            raw = f.read(min(block_bytes, remaining))
+            if not raw:
+                break
+            remaining -= len(raw)
+            usable = len(raw) - len(raw) % info['block_align']
+            if usable:
+                yield decode_samples(raw[:usable], info)
+
+# --- LOUDNESS ---
+
+def _biquad_power(b, a, freqs, rate):
+    """Squared magnitude response of a biquad at the given frequencies."""
+    w = 2.0 * np.pi * freqs / rate
+    z1 = np.exp(-1j * w)
+    z2 = z1 * z1
+    h = (b[0] + b[1] * z1 + b[2] * z2) / (a[0] + a[1] * z1 + a[2] * z2)
+    return np.abs(h) ** 2
+
+# BS.1770 K-weighting filters as published for 48 kHz. The response is
+# evaluated in the frequency domain, so other sample rates just look up
+# the same curve (it is flat above 24 kHz).
+K_SHELF = ((1.53512485958697, -2.69169618940638, 1.19839281085285),
+           (1.0, -1.69065929318241, 0.73248077421585))
+K_HIGHPASS = ((1.0, -2.0, 1.0),
+              (1.0, -1.99004745483398, 0.99007225036621))
+
+def k_weighting(n_fft, rate):
+    """BS.1770 K-weighting power curve for the bins of an n_fft-point rfft."""
+    freqs = np.minimum(np.fft.rfftfreq(n_fft, 1.0 / rate), 24000.0)
+    weights = _biquad_power(*K_SHELF, freqs, 48000) * _biquad_power(*K_HIGHPASS, freqs, 48000)
+
+    # Fold in the one-sided rfft scaling so sum(w * |X|^2) / n_fft^2 is a mean square
+    weights[1:] *= 2.0
+    if n_fft % 2 == 0:
+        weights[-1] /= 2.0
+    return weights
+
+def integrated_loudness(sub_block_power):
+    """
+    Gated integrated loudness (LUFS) from K-weighted 100 ms sub-block powers.
+
+    sub_block_power is a 1-D array of channel-summed mean squares; 400 ms
+    gating blocks with 75% overlap are built from 4 consecutive sub-blocks.
+    """
+    if len(sub_block_power) < 4:
+        return None
+
+    kernel = np.ones(4) / 4.0
+    blocks = np.convolve(sub_block_power, kernel, mode='valid')
+    with np.errstate(divide='ignore'):
+        loudness = -0.691 + 10.0 * np.log10(blocks)
+
+    gated = blocks[loudness > -70.0]
+    if not len(gated):
+        return None
+
+    relative_gate = -0.691 + 10.0 * math.log10(gated.mean()) - 10.0
+    gated = blocks[(loudness > -70.0) & (loudness > relative_gate)]
+    if not len(gated):
+        return None
+    return round(-0.691 + 10.0 * math.log10(gated.mean()), 1)
+
+# --- ANALYSIS ---
+
+def to_db(value):
+    return round(20.0 * math.log10(value), 1) if value > 0 else None
+
+def analyze_track(path, clip_level=CLIP_LEVEL):
+    """Returns peak/RMS (dBFS), integrated loudness (LUFS) and clip count for one WAV."""
+    require_numpy()
+    info = read_wav_info(path)
+    rate = info['sample_rate']
+
+    # Read in whole 100 ms sub-blocks so loudness can be computed block by block
+    sub = max(1, rate // 10)
+    weights = k_weighting(sub, rate)
+    block_frames = sub * max(1, BLOCK_FRAMES // sub)
+
+    peak = 0.0
+    sum_sq = 0.0
+    clipped = 0
+    samples = 0
+    sub_powers = []
+    carry = None
+
+    for block in iter_wav_blocks(path, block_frames, info):
+        abs_block = np.abs(block)
+        peak = max(peak, float(abs_block.max()))
+        clipped += int(np.count_nonzero(abs_block >= clip_level))
+        sum_sq += float(np.dot(block.ravel().astype(np.float64), block.ravel()))
+        samples += block.size
+
+        if carry is not None:
+            block = np.concatenate((carry, block))
+        whole = (len(block) // sub) * sub
+        carry = block[whole:] if whole < len(block) else None
+        if whole:
+            frames = block[:whole].reshape(-1, sub, block.shape[1])
+            spectrum = np.fft.rfft(frames, axis=1)
+            power = (np.abs(spectrum) ** 2 * weights[None, :, None]).sum(axis=1) / float(sub * sub)
+            sub_powers.append(power.sum(axis=1))
+
+    rms = math.sqrt(sum_sq / samples) if samples else 0.0
+    lufs = integrated_loudness(np.concatenate(sub_powers)) if sub_powers else None
+
+    return {
+        'peak_db': to_db(peak),
+        'rms_db': to_db(rms),
+        'lufs': lufs,
+        'clipped': clipped,
+        'duration': round(info['duration'], 2),
+        'sample_rate': rate,
+        'channels': info['channels'],
+        'bits': info['bits'],
+    }
+
+def _analyze_safe(path):
+    try:
+        return path, analyze_track(path)
+    except Exception as e:
+        return path, {'error': str(e)}
+
+def run_pool(func, items, jobs=None):
+    """Yields func(item) for each item, spread across a process pool when worthwhile."""
+    items = list(items)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(items) <= 1:
+        yield from map(func, items)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(items))) as executor:
+        yield from executor.map(func, items)
+
+def analyze_files(paths, jobs=None, logger_func=None):
+    """Analyzes many WAVs across a process pool. Returns {path: result}."""
+    require_numpy()
+    results = {}
+    for path, result in run_pool(_analyze_safe, paths, jobs):
+        results[path] = result
+        if logger_func:
+            logger_func(f"Analyzed: {os.path.basename(path)} {format_levels(result)}")
+    return results
+
+# --- SILENCE DETECTION ---
+
+def is_silent(path, threshold_db=SILENCE_THRESHOLD_DB):
+    """
+    True if no sample in the track rises above threshold_db (dBFS).
+
+    A handful of short windows spread across the file are probed first, so
+    most real loops are rejected after reading a few KB. Only tracks that
+    look silent everywhere are streamed in full, stopping at the first block
+    that crosses the threshold.
+    """
+    info = read_wav_info(path)
+    if info['frames'] == 0:
+        return True
+
+    require_numpy()
+    level = 10 ** (threshold_db / 20.0)
+    frames = info['frames']
+    align = info['block_align']
+
+    with open(path, 'rb') as f:
+        for i in range(SILENCE_PROBES):
+            start = (frames * (2 * i + 1)) // (2 * SILENCE_PROBES)
+            f.seek(info['data_offset'] + start * align)
+            raw = f.read(min(SILENCE_PROBE_FRAMES, frames - start) * align)
+            raw = raw[:len(raw) - len(raw) % align]
+            if raw and np.abs(decode_samples(raw, info)).max() > level:
+                return False
+
+    for block in iter_wav_blocks(path, info=info):
+        if np.abs(block).max() > level:
+            return False
+    return True
+
+def _silent_safe(args):
+    path, threshold_db = args
+    try:
+        return path, is_silent(path, threshold_db)
+    except Exception:
+        # Unreadable files are never treated as silent; let the copy deal with them
+        return path, False
+
+def find_silent(paths, threshold_db=SILENCE_THRESHOLD_DB, jobs=None):
+    """Returns the set of paths that are silent, checked across a process pool."""
+    items = [(p, threshold_db) for p in paths]
+    return {path for path, silent in run_pool(_silent_safe, items, jobs) if silent}
+
+def format_levels(result):
+    """One-line human readable summary of an analyze_track() result."""
+    if not result:
+        return "-"
+    if 'error' in result:
+        return f"(error: {result['error']})"
+    parts = [
+        f"peak {result['peak_db'] if result['peak_db'] is not None else '-inf'} dBFS",
+        f"rms {result['rms_db'] if result['rms_db'] is not None else '-inf'} dBFS",
+        f"{result['lufs'] if result['lufs'] is not None else '-inf'} LUFS",
+    ]
+    if result['clipped']:
+        parts.append(f"{result['clipped']} clipped")
+    return ", ".join(parts)
+
+# --- WAVEFORM PEAKS ---
+
+# Points in a waveform overview (about one per pixel of a small preview).
+PEAK_POINTS = 512
+
+def waveform_peaks(path, points=PEAK_POINTS):
+    """Peak level (0-1, loudest channel) of up to points equal slices of the track."""
+    require_numpy()
+    info = read_wav_info(path)
+    frames = info['frames']
+    if not frames:
+        return []
+    bucket = -(-frames // max(1, points))
+    peaks = np.zeros(-(-frames // bucket), dtype=np.float32)
+    pos = 0
+
+    for block in iter_wav_blocks(path, info=info):
+        level = np.abs(block).max(axis=1)
+        first = pos // bucket
+        # Slice boundaries that fall inside this block (the first may start before it)
+        starts = np.maximum(np.arange(first * bucket, pos + len(level), bucket) - pos, 0)
+        slices = np.maximum.reduceat(level, starts)
+        index = first + np.arange(len(slices))
+        peaks[index] = np.maximum(peaks[index], slices)
+        pos += len(level)
+
+    return [round(float(p), 4) for p in peaks]
+
+def _peaks_safe(args):
+    path, points = args
+    try:
+        return path, waveform_peaks(path, points)
+    except Exception as e:
+        return path, {'error': str(e)}
+
+def peaks_files(paths, points=PEAK_POINTS, jobs=None):
+    """Waveform peaks for many WAVs across a process pool. Returns {path: peaks}."""
+    require_numpy()
+    return dict(run_pool(_peaks_safe, [(p, points) for p in paths], jobs))
+
+# --- FINGERPRINTING ---
+
+# A fingerprint is FP_SEGMENTS x (FP_BANDS - 1) bits: for each equal slice of
+# the track, whether each log-spaced band (300 Hz - 3 kHz) holds more energy
+# than the band above it. Comparing neighbouring bands makes it independent of
+# gain and tolerant of noise; 256 bits pack into 32 bytes.
+FP_SEGMENTS = 8
+FP_BANDS = 33
+FP_FFT = 2048
+FP_BITS = FP_SEGMENTS * (FP_BANDS - 1)
+
+# Two tracks are duplicates when at most this many bits differ and their
+# lengths agree to within FP_MAX_LENGTH_DIFF (fraction).
+FP_MAX_DISTANCE = 24
+FP_MAX_LENGTH_DIFF = 0.01
+
+def _band_matrix(rate):
+    """(bins, bands) one-hot matrix mapping rfft bins to fingerprint bands."""
+    edges = np.geomspace(300.0, 3000.0, FP_BANDS + 1)
+    bins = np.fft.rfftfreq(FP_FFT, 1.0 / rate)
+    band = np.searchsorted(edges, bins, side='right') - 1
+    matrix = np.zeros((len(bins), FP_BANDS), dtype=np.float32)
+    valid = (band >= 0) & (band < FP_BANDS)
+    matrix[np.nonzero(valid)[0], band[valid]] = 1.0
+    return matrix
+
+def fingerprint_track(path):
+    """
+    Returns {'fp': hex string or None, 'duration': seconds} for one WAV.
+    Silent and empty tracks get fp None so they never match each other.
+    """
+    require_numpy()
+    info = read_wav_info(path)
+    frames = info['frames']
+    if frames < FP_FFT:
+        return {'fp': None, 'duration': round(info['duration'], 3)}
+
+    bands = _band_matrix(info['sample_rate'])
+    window = np.hanning(FP_FFT).astype(np.float32)
+    energy = np.zeros((FP_SEGMENTS, FP_BANDS))
+    pos = 0
+    carry = None
+
+    for block in iter_wav_blocks(path, FP_FFT * 32, info):
+        mono = block.mean(axis=1)
+        if carry is not None:
+            mono = np.concatenate((carry, mono))
+        whole = (len(mono) // FP_FFT) * FP_FFT
+        carry = mono[whole:] if whole < len(mono) else None
+        if not whole:
+            continue
+
+        windows = mono[:whole].reshape(-1, FP_FFT) * window
+        power = np.abs(np.fft.rfft(windows, axis=1)) ** 2
+        starts = pos + np.arange(len(windows)) * FP_FFT
+        segments = np.minimum(starts * FP_SEGMENTS // frames, FP_SEGMENTS - 1)
+        np.add.at(energy, segments, power @ bands)
+        pos += whole
+
+    if energy.sum() < 1e-9:
+        return {'fp': None, 'duration': round(info['duration'], 3)}
+
+    bits = energy[:, :-1] > energy[:, 1:]
+    return {'fp': np.packbits(bits.ravel()).tobytes().hex(), 'duration': round(info['duration'], 3)}
+
+def _fingerprint_safe(path):
+    try:
+        return path, fingerprint_track(path)
+    except Exception as e:
+        return path, {'fp': None, 'duration': 0.0, 'error': str(e)}
+
+def fingerprint_files(paths, jobs=None):
+    """Fingerprints many WAVs across a process pool. Returns {path: result}."""
+    require_numpy()
+    return dict(run_pool(_fingerprint_safe, paths, jobs))
+
+class FingerprintIndex:
+    """
+    JSON-backed index of fingerprints for the live pedal and every backup.
+
+    Entries are keyed by (location, file), where location is "pedal" or a
+    backup folder name. Size and mtime are stored so unchanged files reuse
+    their cached fingerprint instead of being read again.
+    """
+
+    PEDAL = "pedal"
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self._matrix = None
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    for e in json.load(f).get('entries', []):
+                        self.entries[(e['location'], e['file'])] = e
+            except (ValueError, KeyError, OSError):
+                self.entries = {}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'entries': list(self.entries.values())}, f)
+
+    def update_location(self, location, tracks, jobs=None):
+        """
+        Fingerprints tracks ({'path', 'file', 'slot', 'track'} dicts) for one
+        location, reusing cached results, and drops entries that are gone.
+        """
+        fresh = {}
+        todo = []
+        for t in tracks:
+            st = os.stat(t['path'])
+            cached = self.entries.get((location, t['file']))
+            if cached and cached['size'] == st.st_size and cached['mtime'] == int(st.st_mtime):
+                fresh[t['file']] = dict(cached, slot=t['slot'], track=t['track'])
+            else:
+                todo.append((t, st))
+
+        results = fingerprint_files([t['path'] for t, _ in todo], jobs) if todo else {}
+        for t, st in todo:
+            r = results[t['path']]
+            fresh[t['file']] = {
+                'location': location, 'file': t['file'],
+                'slot': t['slot'], 'track': t['track'],
+                'size': st.st_size, 'mtime': int(st.st_mtime),
+                'fp': r['fp'], 'duration': r['duration'],
+            }
+
+        self.entries = {k: v for k, v in self.entries.items() if k[0] != location}
+        for file, e in fresh.items():
+            self.entries[(location, file)] = e
+        self._matrix = None
+        return fresh
+
+    def _build(self):
+        keyed = [e for e in self.entries.values() if e.get('fp')]
+        if keyed:
+            bits = np.frombuffer(bytes.fromhex("".join(e['fp'] for e in keyed)), dtype=np.uint8)
+            bits = bits.reshape(len(keyed), -1)
+        else:
+            bits = np.zeros((0, FP_BITS // 8), dtype=np.uint8)
+        durations = np.array([e['duration'] for e in keyed], dtype=np.float64)
+        self._matrix = (keyed, bits, durations)
+
+    def find_duplicates(self, entry, max_distance=FP_MAX_DISTANCE):
+        """Returns index entries with (nearly) the same audio as entry, closest first."""
+        if not entry.get('fp'):
+            return []
+        if self._matrix is None:
+            self._build()
+        keyed, bits, durations = self._matrix
+        if not keyed:
+            return []
+
+        query = np.frombuffer(bytes.fromhex(entry['fp']), dtype=np.uint8)
+        distance = np.unpackbits(bits ^ query, axis=1).sum(axis=1)
+        length_ok = np.abs(durations - entry['duration']) <= FP_MAX_LENGTH_DIFF * max(entry['duration'], 1e-3)
+        hits = np.nonzero((distance <= max_distance) & length_ok)[0]
+
+        own = (entry.get('location'), entry.get('file'))
+        matches = [keyed[i] for i in hits[np.argsort(distance[hits], kind='stable')]]
+        return [m for m in matches if (m['location'], m['file']) != own]
+
+def describe_duplicate(entry, location=FingerprintIndex.PEDAL):
+    """Short human readable label for a FingerprintIndex entry."""
+    if entry['location'] in (FingerprintIndex.PEDAL, location):
+        return f"slot {entry['slot']} track {entry['track']}"
+    return f"{entry['location']}/{entry['file']}"
+
+# --- TEMPO ESTIMATION ---
+
+# Audio is downmixed and decimated to roughly TEMPO_RATE before building a
+# spectral-flux onset envelope with one value per TEMPO_HOP samples.
+TEMPO_RATE = 11025
+TEMPO_HOP = 256
+TEMPO_MIN = 60.0
+TEMPO_MAX = 200.0
+
+# Stored and estimated tempos further apart than this (fraction) disagree.
+TEMPO_TOLERANCE = 0.03
+
+def onset_envelope(path):
+    """Returns (spectral flux envelope, envelope frames per second, duration)."""
+    require_numpy()
+    info = read_wav_info(path)
+    factor = max(1, info['sample_rate'] // TEMPO_RATE)
+    chunk = TEMPO_HOP * factor
+    window = np.hanning(TEMPO_HOP).astype(np.float32)
+
+    flux = []
+    prev = None
+    carry = None
+    for block in iter_wav_blocks(path, chunk * 256, info):
+        mono = block.mean(axis=1)
+        if carry is not None:
+            mono = np.concatenate((carry, mono))
+        whole = (len(mono) // chunk) * chunk
+        carry = mono[whole:] if whole < len(mono) else None
+        if not whole:
+            continue
+
+        small = mono[:whole].reshape(-1, factor).mean(axis=1)
+        mag = np.log1p(100.0 * np.abs(np.fft.rfft(small.reshape(-1, TEMPO_HOP) * window, axis=1)))
+        if prev is not None:
+            mag = np.vstack((prev, mag))
+            diff = np.diff(mag, axis=0)
+        else:
+            diff = np.vstack((np.zeros((1, mag.shape[1])), np.diff(mag, axis=0)))
+        prev = mag[-1:]
+        flux.append(np.maximum(diff, 0.0).sum(axis=1))
+
+    fps = info['sample_rate'] / float(chunk)
+    envelope = np.concatenate(flux) if flux else np.zeros(0)
+    return envelope, fps, info['duration']
+
+def estimate_tempo(path):
+    """
+    Estimates BPM from the onset envelope's autocorrelation, then snaps it to
+    a whole number of beats across the loop when that is close.
+    Returns {'bpm', 'confidence', 'beats', 'duration'}; bpm is None if unsure.
+    """
+    envelope, fps, duration = onset_envelope(path)
+    result = {'bpm': None, 'confidence': 0.0, 'beats': None, 'duration': round(duration, 3)}
+
+    if not envelope.any():
+        return result
+    # Only tempos with at least two beats in the loop can be measured
+    n = len(envelope)
+    bpms = np.arange(TEMPO_MIN, TEMPO_MAX + 0.05, 0.1)
+    bpms = bpms[2 * 60.0 * fps / bpms <= n]
+    if not len(bpms):
+        return result
+
+    # Beats rarely land on whole envelope frames; spreading each onset over
+    # its neighbours keeps a beat that alternates between two frames in one peak
+    env = np.convolve(envelope, (0.5, 1.0, 0.5), mode="same")
+    env -= env.mean()
+    spectrum = np.fft.rfft(env, 2 * n)
+    ac = np.fft.irfft(np.abs(spectrum) ** 2)[:n]
+    if ac[0] <= 0:
+        return result
+    ac /= ac[0]
+
+    lags = 60.0 * fps / bpms
+    idx = np.arange(n)
+    score = np.interp(lags, idx, ac) + 0.5 * np.interp(2 * lags, idx, ac, right=0.0)
+    best = int(np.argmax(score))
+    bpm = float(bpms[best])
+    confidence = float(np.clip(np.interp(lags[best], idx, ac), 0.0, 1.0))
+
+    beats = int(round(duration * bpm / 60.0))
+    if beats > 0:
+        snapped = 60.0 * beats / duration
+        if abs(snapped - bpm) / bpm < 0.04:
+            bpm = snapped
+
+    result.update(bpm=round(bpm, 1), confidence=round(confidence, 2), beats=beats)
+    return result
+
+def _tempo_safe(path):
+    try:
+        return path, estimate_tempo(path)
+    except Exception as e:
+        return path, {'bpm': None, 'confidence': 0.0, 'beats': None, 'duration': 0.0, 'error': str(e)}
+
+def estimate_tempos(paths, jobs=None):
+    """Estimates tempo for many WAVs across a process pool. Returns {path: result}."""
+    require_numpy()
+    return dict(run_pool(_tempo_safe, paths, jobs))
+
+def tempo_agrees(stored, estimated, tolerance=TEMPO_TOLERANCE):
+    """True if estimated matches stored, allowing for half/double-time readings."""
+    if not stored or not estimated:
+        return True
+    return any(abs(estimated * k - stored) / stored <= tolerance for k in (1.0, 0.5, 2.0))
+
+def best_tempo(results):
+    """Picks the most confident estimate out of several tracks of one memory."""
+    usable = [r for r in results if r.get('bpm')]
+    if not usable:
+        return None
+    return max(usable, key=lambda r: r['confidence'])
+
+# --- WAV WRITING / TRANSCODING ---
+
+# Export formats offered by the tools: name -> (format tag, bits, dither)
+EXPORT_FORMATS = {
+    "24-bit PCM": (WAVE_FORMAT_PCM, 24, False),
+    "16-bit PCM + dither": (WAVE_FORMAT_PCM, 16, True),
+    "16-bit PCM": (WAVE_FORMAT_PCM, 16, False),
+    "32-bit float": (WAVE_FORMAT_IEEE_FLOAT, 32, False),
+}
+
+def encode_samples(block, tag, bits, rng=None):
+    """Converts a float (frames, channels) block to interleaved little-endian bytes."""
+    if tag == WAVE_FORMAT_IEEE_FLOAT:
+        return block.astype('<f4' if bits == 32 else '<f8').tobytes()
+
+    scale = float(2 ** (bits - 1))
+    scaled = block.astype(np.float64) * scale
+    if rng is not None:
+        # TPDF dither, +/- 1 LSB
+        scaled += rng.random(scaled.shape) - rng.random(scaled.shape)
+    ints = np.clip(np.round(scaled), -scale, scale - 1).astype('<i4')
+
+    if bits == 16:
+        return ints.astype('<i2').tobytes()
+    if bits == 24:
+        return ints.reshape(-1, 1).view(np.uint8)[:, :3].tobytes()
+    if bits == 32:
+        return ints.tobytes()
+    raise ValueError(f"Unsupported output bit depth: {bits}")
+
+class WavWriter:
+    """Streams blocks to a WAV file; sizes in the header are patched on close."""
+
+    def __init__(self, path, channels, sample_rate, bits=24, tag=WAVE_FORMAT_PCM, dither=False):
+        self.path = path
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.bits = bits
+        self.tag = tag
+        self.block_align = channels * bits // 8
+        self.data_size = 0
+        self.rng = np.random.default_rng() if dither else None
+        self.f = open(path, 'wb')
+        self._write_header()
+
+    def _write_header(self):
+        self.f.write(b'RIFF' + struct.pack('<I', 36 + self.data_size) + b'WAVE')
+        self.f.write(b'fmt ' + struct.pack('<IHHIIHH', 16, self.tag, self.channels, self.sample_rate,
+                                             self.sample_rate * self.block_align, self.block_align, self.bits))
+        self.f.write(b'data' + struct.pack('<I', self.data_size))
+
+    def write(self, block):
+        raw = encode_samples(block, self.tag, self.bits, self.rng)
+        self.f.write(raw)
+        self.data_size += len(raw)
+
+    def close(self):
+        if self.f.closed:
+            return
+        if self.data_size & 1:
+            self.f.write(b'\0')
+        self.f.seek(0)
+        self._write_header()
+        self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class Resampler:
+    """
+    Streaming windowed-sinc sample rate converter.
+
+    Output samples are computed from TAPS input samples either side of
+    their position, all at once per block, keeping only the few input samples
+    still needed by the next block.
+    """
+
+    TAPS = 16
+
+    def __init__(self, in_rate, out_rate, channels):
+        self.step = in_rate / float(out_rate)
+        self.cutoff = min(1.0, out_rate / float(in_rate))
+        self.channels = channels
+        self.buffer = np.zeros((self.TAPS, channels), dtype=np.float32)  # leading silence
+        self.buffer_start = -self.TAPS
+        self.next_time = 0.0
+        self.frames_in = 0
+        self.frames_out = 0
+
+    def _render(self, count):
+        times = self.next_time + np.arange(count) * self.step
+        base = np.floor(times).astype(np.int64)
+        offsets = np.arange(-self.TAPS + 1, self.TAPS + 1)
+        idx = base[:, None] + offsets[None, :]
+        x = (times - base)[:, None] - offsets[None, :]
+        kernel = self.cutoff * np.sinc(self.cutoff * x) * (0.5 + 0.5 * np.cos(np.pi * x / self.TAPS))
+        taps = self.buffer[idx - self.buffer_start]
+        out = np.einsum('nk,nkc->nc', kernel.astype(np.float32), taps)
+
+        self.next_time += count * self.step
+        self.frames_out += count
+        keep_from = int(np.floor(self.next_time)) - self.TAPS + 1 - self.buffer_start
+        if keep_from > 0:
+            self.buffer = self.buffer[keep_from:]
+            self.buffer_start += keep_from
+        return out
+
+    def process(self, block):
+        self.buffer = np.concatenate((self.buffer, block.astype(np.float32)))
+        self.frames_in += len(block)
+        available = self.buffer_start + len(self.buffer) - 1 - self.TAPS
+        count = int(np.floor((available - self.next_time) / self.step)) + 1
+        return self._render(count) if count > 0 else block[:0]
+
+    def flush(self):
+        total = int(math.ceil(self.frames_in / self.step))
+        self.buffer = np.concatenate((self.buffer, np.zeros((self.TAPS, self.channels), dtype=np.float32)))
+        count = total - self.frames_out
+        return self._render(count) if count > 0 else np.zeros((0, self.channels), dtype=np.float32)
+
+def transcode_track(src, dst, export_format, sample_rate=None):
+    """Streams src into dst in the given EXPORT_FORMATS entry and optional sample rate."""
+    require_numpy()
+    tag, bits, dither = EXPORT_FORMATS[export_format]
+    info = read_wav_info(src)
+    out_rate = sample_rate or info['sample_rate']
+    resampler = Resampler(info['sample_rate'], out_rate, info['channels']) if out_rate != info['sample_rate'] else None
+
+    with WavWriter(dst, info['channels'], out_rate, bits, tag, dither) as writer:
+        for block in iter_wav_blocks(src, info=info):
+            writer.write(resampler.process(block) if resampler else block)
+        if resampler:
+            writer.write(resampler.flush())
+    return os.path.getsize(dst)
+
+def _transcode_safe(args):
+    src, dst, export_format, sample_rate = args
+    try:
+        return src, transcode_track(src, dst, export_format, sample_rate)
+    except Exception as e:
+        return src, e
+
+def transcode_files(jobs_list, export_format, sample_rate=None, jobs=None):
+    """
+    Transcodes [(src, dst), ...] across a process pool.
+    Yields (src, size or exception) as each file finishes, in order.
+    """
+    require_numpy()
+    items = [(src, dst, export_format, sample_rate) for src, dst in jobs_list]
+    yield from run_pool(_transcode_safe, items, jobs)
+
+# --- MIXDOWN / STEMS ---
+
+class _LoopReader:
+    """Reads blocks from a track at any position, wrapping around its loop length."""
+
+    def __init__(self, path, loop):
+        self.info = read_wav_info(path)
+        self.frames = self.info['frames']
+        self.loop = loop
+        self.f = open(path, 'rb')
+
+    def read(self, start, count):
+        channels = self.info['channels']
+        out = np.zeros((count, channels), dtype=np.float32)
+        if not self.frames:
+            return out
+        filled = 0
+        while filled < count:
+            pos = start + filled
+            if pos >= self.frames:
+                if not self.loop:
+                    break
+                pos %= self.frames
+            n = min(count - filled, self.frames - pos)
+            self.f.seek(self.info['data_offset'] + pos * self.info['block_align'])
+            out[filled:filled + n] = decode_samples(self.f.read(n * self.info['block_align']), self.info)
+            filled += n
+        return out
+
+    def close(self):
+        self.f.close()
+
+def render_memory(paths, mix_path=None, stem_path=None, export_format="32-bit float", loop=True):
+    """
+    Renders the tracks of one memory into a summed stereo mixdown and/or one
+    interleaved multichannel stem file, block by block.
+
+    All outputs run for the length of the longest track. With loop=True the
+    shorter tracks repeat to fill it, as on the pedal; when the longest is not
+    a whole multiple of a shorter track, that track's last pass is cut off and
+    reported in 'partial'. With loop=False short tracks are padded with silence.
+    """
+    require_numpy()
+    tag, bits, dither = EXPORT_FORMATS[export_format]
+    # Everything opened so far is closed (writers first) however this ends
+    with ExitStack() as stack:
+        readers = []
+        for p in paths:
+            readers.append(_LoopReader(p, loop))
+            stack.callback(readers[-1].close)
+        rates = {r.info['sample_rate'] for r in readers}
+        if len(rates) != 1:
+            raise ValueError(f"Tracks have different sample rates: {sorted(rates)}")
+        rate = rates.pop()
+        length = max(r.frames for r in readers)
+        partial = [os.path.basename(p) for p, r in zip(paths, readers)
+                   if loop and r.frames and length % r.frames]
+
+        mix = stack.enter_context(WavWriter(mix_path, 2, rate, bits, tag, dither)) if mix_path else None
+        stem_channels = sum(r.info['channels'] for r in readers)
+        stems = stack.enter_context(WavWriter(stem_path, stem_channels, rate, bits, tag, dither)) if stem_path else None
+
+        for start in range(0, length, BLOCK_FRAMES):
+            count = min(BLOCK_FRAMES, length - start)
+            blocks = [r.read(start, count) for r in readers]
+            if mix:
+                # Mono tracks go to both sides, anything wider is folded onto L/R
+                total = np.zeros((count, 2), dtype=np.float32)
+                for b in blocks:
+                    if b.shape[1] == 1:
+                        total += b
+                    else:
+                        total[:, 0] += b[:, 0::2].sum(axis=1)
+                        total[:, 1] += b[:, 1::2].sum(axis=1)
+                mix.write(total)
+            if stems:
+                stems.write(np.hstack(blocks))
+
+        return {'frames': length, 'sample_rate': rate, 'tracks': len(paths),
+                'channels': stem_channels, 'partial': partial}
+
+def _render_safe(args):
+    slot, paths, mix_path, stem_path, export_format, loop = args
+    try:
+        return slot, render_memory(paths, mix_path, stem_path, export_format, loop)
+    except Exception as e:
+        return slot, {'error': str(e)}
+
+def render_memories(memories, export_format="32-bit float", loop=True, jobs=None):
+    """
+    Renders many memories across a process pool.
+    memories is [(slot, [track paths], mix_path or None, stem_path or None), ...].
+    Yields (slot, result) in order.
+    """
+    require_numpy()
+    items = [(slot, paths, mix, stem, export_format, loop) for slot, paths, mix, stem in memories]
+    yield from run_pool(_render_safe, items, jobs)
@@ -0,0 +1,254 @@
+"""
+Boss RC-500 Benchmarks
+----------------------
+Times the main operations of the tools against a generated fake pedal
+(see BossRC500Fixture.py) so changes to the hot paths show up as numbers.
+
+Phases: detect, parse, scan, preview, backup, report, restore, delete.
+The GUI operations run headlessly through the same BossRC500App methods the
+buttons call; tk variables are replaced with plain values and dialogs
+answer "yes".
+
+Usage:
+    python BossRC500Bench.py                         run and print timings
+    python BossRC500Bench.py --save baseline.json    also save them as a baseline
+    python BossRC500Bench.py --compare baseline.json flag phases that got slower
+
+Exit code is 1 if --compare finds a phase slower than the tolerance.
+
+Copyright (C) 2026 [pmonk.com]
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import platform
+import argparse
+import statistics
+
+import BossRC500GUI as gui
+import BossRC500Audio as rc_audio
+import BossRC500Fixture as fixture
+
+PHASES = ("detect", "parse", "scan", "preview", "backup", "report", "restore", "delete")
+DEFAULT_TOLERANCE = 0.20
+# Slowdowns smaller than this are timer noise on the tiny phases
+DEFAULT_MIN_DELTA_MS = 5.0
+
+
+# --- HEADLESS APP ---
+
+class Value:
+    """Stand-in for a tk variable."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+class _Root:
+    def after(self, ms, func=None, *args):
+        if func: func(*args)
+
+class _Widget:
+    def config(self, **kwargs): pass
+    def start(self, *args): pass
+    def stop(self, *args): pass
+
+class BenchApp(gui.BossRC500App):
+    """BossRC500App without a window. Log lines are kept in self.lines."""
+
+    def __init__(self, source, dest, full=False, verbose=False):
+        self.root = _Root()
+        self.lines = []
+        self.verbose = verbose
+        self.is_running = False
+        self.html_report_path = None
+        self.final_dest_dir = None
+        self.daemon = None
+        self.autotune = False
+        self.progress = self.btn_view_report = self.btn_open_folder = _Widget()
+
+        self.source_dir = Value(source)
+        self.dest_dir = Value(dest)
+        self.import_source_dir = Value("")
+        self.status_msg = Value("")
+        self.backup_mode_var = Value("all")
+        self.backup_range_var = Value("")
+        self.analyze_var = Value(full and rc_audio.HAVE_NUMPY)
+        self.silent_mode_var = Value(gui.SILENT_COPY)
+        self.silent_threshold_var = Value(str(rc_audio.SILENCE_THRESHOLD_DB))
+        self.import_skip_silent_var = Value(full)
+        self.find_dupes_var = Value(full and rc_audio.HAVE_NUMPY)
+        self.check_tempo_var = Value(full and rc_audio.HAVE_NUMPY)
+        self.fix_tempo_var = Value(False)
+        self.export_format_var = Value(gui.EXPORT_ORIGINAL)
+        self.export_rate_var = Value(gui.EXPORT_ORIGINAL_RATE)
+        self.bundle_mode_var = Value(gui.BUNDLE_NONE)
+        self.archive_var = Value(gui.ARCHIVE_NONE)
+        self.import_range_var = Value("")
+        self.delete_range_var = Value("")
+        self.trace_var = Value(False)
+
+    def log(self, message):
+        self.lines.append(message)
+        if self.verbose:
+            print(f"    {message}")
+
+def patch_dialogs():
+    """Makes message boxes non-blocking so the GUI methods can run unattended."""
+    gui.messagebox.showinfo = lambda *a, **k: None
+    gui.messagebox.showerror = lambda *a, **k: None
+    gui.messagebox.askyesno = lambda *a, **k: True
+
+# --- TIMING ---
+
+def time_phase(func, repeat, setup=None):
+    """Runs func repeat times (setup untimed before each). Returns a list of seconds."""
+    times = []
+    for _ in range(repeat):
+        if setup: setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+def run_benchmarks(work_dir, args):
+    pedal_root = os.path.join(work_dir, "pedal")
+    print(f"Generating fixture ({args.memories} memories, seed {args.seed})...")
+    wave_dir, track_count, audio_bytes = fixture.generate_pedal(
+        pedal_root, args.memories, args.seed, max_seconds=args.max_seconds)
+    print(f"  {track_count} tracks, {audio_bytes / 1048576:.1f} MB")
+
+    dest = os.path.join(work_dir, "backups")
+    restore_root = os.path.join(work_dir, "restore")
+    scratch_root = os.path.join(work_dir, "scratch")
+    app = BenchApp(wave_dir, dest, full=args.full, verbose=args.verbose)
+    metadata = gui.parse_metadata(wave_dir, None)
+
+    def reset(path):
+        shutil.rmtree(path, ignore_errors=True)
+
+    def backup():
+        app.run_backup()
+        if not app.final_dest_dir or not os.listdir(app.final_dest_dir):
+            raise RuntimeError("backup produced no files")
+
+    def report():
+        manifest = gui.load_manifest(app.final_dest_dir)
+        gui.create_reports(manifest[0], app.final_dest_dir, app.log, manifest[1])
+
+    def prepare_restore():
+        reset(restore_root)
+        os.makedirs(os.path.join(restore_root, "ROLAND", "WAVE"))
+        app.source_dir.set(os.path.join(restore_root, "ROLAND", "WAVE"))
+        app.import_source_dir.set(app.final_dest_dir)
+
+    def prepare_delete():
+        reset(scratch_root)
+        shutil.copytree(pedal_root, scratch_root)
+        app.source_dir.set(os.path.join(scratch_root, "ROLAND", "WAVE"))
+        app.delete_range_var.set("1-99")
+
+    phases = [
+        ("detect", lambda: gui.find_pedal([pedal_root]), None),
+        ("parse", lambda: gui.parse_metadata(wave_dir, None), None),
+        ("scan", lambda: gui.scan_wave_tracks(wave_dir, metadata), None),
+        ("preview", app.run_preview_backup, None),
+        ("backup", backup, lambda: reset(dest)),
+        ("report", report, None),
+        ("restore", app.run_import, prepare_restore),
+        ("delete", app.confirm_delete, prepare_delete),
+    ]
+
+    results = {}
+    for name, func, setup in phases:
+        if args.only and name not in args.only:
+            continue
+        times = time_phase(func, args.repeat, setup)
+        results[name] = {'min': min(times), 'median': statistics.median(times)}
+        print(f"  {name:<8} {results[name]['min'] * 1000:9.1f} ms")
+
+    meta = {
+        'memories': args.memories, 'seed': args.seed, 'max_seconds': args.max_seconds,
+        'tracks': track_count, 'audio_bytes': audio_bytes, 'repeat': args.repeat,
+        'full': args.full, 'numpy': rc_audio.HAVE_NUMPY,
+        'python': platform.python_version(), 'platform': platform.platform(),
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    return {'meta': meta, 'phases': results}
+
+def compare(results, baseline, tolerance, min_delta=DEFAULT_MIN_DELTA_MS / 1000):
+    """
+    Prints a table against the baseline. Returns the phases that got slower
+    by more than tolerance (relative) and min_delta seconds (absolute).
+    """
+    for key in ('tracks', 'audio_bytes', 'full'):
+        if baseline['meta'].get(key) != results['meta'][key]:
+            print(f"Warning: baseline was recorded with a different {key}; timings are not comparable.")
+
+    slower = []
+    print(f"\n{'Phase':<8} {'Now (ms)':>10} {'Base (ms)':>10} {'Change':>8}")
+    for name, now in results['phases'].items():
+        base = baseline['phases'].get(name)
+        if not base:
+            print(f"{name:<8} {now['min'] * 1000:10.1f} {'-':>10} {'new':>8}")
+            continue
+        change = now['min'] / base['min'] - 1 if base['min'] else 0.0
+        flag = ""
+        if change > tolerance and now['min'] - base['min'] > min_delta:
+            slower.append(name)
+            flag = "  SLOWER"
+        print(f"{name:<8} {now['min'] * 1000:10.1f} {base['min'] * 1000:10.1f} {change:+8.0%}{flag}")
+    return slower
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Boss RC-500 tools on a fake pedal.")
+    parser.add_argument("--memories", type=int, default=fixture.MEMORY_COUNT)
+    parser.add_argument("--seed", type=int, default=500)
+    parser.add_argument("--max-seconds", type=float, default=3.0, help="longest generated loop")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per phase (the fastest is reported)")
+    parser.add_argument("--only", nargs="+", choices=PHASES, help="run only these phases")
+    parser.add_argument("--full", action="store_true", help="enable level/tempo/duplicate analysis (needs numpy)")
+    parser.add_argument("--save", metavar="FILE", help="save results as a baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown before a phase is flagged (0.2 = 20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="ignore slowdowns smaller than this many milliseconds")
+    parser.add_argument("--work-dir", help="keep the fixture and outputs here instead of a temp folder")
+    parser.add_argument("--verbose", action="store_true", help="print the tools' log output")
+    args = parser.parse_args()
+
+    patch_dialogs()
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="rc500_bench_")
+    try:
+        results = run_benchmarks(work_dir, args)
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved: {args.save}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        slower = compare(results, baseline, args.tolerance, args.min_delta_ms / 1000)
+        if slower:
+            print(f"\nRegressions: {', '.join(slower)}")
+            sys.exit(1)
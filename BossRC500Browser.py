@@ -0,0 +1,313 @@
+"""
+Boss RC-500 Loop Browser
+------------------------
+The table behind the GUI's "Loop Browser" tab: one row per memory, for the
+pedal, the sync library and every backup, archive and dedup store snapshot
+in the backup folder.
+
+- RowView holds the rows in plain Python: filtering, sorting, the visible
+  window and the selection. Filtering narrows the current result while the
+  filter text only grows, so typing stays fast with thousands of rows.
+- VirtualTree shows a RowView in a ttk.Treeview that only ever holds one
+  screenful of items. Scrolling reuses those items with new values, so the
+  number of rows doesn't affect how fast the table scrolls or redraws.
+
+Copyright (C) 2026 [pmonk.com]
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import os
+import tkinter as tk
+from tkinter import ttk
+
+import BossRC500API as rc_api
+
+# (key, heading, width, anchor)
+COLUMNS = (
+    ("source", "Source", 150, "w"),
+    ("slot", "Slot", 45, "center"),
+    ("name", "Name", 120, "w"),
+    ("bpm", "BPM", 60, "e"),
+    ("ts", "Time Sig", 60, "center"),
+    ("tracks", "Tracks", 50, "center"),
+    ("duration", "Length", 60, "e"),
+    ("size", "Size", 70, "e"),
+)
+
+PAGE_ROWS = 15
+WHEEL_ROWS = 3
+PEDAL = "pedal"
+
+
+# --- ROWS ---
+
+def source_label(backup):
+    name = os.path.basename(backup.path)
+    if backup.kind == "snapshot":
+        return "Snapshot " + os.path.splitext(name)[0]
+    return name
+
+def memory_rows(source, label, kind, path):
+    """One row per memory with tracks in a Pedal or Backup."""
+    source.tracks.load_info()
+    rows = []
+    for mem in source.memories.with_tracks():
+        tracks = mem.tracks
+        durations = []
+        for t in tracks:
+            try:
+                durations.append(t.duration)
+            except (ValueError, OSError):
+                pass
+        # Tracks in one memory loop together, so the longest one is the loop length
+        duration = max(durations) if durations else None
+        size = sum(t.size or 0 for t in tracks)
+        sort = {
+            'source': label.lower(), 'slot': mem.slot, 'name': mem.name.lower(),
+            'bpm': mem.tempo or None, 'ts': mem.beat if mem.beat != "" else None,
+            'tracks': len(tracks), 'duration': duration, 'size': size,
+        }
+        values = (
+            label, f"{mem.slot:03d}", mem.name, f"{mem.tempo:g}" if mem.tempo else "",
+            mem.time_signature, len(tracks),
+            f"{int(duration // 60)}:{duration % 60:04.1f}" if duration is not None else "",
+            f"{size / 1048576:.1f} MB",
+        )
+        rows.append({
+            'key': (path, mem.slot), 'kind': kind, 'path': path, 'slot': mem.slot,
+            'sort': sort, 'values': values,
+            'search': " ".join(str(v) for v in values).lower(),
+        })
+    return rows
+
+def build_rows(pedal_dir=None, backup_dir=None, library_dir=None, logger_func=None):
+    """Rows for the pedal, the sync library and every backup in backup_dir."""
+    sources = []
+    if pedal_dir and os.path.isdir(pedal_dir):
+        sources.append(("Pedal", PEDAL, pedal_dir, rc_api.Pedal.open(pedal_dir)))
+    if library_dir and os.path.isdir(library_dir):
+        sources.append(("Library", "folder", library_dir, rc_api.Backup.open(library_dir)))
+    if backup_dir and os.path.isdir(backup_dir):
+        for backup in rc_api.Backup.scan(backup_dir):
+            sources.append((source_label(backup), backup.kind, backup.path, backup))
+
+    rows = []
+    for label, kind, path, source in sources:
+        try:
+            rows += memory_rows(source, label, kind, path)
+        except Exception as e:
+            if logger_func: logger_func(f"Could not read {label}: {e}")
+    return rows
+
+class RowView:
+    """Filtered, sorted rows with a scroll offset and a selection (by row key)."""
+
+    def __init__(self, page_rows=PAGE_ROWS):
+        self.all_rows = []
+        self.rows = []
+        self.offset = 0
+        self.page_rows = page_rows
+        self.selected = set()
+        self.sort_column = None
+        self.sort_reverse = False
+        self.filter_text = ""
+
+    def set_rows(self, rows):
+        self.all_rows = list(rows)
+        keys = {r['key'] for r in self.all_rows}
+        self.selected &= keys
+        self.sort_all()
+        self.apply_filter(self.filter_text, narrow=False)
+
+    def sort_all(self):
+        if not self.sort_column:
+            return
+        col = self.sort_column
+        present = [r for r in self.all_rows if r['sort'][col] is not None]
+        missing = [r for r in self.all_rows if r['sort'][col] is None]
+        present.sort(key=lambda r: (r['sort'][col], r['sort']['source'], r['slot']), reverse=self.sort_reverse)
+        self.all_rows = present + missing
+
+    def sort(self, column):
+        """Sorts by column; sorting by the same column again reverses the order."""
+        self.sort_reverse = not self.sort_reverse if column == self.sort_column else False
+        self.sort_column = column
+        self.sort_all()
+        self.apply_filter(self.filter_text, narrow=False)
+
+    def apply_filter(self, text, narrow=True):
+        """Keeps rows containing every word of text. Typing more only searches the current result."""
+        text = text.strip().lower()
+        if narrow and self.filter_text and text.startswith(self.filter_text):
+            base = self.rows
+        else:
+            base = self.all_rows
+        terms = text.split()
+        self.rows = [r for r in base if all(t in r['search'] for t in terms)] if terms else list(base)
+        self.filter_text = text
+        self.offset = 0
+
+    def scroll_to(self, offset):
+        self.offset = max(0, min(offset, len(self.rows) - self.page_rows))
+        return self.offset
+
+    def visible(self):
+        return self.rows[self.offset:self.offset + self.page_rows]
+
+    def fraction(self):
+        """(first, last) for a scrollbar."""
+        if not self.rows:
+            return 0.0, 1.0
+        total = len(self.rows)
+        return self.offset / total, min(1.0, (self.offset + self.page_rows) / total)
+
+    def selected_rows(self):
+        """Selected rows that pass the current filter, in display order."""
+        return [r for r in self.rows if r['key'] in self.selected]
+
+    def select_all(self):
+        self.selected = {r['key'] for r in self.rows}
+
+# --- WIDGET ---
+
+class VirtualTree(ttk.Frame):
+    """A Treeview that renders only the visible slice of a RowView."""
+
+    def __init__(self, parent, page_rows=PAGE_ROWS, on_change=None):
+        super().__init__(parent)
+        self.view = RowView(page_rows)
+        self.on_change = on_change
+
+        self.tree = ttk.Treeview(self, columns=[c[0] for c in COLUMNS], show="headings",
+                                 height=page_rows, selectmode="extended")
+        for key, title, width, anchor in COLUMNS:
+            self.tree.heading(key, text=title, command=lambda k=key: self.sort(k))
+            self.tree.column(key, width=width, anchor=anchor, stretch=(key in ("source", "name")))
+        self.scroll = ttk.Scrollbar(self, orient="vertical", command=self.on_scroll)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scroll.pack(side="right", fill="y")
+
+        self.items = []
+        self.resize_pool(page_rows)
+
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<Button-1>", self.on_click, add="+")
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll_by(-WHEEL_ROWS if e.delta > 0 else WHEEL_ROWS))
+        self.tree.bind("<Button-4>", lambda e: self.scroll_by(-WHEEL_ROWS))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_by(WHEEL_ROWS))
+        self.tree.bind("<Prior>", lambda e: self.scroll_by(-self.view.page_rows))
+        self.tree.bind("<Next>", lambda e: self.scroll_by(self.view.page_rows))
+        self.tree.bind("<Up>", lambda e: self.on_arrow(-1))
+        self.tree.bind("<Down>", lambda e: self.on_arrow(1))
+        self.tree.bind("<Control-a>", self.on_select_all)
+        self.tree.bind("<Configure>", self.on_resize)
+
+    def resize_pool(self, rows):
+        """Keeps exactly one Treeview item per visible row."""
+        while len(self.items) < rows:
+            self.items.append(self.tree.insert("", "end", values=()))
+        while len(self.items) > rows:
+            self.tree.delete(self.items.pop())
+        self.view.page_rows = rows
+        self.view.scroll_to(self.view.offset)
+
+    def set_rows(self, rows):
+        self.view.set_rows(rows)
+        self.render()
+
+    def set_filter(self, text):
+        self.view.apply_filter(text)
+        self.render()
+
+    def sort(self, column):
+        self.view.sort(column)
+        for key, title, _, _ in COLUMNS:
+            arrow = (" ▼" if self.view.sort_reverse else " ▲") if key == column else ""
+            self.tree.heading(key, text=title + arrow)
+        self.render()
+
+    def render(self):
+        visible = self.view.visible()
+        for i, iid in enumerate(self.items):
+            if i < len(visible):
+                self.tree.item(iid, values=visible[i]['values'])
+                self.tree.move(iid, "", i)
+            else:
+                self.tree.detach(iid)
+        self.tree.selection_set([iid for iid, row in zip(self.items, visible) if row['key'] in self.view.selected])
+        self.scroll.set(*self.view.fraction())
+        if self.on_change:
+            self.on_change(len(self.view.rows), len(self.view.all_rows), len(self.view.selected_rows()))
+
+    # --- Events ---
+
+    def on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self.view.scroll_to(int(float(amount) * len(self.view.rows)))
+        else:
+            step = self.view.page_rows if unit == "pages" else 1
+            self.view.scroll_to(self.view.offset + int(amount) * step)
+        self.render()
+
+    def scroll_by(self, rows):
+        self.view.scroll_to(self.view.offset + rows)
+        self.render()
+        return "break"
+
+    def on_arrow(self, delta):
+        """Arrow keys move within the page natively; at its edge the page scrolls instead."""
+        focus = self.tree.focus()
+        if focus not in self.items:
+            return None
+        index = self.items.index(focus) + delta
+        shown = len(self.view.visible())
+        if 0 <= index < shown:
+            return None
+        before = self.view.offset
+        if self.view.scroll_to(before + delta) == before:
+            return "break"
+        row = self.view.rows[self.view.offset + min(max(index, 0), shown - 1)]
+        self.view.selected = {row['key']}
+        self.render()
+        self.tree.focus(self.items[min(max(index, 0), shown - 1)])
+        return "break"
+
+    def on_click(self, event):
+        # A plain click starts a new selection, including rows scrolled out of view
+        iid = self.tree.identify_row(event.y)
+        if iid in self.items and not event.state & 0x0005:
+            visible = self.view.visible()
+            index = self.items.index(iid)
+            self.view.selected = {visible[index]['key']} if index < len(visible) else set()
+
+    def on_select(self, event=None):
+        chosen = set(self.tree.selection())
+        for iid, row in zip(self.items, self.view.visible()):
+            if iid in chosen:
+                self.view.selected.add(row['key'])
+            else:
+                self.view.selected.discard(row['key'])
+        if self.on_change:
+            self.on_change(len(self.view.rows), len(self.view.all_rows), len(self.view.selected_rows()))
+
+    def on_select_all(self, event=None):
+        self.view.select_all()
+        self.render()
+        return "break"
+
+    def on_resize(self, event):
+        try:
+            row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        except (ValueError, tk.TclError):
+            row_height = 20
+        rows = max(1, (event.height - row_height - 4) // row_height)
+        if rows != self.view.page_rows:
+            self.resize_pool(rows)
+            self.render()
+
+    def selected_rows(self):
+        return self.view.selected_rows()
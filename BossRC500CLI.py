@@ -0,0 +1,450 @@
+"""
+Boss RC-500 Command Line
+------------------------
+Non-interactive front end for scripts, cron and CI. Nothing here waits for
+input; the result of each command is a JSON document (--json) and an exit
+code.
+
+Commands:
+    scan                      list memories and tracks on the pedal
+    backup [DEST]             copy tracks into a folder (or --archive zip|tar.xz)
+    restore SOURCE            put tracks from a backup folder, archive or
+                              dedup store snapshot back on the pedal (audio only)
+    delete --slots R --yes    delete slots from the pedal
+    clone SOURCE TARGET.. --yes
+                              copy a pedal, backup or snapshot onto several
+                              pedals at once (--all: every other pedal found)
+    report FOLDER             rebuild the manifest and reports of a backup folder
+    sync LIBRARY              bring a library folder and the pedal in step
+                              (--mode to-library|to-pedal|both, --deletes,
+                              --dry-run; --yes to delete tracks from the pedal)
+    prune FOLDER --daily N .. apply retention rules to the backups in a folder
+                              (--dry-run to only list what would go)
+    tune [FOLDER ...]         measure the I/O speed of the pedal (and backup
+                              drives) and remember the best copy settings
+
+Common options: --pedal PATH (default: RC500_DRIVE, then drive scan),
+--slots 1-10,15, --jobs N (parallel copies), --json, --trace.
+Without --jobs, backup and restore use the copy settings measured for the
+pedal and backup drive by the tune command (BossRC500Tune.py); drives that
+haven't been tested, and --no-tune, use fixed defaults.
+With --daemon, scan/backup/restore/delete/sync go through a running
+BossRC500Daemon.py instead of reading the pedal directly.
+
+Exit codes:
+    0  success
+    1  finished, but some files failed
+    2  error (pedal not found, bad arguments, unreadable backup)
+    3  nothing matched (no tracks in the selected slots)
+
+Examples:
+    python BossRC500CLI.py --json scan
+    python BossRC500CLI.py --jobs 4 backup D:/Backups/nightly --archive zip
+    python BossRC500CLI.py restore "Backups/Boss RC-500 Backup 2026-10-19" --slots 1-10
+    python BossRC500CLI.py delete --slots 90-99 --yes
+    python BossRC500CLI.py sync D:/Library --mode both --dry-run
+    python BossRC500CLI.py --daemon --json scan --slots 1-10
+    python BossRC500CLI.py clone E: --all --memory --yes
+    python BossRC500CLI.py prune D:/Backups --daily 7 --weekly 4 --monthly 12 --max-size 50G --yes
+
+Copyright (C) 2026 [pmonk.com]
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import os
+import sys
+import json
+import argparse
+from datetime import datetime
+
+import BossRC500Core as rc_core
+import BossRC500Archive as rc_archive
+import BossRC500Clone as rc_clone
+import BossRC500Prune as rc_prune
+import BossRC500Sync as rc_sync
+import BossRC500Daemon as rc_daemon
+import BossRC500Trace as rc_trace
+import BossRC500Tune as rc_tune
+
+EXIT_OK = 0
+EXIT_PARTIAL = 1
+EXIT_ERROR = 2
+EXIT_NO_MATCH = 3
+
+DEFAULT_JOBS = 4
+
+
+class CLIError(Exception):
+    def __init__(self, message, code=EXIT_ERROR):
+        super().__init__(message)
+        self.code = code
+
+def wave_dir_for(path):
+    """ROLAND/WAVE folder for a drive, pedal root or WAVE folder, or None."""
+    if os.path.basename(os.path.normpath(path)).upper() == "WAVE" and os.path.isdir(path):
+        return path
+    return rc_core.find_pedal([path])
+
+def resolve_pedal(args):
+    """ROLAND/WAVE folder from --pedal (a drive, pedal root or WAVE folder) or detection."""
+    if args.pedal:
+        source = wave_dir_for(args.pedal)
+    else:
+        source = rc_core.find_pedal()
+    if not source:
+        raise CLIError("Boss RC-500 not found (use --pedal or RC500_DRIVE).")
+    return source
+
+def resolve_slots(args):
+    if not args.slots:
+        return None
+    slots = rc_core.parse_range(args.slots)
+    if not slots:
+        raise CLIError(f"Invalid slot range: {args.slots}")
+    return slots
+
+def resolve_tuning(args, source, dest, log):
+    """Autotuned copy settings, or None when --jobs or --no-tune sets them by hand."""
+    if args.jobs is not None or args.no_tune:
+        return None
+    return rc_tune.transfer_settings(source, dest, probe_missing=False, logger_func=log)
+
+def outcome(errors, done):
+    if errors:
+        return EXIT_PARTIAL
+    return EXIT_OK if done else EXIT_NO_MATCH
+
+# --- COMMANDS ---
+
+def cmd_scan(args, log):
+    source = resolve_pedal(args)
+    slots = resolve_slots(args)
+    metadata = rc_core.parse_metadata(source, log)
+    tracks = rc_core.scan_wave_tracks(source, metadata, slots)
+    for t in tracks:
+        t['size'] = os.path.getsize(t['path'])
+        log(f"#{t['slot']:03d} Trk {t['track']}: {t['file']} ({t['size'] / 1048576:.1f} MB)")
+    log(f"{len(tracks)} tracks in {len({t['slot'] for t in tracks})} memories")
+
+    memories = {k: v for k, v in sorted(metadata.items()) if slots is None or k in slots}
+    tracks.sort(key=lambda t: (t['slot'], str(t['track'])))
+    return {'pedal': source, 'memories': memories, 'tracks': tracks}, outcome([], tracks)
+
+def cmd_backup(args, log):
+    source = resolve_pedal(args)
+    slots = resolve_slots(args)
+    dest = args.dest or os.path.join(os.getcwd(), f"Boss RC-500 Backup {datetime.now().strftime('%Y-%m-%d')}")
+    tuning = resolve_tuning(args, source, dest, log)
+    result = rc_core.backup_pedal(source, dest, slots, args.archive, args.skip_silent, args.jobs or DEFAULT_JOBS,
+                                  log, tuning)
+    log(f"Backed up {len(result['tracks'])} tracks ({result['bytes'] / 1048576:.1f} MB) to {result['dest']}")
+    return dict(result, pedal=source), outcome(result['errors'], result['tracks'])
+
+def cmd_restore(args, log):
+    source = resolve_pedal(args)
+    slots = resolve_slots(args)
+    if not os.path.exists(args.source):
+        raise CLIError(f"Backup not found: {args.source}")
+    tuning = resolve_tuning(args, args.source, source, log)
+    result = rc_core.restore_backup(args.source, source, slots, args.skip_silent, args.jobs or DEFAULT_JOBS,
+                                    log, tuning)
+    log(f"Restored {len(result['restored'])} tracks. Remember to rename them on the pedal.")
+    return dict(result, pedal=source), outcome(result['errors'], result['restored'])
+
+def cmd_delete(args, log):
+    source = resolve_pedal(args)
+    slots = resolve_slots(args)
+    if slots is None:
+        raise CLIError("delete needs --slots")
+    folders = rc_core.find_slot_folders(source, slots)
+    names = [os.path.basename(f) for f in folders]
+    if not folders:
+        log("No matching folders found on the pedal.")
+        return {'pedal': source, 'deleted': [], 'errors': []}, EXIT_NO_MATCH
+    if args.dry_run:
+        for name in names:
+            log(f"[FOUND] {name}")
+        return {'pedal': source, 'would_delete': names, 'errors': []}, EXIT_OK
+    if not args.yes:
+        raise CLIError(f"Refusing to delete {len(folders)} track folders without --yes")
+    deleted, errors = rc_core.delete_folders(folders, log)
+    return {'pedal': source, 'deleted': deleted, 'errors': errors}, outcome(errors, deleted)
+
+def cmd_report(args, log):
+    folder = args.folder
+    if not os.path.isdir(folder):
+        raise CLIError(f"Not a folder: {folder}")
+    loaded = rc_core.load_manifest(folder)
+    if loaded:
+        metadata, tracks, source = loaded
+    else:
+        metadata, tracks, source = {}, rc_core.tracks_from_folder(folder), ""
+        rc_core.write_manifest(folder, metadata, tracks)
+    if args.analyze:
+        rc_core.analyze_tracks(tracks, folder, log)
+        rc_core.write_manifest(folder, metadata, tracks, source)
+    html = rc_core.create_reports(metadata, folder, log, tracks)
+    return {'folder': folder, 'tracks': len(tracks), 'report': html}, outcome([], html)
+
+def cmd_sync(args, log):
+    source = resolve_pedal(args)
+    slots = resolve_slots(args)
+    def tuning(src, dst):
+        return resolve_tuning(args, src, dst, log)
+    def confirm(plan):
+        return args.yes or not plan['counts'].get(rc_sync.DELETE_PEDAL)
+    result = rc_sync.run_sync(source, args.library, rc_sync.MODE_NAMES[args.mode], slots and set(slots),
+                              args.deletes, not args.dry_run, args.jobs or DEFAULT_JOBS, log, tuning, confirm)
+    if result['pending'] and not args.dry_run and not result['applied']:
+        raise CLIError(f"Refusing to delete {result['counts'][rc_sync.DELETE_PEDAL]} tracks from the pedal without --yes")
+    return result, EXIT_PARTIAL if result['errors'] else EXIT_OK
+
+def cmd_clone(args, log):
+    slots = resolve_slots(args)
+    if not os.path.exists(args.source):
+        raise CLIError(f"Source not found: {args.source}")
+    targets = []
+    for t in args.targets:
+        wave = wave_dir_for(t)
+        if not wave:
+            raise CLIError(f"No Boss RC-500 at {t}")
+        targets.append(wave)
+    if args.all:
+        targets += rc_core.find_pedals()
+    source_real = os.path.realpath(wave_dir_for(args.source) or args.source)
+    unique = {}
+    for wave in targets:
+        real = os.path.realpath(wave)
+        if real != source_real:
+            unique.setdefault(real, wave)
+    targets = list(unique.values())
+    if not targets:
+        raise CLIError("No target pedals (name them or use --all).")
+    if not args.yes:
+        raise CLIError(f"Refusing to overwrite {len(targets)} pedals without --yes")
+    result = rc_clone.clone(args.source, targets, slots, args.memory, args.keep_extra, not args.no_verify, log)
+    failed = [t for t, r in result['targets'].items() if not r['ok']]
+    ok = [t for t, r in result['targets'].items() if r['ok']]
+    log(f"Cloned {result['files']} files ({result['bytes'] / 1048576:.1f} MB) to {len(ok)} of {len(targets)} pedals")
+    if failed and not ok:
+        return dict(result, source=args.source), EXIT_ERROR
+    return dict(result, source=args.source), outcome(failed, result['files'])
+
+def cmd_prune(args, log):
+    if not os.path.isdir(args.folder):
+        raise CLIError(f"Not a folder: {args.folder}")
+    max_bytes = None
+    if args.max_size:
+        max_bytes = rc_prune.parse_size(args.max_size)
+        if max_bytes is None:
+            raise CLIError(f"Invalid size: {args.max_size}")
+    if not (args.daily or args.weekly or args.monthly or args.yearly or max_bytes is not None or args.last > 1):
+        raise CLIError("No retention rule given (--daily, --weekly, --monthly, --yearly, --last or --max-size)")
+    if not args.yes and not args.dry_run:
+        raise CLIError("Refusing to prune without --yes (or use --dry-run)")
+    result = rc_prune.prune(args.folder, args.last, args.daily, args.weekly, args.monthly, args.yearly,
+                            max_bytes, args.dry_run, log)
+    return dict(result, folder=args.folder), EXIT_PARTIAL if result['errors'] else EXIT_OK
+
+def cmd_tune(args, log):
+    pedal = wave_dir_for(args.pedal) if args.pedal else rc_core.find_pedal()
+    if not pedal and not args.folders:
+        raise CLIError("Boss RC-500 not found (use --pedal or RC500_DRIVE).")
+    paths = ([pedal] if pedal else []) + args.folders
+    profiles = [rc_tune.profile_for(path, force=True, logger_func=log) for path in paths]
+    if pedal:
+        for folder, profile in zip(args.folders, profiles[1:]):
+            log(f"Backup to {folder}: {rc_tune.describe_settings(rc_tune.choose_settings(profiles[0], profile))}")
+            log(f"Restore from {folder}: {rc_tune.describe_settings(rc_tune.choose_settings(profile, profiles[0]))}")
+    warnings = [w for p in profiles for w in p.get('warnings', [])]
+    return {'profiles': profiles, 'saved': rc_tune.tuning_path()}, EXIT_PARTIAL if warnings else EXIT_OK
+
+# --- DAEMON COMMANDS ---
+
+def run_job(args, kind, log, **params):
+    """Submits a job to the daemon and follows its log until it finishes."""
+    job = args.client.submit(kind, **params)
+    job = args.client.wait(job['id'], log)
+    if job['state'] == "failed":
+        raise CLIError(job['error'])
+    return job['result']
+
+def daemon_scan(args, log):
+    resolve_slots(args)
+    pedal = args.client.status()['pedal']
+    if not pedal:
+        raise CLIError("The daemon has not found the Boss RC-500.")
+    metadata = args.client.memories(args.slots)
+    tracks = args.client.tracks(args.slots)
+    for t in tracks:
+        log(f"#{t['slot']:03d} Trk {t['track']}: {t['file']} ({t['size'] / 1048576:.1f} MB)")
+    log(f"{len(tracks)} tracks in {len({t['slot'] for t in tracks})} memories")
+    return {'pedal': pedal, 'memories': metadata, 'tracks': tracks}, outcome([], tracks)
+
+def daemon_backup(args, log):
+    resolve_slots(args)
+    dest = os.path.abspath(args.dest) if args.dest else None
+    result = run_job(args, "backup", log, dest=dest, slots=args.slots, archive=args.archive,
+                     skip_silent=args.skip_silent, jobs=args.jobs)
+    log(f"Backed up {len(result['tracks'])} tracks ({result['bytes'] / 1048576:.1f} MB) to {result['dest']}")
+    return result, outcome(result['errors'], result['tracks'])
+
+def daemon_restore(args, log):
+    resolve_slots(args)
+    result = run_job(args, "restore", log, source=os.path.abspath(args.source), slots=args.slots,
+                     skip_silent=args.skip_silent, jobs=args.jobs)
+    log(f"Restored {len(result['restored'])} tracks. Remember to rename them on the pedal.")
+    return result, outcome(result['errors'], result['restored'])
+
+def daemon_delete(args, log):
+    resolve_slots(args)
+    if args.dry_run:
+        names = sorted({os.path.basename(os.path.dirname(t['path'])) for t in args.client.tracks(args.slots)})
+        for name in names:
+            log(f"[FOUND] {name}")
+        return {'would_delete': names, 'errors': []}, EXIT_OK if names else EXIT_NO_MATCH
+    if not args.yes:
+        raise CLIError("Refusing to delete without --yes")
+    result = run_job(args, "delete", log, slots=args.slots, confirm=True)
+    return result, outcome(result['errors'], result['deleted'])
+
+def daemon_sync(args, log):
+    resolve_slots(args)
+    result = run_job(args, "sync", log, library=os.path.abspath(args.library), mode=args.mode, slots=args.slots,
+                     deletes=args.deletes, dry_run=args.dry_run, confirm=args.yes, jobs=args.jobs)
+    return result, EXIT_PARTIAL if result['errors'] else EXIT_OK
+
+DAEMON_COMMANDS = {
+    "scan": daemon_scan,
+    "backup": daemon_backup,
+    "restore": daemon_restore,
+    "delete": daemon_delete,
+    "sync": daemon_sync,
+}
+
+COMMANDS = {
+    "scan": cmd_scan,
+    "backup": cmd_backup,
+    "restore": cmd_restore,
+    "delete": cmd_delete,
+    "report": cmd_report,
+    "sync": cmd_sync,
+    "clone": cmd_clone,
+    "prune": cmd_prune,
+    "tune": cmd_tune,
+}
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Scriptable Boss RC-500 tools (no prompts).")
+    parser.add_argument("--pedal", help="pedal drive, mount point or ROLAND/WAVE folder")
+    parser.add_argument("--jobs", type=int, help="parallel file copies / analysis workers (default: autotuned)")
+    parser.add_argument("--no-tune", action="store_true", help=f"ignore the tune results; copy {DEFAULT_JOBS} files at a time")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON on stdout (log goes to stderr)")
+    parser.add_argument("--quiet", action="store_true", help="no log output")
+    parser.add_argument("--trace", action="store_true", help="save a Chrome trace of the command")
+    parser.add_argument("--daemon", nargs="?", const="", metavar="URL",
+                        help="use a running BossRC500Daemon (default: RC500_DAEMON or localhost:8500)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("scan", help="list memories and tracks")
+    p.add_argument("--slots", help="only these slots, e.g. 1-10,15")
+
+    p = sub.add_parser("backup", help="back up the pedal")
+    p.add_argument("dest", nargs="?", help="backup folder (default: dated folder in the current directory)")
+    p.add_argument("--slots", help="only these slots")
+    p.add_argument("--archive", choices=sorted(rc_archive.ARCHIVE_FORMATS), help="write one archive instead")
+    p.add_argument("--skip-silent", action="store_true", help="leave out silent / empty tracks")
+
+    p = sub.add_parser("restore", help="restore audio to the pedal")
+    p.add_argument("source", help="backup folder, archive or dedup store snapshot")
+    p.add_argument("--slots", help="only these slots")
+    p.add_argument("--skip-silent", action="store_true", help="leave out silent / empty tracks")
+
+    p = sub.add_parser("delete", help="delete slots from the pedal")
+    p.add_argument("--slots", required=True, help="slots to delete, e.g. 90-99")
+    p.add_argument("--yes", action="store_true", help="confirm the delete")
+    p.add_argument("--dry-run", action="store_true", help="only list what would be deleted")
+
+    p = sub.add_parser("report", help="rebuild a backup folder's manifest and reports")
+    p.add_argument("folder")
+    p.add_argument("--analyze", action="store_true", help="also measure levels (needs numpy)")
+
+    p = sub.add_parser("sync", help="bring a library folder and the pedal in step")
+    p.add_argument("library", help="library folder of exported WAVs")
+    p.add_argument("--mode", choices=sorted(rc_sync.MODE_NAMES), default="to-library",
+                   help="which side wins (default to-library; both: the side that changed since the last sync)")
+    p.add_argument("--slots", help="only these slots")
+    p.add_argument("--deletes", action="store_true", help="delete tracks that are missing on the other side")
+    p.add_argument("--dry-run", action="store_true", help="only list what would change")
+    p.add_argument("--yes", action="store_true", help="confirm deleting tracks from the pedal")
+
+    p = sub.add_parser("clone", help="copy one pedal, backup or snapshot onto several pedals")
+    p.add_argument("source", help="pedal, backup folder, archive or dedup store snapshot")
+    p.add_argument("targets", nargs="*", help="target pedals (drive, pedal root or WAVE folder)")
+    p.add_argument("--all", action="store_true", help="also every other pedal found (RC500_DRIVE or drive scan)")
+    p.add_argument("--slots", help="only these slots")
+    p.add_argument("--memory", action="store_true", help="also copy MEMORY1/2.RC0 (pedal source only)")
+    p.add_argument("--keep-extra", action="store_true", help="keep target tracks the source doesn't have")
+    p.add_argument("--no-verify", action="store_true", help="skip reading the targets back")
+    p.add_argument("--yes", action="store_true", help="confirm overwriting the targets")
+
+    p = sub.add_parser("prune", help="delete old backups by retention rules")
+    p.add_argument("folder", help="folder holding the dated backups (and RC500_Store)")
+    p.add_argument("--last", type=int, default=1, help="keep the newest N backups (default 1)")
+    p.add_argument("--daily", type=int, default=0, help="keep one backup for each of the last N days")
+    p.add_argument("--weekly", type=int, default=0, help="keep one backup for each of the last N weeks")
+    p.add_argument("--monthly", type=int, default=0, help="keep one backup for each of the last N months")
+    p.add_argument("--yearly", type=int, default=0, help="keep one backup for each of the last N years")
+    p.add_argument("--max-size", help="then prune the oldest until the backups fit, e.g. 50G")
+    p.add_argument("--yes", action="store_true", help="confirm the delete")
+    p.add_argument("--dry-run", action="store_true", help="only list what would be pruned")
+
+    p = sub.add_parser("tune", help="test the pedal's (and backup drives') I/O speed")
+    p.add_argument("folders", nargs="*", help="backup folders to test as well (their drives)")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.jobs is not None:
+        args.jobs = max(1, args.jobs)
+
+    stream = sys.stderr if args.json else sys.stdout
+    def log(message):
+        if not args.quiet:
+            print(message, file=stream, flush=True)
+
+    if args.trace:
+        rc_trace.tracer.enabled = True
+
+    handler = COMMANDS[args.command]
+    if args.daemon is not None and args.command in DAEMON_COMMANDS:
+        handler = DAEMON_COMMANDS[args.command]
+        args.client = rc_daemon.connect(args.daemon or None, timeout=2.0)
+
+    try:
+        if handler in DAEMON_COMMANDS.values() and args.client is None:
+            raise CLIError("No daemon answering (start BossRC500Daemon.py or check --daemon URL).")
+        payload, code = handler(args, log)
+    except CLIError as e:
+        log(f"Error: {e}")
+        payload, code = {'error': str(e)}, e.code
+    except rc_daemon.DaemonError as e:
+        log(f"Error: {e}")
+        payload, code = {'error': str(e)}, EXIT_ERROR
+    except Exception as e:
+        log(f"Error: {e}")
+        payload, code = {'error': str(e)}, EXIT_ERROR
+
+    if args.trace:
+        rc_trace.tracer.finish(args.command, os.getcwd(), log)
+
+    if args.json:
+        print(json.dumps(dict(payload, command=args.command, exit_code=code), indent=2, default=str))
+    return code
+
+if __name__ == "__main__":
+    sys.exit(main())
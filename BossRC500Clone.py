@@ -0,0 +1,302 @@
+"""
+Boss RC-500 Clone
+-----------------
+Copies one source to several pedals at once, reading the source only once.
+
+Sources: a live pedal, a backup folder, a backup archive (zip / tar.xz) or
+a dedup store snapshot. The tracks are written to ROLAND/WAVE on every
+target; with memory=True, ROLAND/DATA/MEMORY1.RC0 and MEMORY2.RC0 are
+copied too (only a live pedal has them).
+
+Each block is read once and handed to one writer thread per target through
+a short queue, so all pedals are written at the same time and the whole
+clone takes about as long as copying to the slowest one. Files are written
+under a .part name and renamed when complete. At the end every target is
+read back and each file's SHA-256 is checked against the source. A target
+that fails (for example unplugged) is reported and the others carry on.
+
+By default track folders on the targets that the source doesn't have are
+removed, so every pedal ends up identical (keep_extra=True leaves them).
+With slots, only those memories are cloned and cleaned up.
+
+Used by: python BossRC500CLI.py clone SOURCE TARGET [TARGET ...] --yes
+
+Copyright (C) 2026 [pmonk.com]
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import os
+import queue
+import hashlib
+import tarfile
+import zipfile
+import threading
+
+import BossRC500Core as rc_core
+import BossRC500Archive as rc_archive
+import BossRC500Store as rc_store
+import BossRC500Trace as rc_trace
+
+BLOCK_SIZE = 1024 * 1024
+# Blocks waiting per target; bounds memory to a few MB per pedal
+QUEUE_BLOCKS = 8
+MEMORY_FILES = ("MEMORY1.RC0", "MEMORY2.RC0")
+PART_SUFFIX = ".part"
+
+
+def track_rel(slot, track):
+    """Path of a track below ROLAND, e.g. WAVE/001_1/001_1.WAV"""
+    return f"WAVE/{slot:03d}_{track}/{slot:03d}_{track}.WAV"
+
+def _read_blocks(f):
+    for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+        yield block
+
+def _file_blocks(path):
+    with open(path, "rb") as f:
+        yield from _read_blocks(f)
+
+# --- SOURCES ---
+# A source is (plan, stream): plan lists (rel, size) up front, stream()
+# yields (rel, block iterator) in the same order, reading each file once.
+
+def pedal_source(wave_dir, slots=None, memory=False):
+    files = []
+    for folder in sorted(os.listdir(wave_dir)):
+        parts = folder.split("_")
+        path = os.path.join(wave_dir, folder)
+        if len(parts) < 2 or not parts[0].isdigit() or not os.path.isdir(path):
+            continue
+        if slots is not None and int(parts[0]) not in slots:
+            continue
+        for f in sorted(os.listdir(path)):
+            if f.lower().endswith(".wav"):
+                files.append((f"WAVE/{folder}/{f}", os.path.join(path, f)))
+    if memory:
+        data_dir = os.path.join(os.path.dirname(wave_dir), "DATA")
+        for name in MEMORY_FILES:
+            if os.path.exists(os.path.join(data_dir, name)):
+                files.append((f"DATA/{name}", os.path.join(data_dir, name)))
+
+    plan = [(rel, os.path.getsize(path)) for rel, path in files]
+    def stream():
+        for rel, path in files:
+            yield rel, _file_blocks(path)
+    return plan, stream
+
+def folder_source(folder, slots=None):
+    loaded = rc_core.load_manifest(folder)
+    tracks = loaded[1] if loaded else rc_core.tracks_from_folder(folder)
+    files = [(track_rel(t['slot'], t['track']), os.path.join(folder, t['file'])) for t in tracks
+             if slots is None or t['slot'] in slots]
+    plan = [(rel, os.path.getsize(path)) for rel, path in files]
+    def stream():
+        for rel, path in files:
+            yield rel, _file_blocks(path)
+    return plan, stream
+
+def snapshot_source(path, slots=None):
+    snapshot = rc_store.load_snapshot(path)
+    store = rc_store.store_for_snapshot(path)
+    tracks = [t for t in snapshot.get('tracks', []) if slots is None or t['slot'] in slots]
+    plan = [(track_rel(t['slot'], t['track']), snapshot['files'][t['file']]['size']) for t in tracks]
+    def stream():
+        for t, (rel, _) in zip(tracks, plan):
+            record = snapshot['files'][t['file']]
+            yield rel, (store.read_chunk(d) for d in record['chunks'])
+    return plan, stream
+
+def archive_source(path, slots=None):
+    index = rc_archive.read_index(path)
+    if index is None:
+        raise ValueError(f"No index found in {path}")
+    members = {t['file']: track_rel(t['slot'], t['track']) for t in index.get('tracks', [])
+               if slots is None or t['slot'] in slots}
+    sizes = {t['file']: t.get('size', 0) for t in index.get('tracks', [])}
+    plan = [(rel, sizes[name]) for name, rel in members.items()]
+
+    def stream():
+        if rc_archive.archive_format(path) == "zip":
+            with zipfile.ZipFile(path) as zf:
+                for name, rel in members.items():
+                    with zf.open(name) as f:
+                        yield rel, _read_blocks(f)
+            return
+        # tar.xz can only be read front to back, so files come in archive order
+        with tarfile.open(path, "r|xz") as tf:
+            for member in tf:
+                if member.name in members and member.isfile():
+                    with tf.extractfile(member) as f:
+                        yield members[member.name], _read_blocks(f)
+    return plan, stream
+
+def open_source(path, slots=None, memory=False, logger_func=None):
+    """(label, plan, stream) for a pedal, backup folder, archive or snapshot."""
+    log = logger_func or (lambda m: None)
+    wave_dir = path if os.path.basename(os.path.normpath(path)).upper() == "WAVE" else rc_core.find_pedal([path])
+    if wave_dir and os.path.isdir(wave_dir):
+        return "pedal", *pedal_source(wave_dir, slots, memory)
+    if memory:
+        log("Note: memory settings (MEMORY1.RC0) are only cloned from a live pedal; backups don't contain them.")
+    if os.path.isdir(path):
+        return "backup folder", *folder_source(path, slots)
+    if rc_store.is_snapshot(path):
+        return "snapshot", *snapshot_source(path, slots)
+    if rc_archive.archive_format(path):
+        return "archive", *archive_source(path, slots)
+    raise ValueError(f"Not a pedal, backup folder, archive or snapshot: {path}")
+
+# --- TARGETS ---
+
+class TargetWriter(threading.Thread):
+    """Writes the blocks it is sent to one pedal (ROLAND folder) and verifies them."""
+
+    def __init__(self, wave_dir):
+        super().__init__(daemon=True)
+        self.wave_dir = wave_dir
+        self.roland = os.path.dirname(os.path.abspath(wave_dir))
+        self.queue = queue.Queue(QUEUE_BLOCKS)
+        self.error = None
+        self.current = None
+        self.out = None
+        self.written = 0
+        self.files = []
+        self.mismatched = []
+
+    def path(self, rel):
+        return os.path.join(self.roland, *rel.split("/"))
+
+    def run(self):
+        while True:
+            op, arg = self.queue.get()
+            if op == "stop":
+                break
+            if self.error:
+                continue  # keep draining so the reader never blocks on a failed pedal
+            try:
+                if op == "open":
+                    self.current = self.path(arg)
+                    os.makedirs(os.path.dirname(self.current), exist_ok=True)
+                    self.out = open(self.current + PART_SUFFIX, "wb")
+                elif op == "data":
+                    self.out.write(arg)
+                    self.written += len(arg)
+                elif op == "close":
+                    self.out.close()
+                    self.out = None
+                    os.replace(self.current + PART_SUFFIX, self.current)
+                    self.files.append(arg)
+                elif op == "verify":
+                    self.verify(arg)
+            except Exception as e:
+                self.error = e
+                if self.out:
+                    try:
+                        self.out.close()
+                    except OSError:
+                        pass
+                    self.out = None
+                    try:
+                        os.remove(self.current + PART_SUFFIX)
+                    except OSError:
+                        pass
+
+    def verify(self, digests):
+        """Reads every written file back and compares it with the source checksum."""
+        for rel in self.files:
+            h = hashlib.sha256()
+            for block in _file_blocks(self.path(rel)):
+                h.update(block)
+            if h.hexdigest() != digests[rel]:
+                self.mismatched.append(rel)
+
+    def send(self, op, arg=None):
+        self.queue.put((op, arg))
+
+def remove_extra(wave_dir, planned_folders, slots, logger_func):
+    """Deletes track folders on a target that the source doesn't have."""
+    extra = []
+    for folder in sorted(os.listdir(wave_dir)):
+        parts = folder.split("_")
+        if len(parts) < 2 or not parts[0].isdigit() or folder in planned_folders:
+            continue
+        if slots is None or int(parts[0]) in slots:
+            extra.append(os.path.join(wave_dir, folder))
+    return rc_core.delete_folders(extra, logger_func)[0]
+
+def clone(source, targets, slots=None, memory=False, keep_extra=False, verify=True, logger_func=None):
+    """
+    Clones source onto every target (ROLAND/WAVE folders).
+    Returns {'files', 'bytes', 'targets': {wave_dir: {'written', 'files', 'removed', 'error', 'mismatched', 'ok'}}}.
+    """
+    log = logger_func or (lambda m: None)
+    trace = rc_trace.tracer
+    slots = set(slots) if slots is not None else None
+    kind, plan, stream = open_source(source, slots, memory, log)
+    total = sum(size for _, size in plan)
+    log(f"Cloning {len(plan)} files ({total / 1048576:.1f} MB) from {kind} {source} to {len(targets)} pedals")
+
+    writers = [TargetWriter(t) for t in targets]
+    removed = {}
+    planned_folders = {rel.split("/")[1] for rel, _ in plan if rel.startswith("WAVE/")}
+    if not keep_extra:
+        trace.phase("clean")
+        for w in writers:
+            try:
+                removed[w.wave_dir] = remove_extra(w.wave_dir, planned_folders, slots, log)
+            except OSError as e:
+                w.error = e
+    for w in writers:
+        w.start()
+
+    trace.phase("clone")
+    digests = {}
+    sent = 0
+    for rel, blocks in stream():
+        live = [w for w in writers if not w.error]
+        if not live:
+            break
+        h = hashlib.sha256()
+        with trace.span("clone file", file=rel) as span:
+            for w in live:
+                w.send("open", rel)
+            for block in blocks:
+                h.update(block)
+                span.add_bytes(len(block))
+                sent += len(block)
+                for w in live:
+                    w.send("data", block)
+            for w in live:
+                w.send("close", rel)
+        digests[rel] = h.hexdigest()
+        log(f"Cloned: {rel}")
+
+    if verify:
+        trace.phase("verify")
+        log("Verifying...")
+        for w in writers:
+            w.send("verify", digests)
+    for w in writers:
+        w.send("stop")
+    for w in writers:
+        w.join()
+    trace.phase(None)
+
+    result = {'files': len(digests), 'bytes': sent, 'targets': {}}
+    for w in writers:
+        ok = w.error is None and not w.mismatched and len(w.files) == len(digests)
+        result['targets'][w.wave_dir] = {
+            'written': w.written, 'files': len(w.files), 'removed': removed.get(w.wave_dir, []),
+            'error': str(w.error) if w.error else None, 'mismatched': w.mismatched, 'ok': ok,
+        }
+        if w.error:
+            log(f"FAILED {w.wave_dir}: {w.error} ({len(w.files)} of {len(digests)} files written)")
+        elif w.mismatched:
+            log(f"FAILED {w.wave_dir}: {len(w.mismatched)} files differ from the source: {', '.join(w.mismatched)}")
+        else:
+            log(f"OK {w.wave_dir}: {len(w.files)} files" + (", verified" if verify else ""))
+    return result
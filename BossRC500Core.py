@@ -0,0 +1,865 @@
+"""
+Boss RC-500 Core
+----------------
+The logic shared by the GUI, the command-line tools and scripts, with no
+user interface: pedal detection, MEMORY1.RC0 parsing, the ROLAND/WAVE walk,
+export names, slot ranges, backup manifests and reports, and the backup,
+restore and delete operations themselves.
+
+Every function reports progress through an optional logger_func and never
+asks for input, so it can run unattended.
+
+Copyright (C) 2026 [pmonk.com]
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import os
+import re
+import json
+import shutil
+import string
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import BossRC500Audio as rc_audio
+import BossRC500Archive as rc_archive
+import BossRC500Store as rc_store
+import BossRC500Trace as rc_trace
+
+# --- METADATA HELPERS ---
+
+PEDAL_DRIVE_ENV = "RC500_DRIVE"
+
+def find_pedals(drives=None):
+    """
+    Every ROLAND/WAVE folder found on the given drives. By default those are
+    the RC500_DRIVE environment variable (several separated by os.pathsep)
+    if set, else all drive letters.
+    """
+    if drives is None and os.environ.get(PEDAL_DRIVE_ENV):
+        drives = [d for d in os.environ[PEDAL_DRIVE_ENV].split(os.pathsep) if d]
+    if drives is None:
+        drives = [f"{d}:/" for d in string.ascii_uppercase if os.path.exists(f"{d}:/")]
+    found = []
+    for drive in drives:
+        candidate = os.path.join(drive, "ROLAND", "WAVE")
+        if os.path.exists(candidate):
+            found.append(candidate)
+    return found
+
+def find_pedal(drives=None):
+    """Returns the first ROLAND/WAVE folder found (see find_pedals), or None."""
+    found = find_pedals(drives)
+    return found[0] if found else None
+
+def get_time_signature_map(beat_val):
+    beat_map = {
+        0: "2/4", 1: "3/4", 2: "4/4", 3: "5/4", 4: "6/4",
+        5: "7/4", 6: "5/8", 7: "6/8", 8: "7/8", 9: "8/8",
+        10: "9/8", 11: "10/8", 12: "11/8", 13: "12/8",
+        14: "13/8", 15: "14/8", 16: "15/8"
+    }
+    return beat_map.get(beat_val, "?")
+
+def format_bpm(bpm):
+    return f"{int(bpm)}bpm" if float(bpm).is_integer() else f"{bpm}bpm"
+
+def parse_metadata(boss_wave_path, logger_func):
+    """Parses MEMORY1.RC0 for Name, BPM, Time Sig, and Context."""
+    metadata = {}
+    try:
+        data_dir = os.path.abspath(os.path.join(boss_wave_path, "..", "DATA"))
+        xml_path = os.path.join(data_dir, "MEMORY1.RC0")
+        
+        if not os.path.exists(xml_path):
+            if logger_func: logger_func("Warning: MEMORY1.RC0 not found.")
+            return {}
+
+        if logger_func: logger_func("Reading metadata...")
+        
+        with open(xml_path, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+
+        mem_pattern = r'<mem id="(\d+)">(.*?)</mem>'
+        mem_blocks = re.findall(mem_pattern, content, re.DOTALL)
+        
+        for mem_id_str, mem_content in mem_blocks:
+            mem_id = int(mem_id_str) + 1
+            data = {'name': '', 'bpm': '', 'bpm_raw': 0, 'ts': '', 'ts_raw': '', 'pattern': '', 'kit': ''}
+            
+            # Name
+            name_codes = re.findall(r'<C(\d+)>(\d+)</C\d+>', mem_content)
+            if name_codes:
+                name_codes.sort(key=lambda x: int(x[0]))
+                chars = [chr(int(c)) for _, c in name_codes]
+                raw_name = "".join(chars).strip()
+                data['name'] = "".join([c for c in raw_name if c.isalnum() or c in ('-', '_', ' ')])
+
+            # BPM
+            tempo = re.search(r'<Tempo>(\d+)</Tempo>', mem_content)
+            if tempo:
+                bpm = int(tempo.group(1)) / 10.0
+                data['bpm_raw'] = bpm
+                data['bpm'] = format_bpm(bpm)
+
+            # Time Sig
+            beat = re.search(r'<Beat>(\d+)</Beat>', mem_content)
+            if beat:
+                val = int(beat.group(1))
+                data['ts_raw'] = val
+                data['ts'] = get_time_signature_map(val)
+            
+            # Context
+            pat = re.search(r'<Pattern>(\d+)</Pattern>', mem_content)
+            if pat: data['pattern'] = pat.group(1)
+            kit = re.search(r'<Kit>(\d+)</Kit>', mem_content)
+            if kit: data['kit'] = kit.group(1)
+
+            metadata[mem_id] = data
+            
+        return metadata
+    except Exception as e:
+        if logger_func: logger_func(f"Error parsing metadata: {str(e)}")
+        return {}
+
+def build_export_name(mem_slot, track_num, metadata):
+    """Builds the exported filename, e.g. 001_MySong_120bpm_4-4_Track_1.wav"""
+    fname_parts = [f"Memory_{mem_slot}"]
+    mem_int = int(mem_slot)
+    if mem_int in metadata:
+        m = metadata[mem_int]
+        if m['name']: fname_parts[0] = f"{mem_slot}_{m['name']}"
+        if m['bpm']: fname_parts.append(m['bpm'])
+        if m['ts']: fname_parts.append(m['ts'].replace('/', '-'))
+    return "_".join(fname_parts) + f"_Track_{track_num}.wav"
+
+def scan_wave_tracks(source, metadata, target_slots=None):
+    """
+    Walks ROLAND/WAVE and returns one entry per track WAV:
+    {'path', 'slot', 'track', 'file'} where 'file' is the export filename.
+    """
+    found = []
+    for root, dirs, files in os.walk(source):
+        for file in files:
+            if file.lower().endswith('.wav'):
+                try:
+                    folder_raw = os.path.basename(root)
+                    parts = folder_raw.split('_')
+                    if len(parts) >= 2:
+                        mem_slot = parts[0]
+                        track_num = parts[1]
+                        mem_int = int(mem_slot)
+
+                        if target_slots is not None and mem_int not in target_slots:
+                            continue
+
+                        found.append({
+                            'path': os.path.join(root, file),
+                            'slot': mem_int,
+                            'track': track_num,
+                            'file': build_export_name(mem_slot, track_num, metadata),
+                        })
+                except Exception: pass
+    return found
+
+def pedal_key(path, source):
+    """Stable index key for a track on the pedal, e.g. 001_1/001_1.WAV"""
+    return os.path.relpath(path, source).replace(os.sep, '/')
+
+def pedal_track_path(pedal_wave_dir, slot, track):
+    """ROLAND/WAVE path for a track, e.g. 098_1/098_1.WAV"""
+    return os.path.join(pedal_wave_dir, f"{slot:03d}_{track}", f"{slot:03d}_{track}.WAV")
+
+def parse_export_filename(filename):
+    """Returns (slot, track) for an exported WAV filename, or None."""
+    # Regex 1: "Memory_01_Name_Track_1.wav"
+    match = re.match(r"Memory_(\d+)_.*Track_(\d+)\.wav", filename, re.IGNORECASE)
+
+    # Regex 2: "098_Memory98_...Track_1.wav" (Number first)
+    if not match:
+        match = re.match(r"(\d+)_.*Track_(\d+)\.wav", filename, re.IGNORECASE)
+
+    # Regex 3: "Memory_01_Track_1.wav" (Simple)
+    if not match:
+        match = re.match(r"Memory_(\d+)_Track_(\d+)\.wav", filename, re.IGNORECASE)
+
+    if not match:
+        return None
+    return int(match.group(1)), match.group(2)
+
+# --- MANIFEST ---
+
+MANIFEST_NAME = "RC500_Manifest.json"
+REPORT_MD_NAME = "RC500_Library_Report.md"
+REPORT_HTML_NAME = "RC500_Library_Report.html"
+FINGERPRINT_INDEX_NAME = "RC500_Fingerprints.json"
+# Subfolder of a backup folder that the GUI moves silent tracks into
+SILENT_FOLDER = "Silent"
+
+# Tempo estimates less certain than this are not reported.
+TEMPO_MIN_CONFIDENCE = 0.3
+
+def build_manifest(metadata, tracks, source="", export_format=None, sample_rate=None, bundles=None):
+    """Backup manifest: metadata + one entry per exported track."""
+    return {
+        'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'source': source,
+        'format': export_format or "original",
+        'sample_rate': sample_rate,
+        'memories': {str(k): v for k, v in sorted(metadata.items())},
+        'tracks': sorted(tracks, key=lambda t: (t['slot'], str(t['track']))),
+        'bundles': bundles or [],
+    }
+
+def write_manifest(dest_dir, metadata, tracks, source="", export_format=None, sample_rate=None, bundles=None):
+    """Writes the backup manifest to RC500_Manifest.json."""
+    manifest = build_manifest(metadata, tracks, source, export_format, sample_rate, bundles)
+    path = os.path.join(dest_dir, MANIFEST_NAME)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return path
+
+def load_manifest(dest_dir):
+    """Loads a backup manifest. Returns (metadata, tracks, source) or None."""
+    path = os.path.join(dest_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    metadata = {int(k): v for k, v in manifest.get('memories', {}).items()}
+    return metadata, manifest.get('tracks', []), manifest.get('source', "")
+
+def tracks_from_folder(folder):
+    """Builds manifest track entries for the exported WAVs in a backup folder."""
+    tracks = []
+    for f in sorted(os.listdir(folder)):
+        parsed = parse_export_filename(f)
+        if parsed:
+            slot, track = parsed
+            tracks.append({
+                'file': f, 'slot': slot, 'track': track,
+                'size': os.path.getsize(os.path.join(folder, f)),
+            })
+    return tracks
+
+def analyze_tracks(tracks, folder, logger_func):
+    """Runs level analysis over manifest track entries and stores the results on them."""
+    if not rc_audio.HAVE_NUMPY:
+        logger_func("Level analysis skipped: numpy is not installed (pip install numpy).")
+        return tracks
+
+    paths = {os.path.join(folder, t['file']): t for t in tracks}
+    logger_func(f"Analyzing levels of {len(paths)} tracks...")
+    results = rc_audio.analyze_files(list(paths), logger_func=logger_func)
+    for path, result in results.items():
+        paths[path]['analysis'] = result
+    return tracks
+
+def check_tempos(tracks, metadata, logger_func):
+    """
+    Estimates BPM from the audio of each memory and compares it with <Tempo>.
+    Returns {slot: {'stored', 'estimated', 'confidence', 'agrees'}}.
+    """
+    if not rc_audio.HAVE_NUMPY:
+        logger_func("Tempo check skipped: numpy is not installed (pip install numpy).")
+        return {}
+
+    logger_func(f"Estimating tempo of {len(tracks)} tracks...")
+    results = rc_audio.estimate_tempos([t['path'] for t in tracks])
+
+    by_slot = {}
+    for t in tracks:
+        by_slot.setdefault(t['slot'], []).append(results[t['path']])
+
+    tempos = {}
+    for slot in sorted(by_slot):
+        best = rc_audio.best_tempo(by_slot[slot])
+        if not best or best['confidence'] < TEMPO_MIN_CONFIDENCE:
+            continue
+        stored = metadata.get(slot, {}).get('bpm_raw') or 0
+        agrees = rc_audio.tempo_agrees(stored, best['bpm'])
+        tempos[slot] = {
+            'stored': stored, 'estimated': best['bpm'],
+            'confidence': best['confidence'], 'agrees': agrees,
+        }
+        if not agrees:
+            logger_func(f"[TEMPO] #{slot:02d}: stored {stored or '-'} bpm, audio suggests {best['bpm']} bpm")
+    return tempos
+
+def apply_tempo_suggestions(metadata, tempos):
+    """Returns a copy of metadata with the estimated BPM for slots that disagree."""
+    fixed = dict(metadata)
+    for slot, t in tempos.items():
+        if not t['agrees'] and slot in fixed:
+            fixed[slot] = dict(fixed[slot], bpm=format_bpm(t['estimated']))
+    return fixed
+
+def find_backup_duplicates(tracks, folder, index, logger_func):
+    """Fingerprints a backup folder into the index and marks tracks that repeat audio."""
+    if not rc_audio.HAVE_NUMPY:
+        logger_func("Duplicate check skipped: numpy is not installed (pip install numpy).")
+        return tracks
+
+    location = os.path.basename(os.path.normpath(folder))
+    logger_func(f"Fingerprinting {len(tracks)} tracks...")
+    entries = index.update_location(location, [dict(t, path=os.path.join(folder, t['file'])) for t in tracks])
+
+    for t in tracks:
+        dupes = [d for d in index.find_duplicates(entries[t['file']]) if d['location'] == location]
+        t['duplicate_of'] = [rc_audio.describe_duplicate(d, location) for d in dupes]
+        if dupes:
+            logger_func(f"Duplicate: {t['file']} = {', '.join(t['duplicate_of'])}")
+    index.save()
+    return tracks
+
+def render_reports(metadata, tracks=None):
+    """Builds the Markdown and HTML report text. Returns (markdown, html) or None."""
+    html_rows = ""
+    md_rows = ""
+    
+    if not metadata and not tracks:
+        return None
+
+    sorted_ids = sorted(metadata.keys())
+    for mem_id in sorted_ids:
+        m = metadata[mem_id]
+        context_parts = []
+        if m['pattern']: context_parts.append(f"Pattern {m['pattern']}")
+        if m['kit']: context_parts.append(f"Kit {m['kit']}")
+        context_str = ", ".join(context_parts) if context_parts else "-"
+        
+        name = m['name'] or "Empty"
+        ts = m['ts'] or "-"
+        ts_raw = m['ts_raw'] if m['ts_raw'] != '' else "-"
+        bpm = m['bpm'] or "-"
+
+        # Markdown Row
+        md_rows += f"| {mem_id:02d} | {name} | {bpm} | {ts_raw} | {ts} | {context_str} |\n"
+        
+        # HTML Row
+        html_rows += f"""
+        <tr>
+            <td>{mem_id:02d}</td>
+            <td class="name">{name}</td>
+            <td>{bpm}</td>
+            <td>{ts_raw}</td>
+            <td class="highlight">{ts}</td>
+            <td class="context">{context_str}</td>
+        </tr>"""
+
+    # Track Levels (only when analysis results are available)
+    level_md = ""
+    level_html = ""
+    analyzed = [t for t in (tracks or []) if t.get('analysis')]
+    for t in analyzed:
+        a = t['analysis']
+        if 'error' in a:
+            cells = ["-", "-", "-", "-", a['error']]
+        else:
+            cells = [
+                a['peak_db'] if a['peak_db'] is not None else "-inf",
+                a['rms_db'] if a['rms_db'] is not None else "-inf",
+                a['lufs'] if a['lufs'] is not None else "-inf",
+                a['clipped'],
+                f"{a['duration']}s",
+            ]
+        level_md += f"| {t['slot']:02d} | {t['track']} | " + " | ".join(str(c) for c in cells) + " |\n"
+        level_html += f"""
+        <tr>
+            <td>{t['slot']:02d}</td>
+            <td>{t['track']}</td>
+            <td>{cells[0]}</td>
+            <td>{cells[1]}</td>
+            <td class="highlight">{cells[2]}</td>
+            <td>{cells[3]}</td>
+            <td class="context">{cells[4]}</td>
+        </tr>"""
+
+    if level_html:
+        level_html = f"""
+        <h2>Track Levels</h2>
+        <table>
+            <thead>
+                <tr>
+                    <th>#</th><th>Track</th><th>Peak (dBFS)</th><th>RMS (dBFS)</th><th>Loudness (LUFS)</th><th>Clipped</th><th>Length</th>
+                </tr>
+            </thead>
+            <tbody>{level_html}</tbody>
+        </table>"""
+
+    # Silent Tracks
+    silent_tracks = [t for t in (tracks or []) if t.get('silent')]
+    silent_html = ""
+    if silent_tracks:
+        items = "".join(f"<li>#{t['slot']:02d} Track {t['track']} &mdash; {t['file']}</li>" for t in silent_tracks)
+        silent_html = f"""
+        <h2>Silent Tracks</h2>
+        <ul class="context">{items}</ul>"""
+
+    # Tempo check
+    tempo_md = ""
+    tempo_html = ""
+    for slot, m in sorted(metadata.items()):
+        t = m.get('tempo_check')
+        if t and not t['agrees']:
+            tempo_md += f"| {slot:02d} | {m['name'] or 'Empty'} | {t['stored'] or '-'} | {t['estimated']} | {t['confidence']} |\n"
+            tempo_html += f"""
+        <tr>
+            <td>{slot:02d}</td>
+            <td class="name">{m['name'] or 'Empty'}</td>
+            <td>{t['stored'] or '-'}</td>
+            <td class="highlight">{t['estimated']}</td>
+            <td>{t['confidence']}</td>
+        </tr>"""
+
+    if tempo_html:
+        tempo_html = f"""
+        <h2>Tempo Check</h2>
+        <table>
+            <thead>
+                <tr>
+                    <th>#</th><th>Name</th><th>Stored BPM</th><th>Audio BPM</th><th>Confidence</th>
+                </tr>
+            </thead>
+            <tbody>{tempo_html}</tbody>
+        </table>"""
+
+    # Duplicates
+    dupe_tracks = [t for t in (tracks or []) if t.get('duplicate_of')]
+    dupe_html = ""
+    if dupe_tracks:
+        items = "".join(f"<li>#{t['slot']:02d} Track {t['track']} &mdash; duplicate of {', '.join(t['duplicate_of'])}</li>" for t in dupe_tracks)
+        dupe_html = f"""
+        <h2>Duplicate Tracks</h2>
+        <ul class="context">{items}</ul>"""
+
+    # Markdown
+    md = []
+    md.append("# Boss RC-500 Library Report\n\n")
+    md.append("| Memory | Name | BPM | Beat (XML) | Time Sig | Context |\n")
+    md.append("| :--- | :--- | :--- | :---: | :---: | :--- |\n")
+    md.append(md_rows)
+    if level_md:
+        md.append("\n## Track Levels\n\n")
+        md.append("| Memory | Track | Peak (dBFS) | RMS (dBFS) | Loudness (LUFS) | Clipped | Length |\n")
+        md.append("| :--- | :---: | ---: | ---: | ---: | ---: | ---: |\n")
+        md.append(level_md)
+    if tempo_md:
+        md.append("\n## Tempo Check\n\n")
+        md.append("| Memory | Name | Stored BPM | Audio BPM | Confidence |\n")
+        md.append("| :--- | :--- | ---: | ---: | ---: |\n")
+        md.append(tempo_md)
+    if silent_tracks:
+        md.append("\n## Silent Tracks\n\n")
+        for t in silent_tracks:
+            md.append(f"- {t['slot']:02d} Track {t['track']}: {t['file']}\n")
+    if dupe_tracks:
+        md.append("\n## Duplicate Tracks\n\n")
+        for t in dupe_tracks:
+            md.append(f"- {t['slot']:02d} Track {t['track']}: duplicate of {', '.join(t['duplicate_of'])}\n")
+    
+    # HTML
+    html_content = f"""
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <title>Boss RC-500 Library Report</title>
+        <style>
+            body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background: #f4f4f9; color: #333; padding: 20px; }}
+            h1 {{ color: #444; border-bottom: 2px solid #ddd; padding-bottom: 10px; }}
+            h2 {{ color: #444; margin-top: 30px; }}
+            table {{ width: 100%; border-collapse: collapse; background: white; box-shadow: 0 1px 3px rgba(0,0,0,0.2); }}
+            th, td {{ padding: 12px 15px; text-align: left; border-bottom: 1px solid #ddd; }}
+            th {{ background-color: #007bff; color: white; text-transform: uppercase; font-size: 0.85rem; }}
+            tr:hover {{ background-color: #f1f1f1; }}
+            .name {{ font-weight: bold; color: #2c3e50; }}
+            .highlight {{ color: #d63031; font-weight: bold; }}
+            .context {{ font-style: italic; color: #666; }}
+            .footer {{ margin-top: 20px; font-size: 0.8rem; color: #777; }}
+        </style>
+    </head>
+    <body>
+        <h1>RC-500 Loop Library</h1>
+        <table>
+            <thead>
+                <tr>
+                    <th>#</th><th>Name</th><th>BPM</th><th>XML Beat</th><th>Time Sig</th><th>Context / Kit</th>
+                </tr>
+            </thead>
+            <tbody>{html_rows}</tbody>
+        </table>{level_html}{tempo_html}{silent_html}{dupe_html}
+        <div class="footer">Generated on {datetime.now().strftime('%Y-%m-%d %H:%M')}</div>
+    </body>
+    </html>
+    """
+    return "".join(md), html_content
+
+def create_reports(metadata, dest_dir, logger_func, tracks=None):
+    """Generates Markdown and HTML reports."""
+    reports = render_reports(metadata, tracks)
+    if not reports:
+        return None
+
+    md_path = os.path.join(dest_dir, REPORT_MD_NAME)
+    html_path = os.path.join(dest_dir, REPORT_HTML_NAME)
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write(reports[0])
+    with open(html_path, "w", encoding="utf-8") as f:
+        f.write(reports[1])
+        
+    logger_func(f"Reports generated:\n -> {md_path}\n -> {html_path}")
+    return html_path
+
+
+# --- SLOT RANGES ---
+
+def parse_range(range_str):
+    """Parses '1-10, 15' into a sorted list of slot numbers. Invalid parts are ignored."""
+    ids = set()
+    parts = range_str.split(',')
+    for part in parts:
+        part = part.strip()
+        if not part: continue
+        if '-' in part:
+            try:
+                start, end = map(int, part.split('-'))
+                ids.update(range(start, end + 1))
+            except ValueError: continue
+        else:
+            try:
+                ids.add(int(part))
+            except ValueError: continue
+    return sorted(list(ids))
+
+def format_range(slots):
+    """The reverse of parse_range: [1, 2, 3, 7] -> '1-3, 7'."""
+    spans = []
+    for slot in sorted(set(slots)):
+        if spans and slot == spans[-1][1] + 1:
+            spans[-1][1] = slot
+        else:
+            spans.append([slot, slot])
+    return ", ".join(f"{a}-{b}" if a != b else str(a) for a, b in spans)
+
+def find_slot_folders(source, slots):
+    """Track folders (e.g. 010_1) under ROLAND/WAVE whose memory slot is in slots."""
+    slots = set(slots)
+    folders_found = []
+    for root, dirs, files in os.walk(source):
+        folder_name = os.path.basename(root)
+        if "_" in folder_name:
+            try:
+                slot = int(folder_name.split("_")[0])
+                if slot in slots:
+                    folders_found.append(root)
+            except ValueError: pass
+    return sorted(folders_found)
+
+# --- OPERATIONS ---
+
+# backup_pedal archive value for a dedup store snapshot (see BossRC500Store)
+STORE_ARCHIVE = "store"
+
+def _quiet(message):
+    pass
+
+def copy_files(pairs, jobs=1, span="copy file", buffer=None, order=None):
+    """
+    Copies (src, dst) pairs, up to jobs at a time (threads; the work is I/O).
+    buffer sets the copy buffer size (default: shutil's); order="size" starts
+    the largest files first. Yields (src, dst, error or None) in the order given.
+    """
+    def _copy(pair):
+        src, dst = pair
+        try:
+            with rc_trace.tracer.span(span, file=os.path.basename(dst), nbytes=os.path.getsize(src)):
+                if buffer:
+                    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                        shutil.copyfileobj(fsrc, fdst, buffer)
+                    shutil.copystat(src, dst)
+                else:
+                    shutil.copy2(src, dst)
+            return None
+        except Exception as e:
+            return e
+
+    if jobs <= 1 or len(pairs) <= 1:
+        for pair in pairs:
+            yield pair[0], pair[1], _copy(pair)
+        return
+    start = list(range(len(pairs)))
+    if order == "size":
+        sizes = [os.path.getsize(src) if os.path.exists(src) else 0 for src, _ in pairs]
+        start.sort(key=lambda i: sizes[i], reverse=True)
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {i: pool.submit(_copy, pairs[i]) for i in start}
+        for i, pair in enumerate(pairs):
+            yield pair[0], pair[1], futures[i].result()
+
+def _copy_args(jobs, tuning):
+    """copy_files arguments from jobs or an autotuner settings dict (BossRC500Tune)."""
+    if not tuning:
+        return {'jobs': jobs}
+    return {'jobs': tuning['jobs'], 'buffer': tuning.get('buffer'), 'order': tuning.get('order')}
+
+def backup_pedal(source, dest_dir, slots=None, archive=None, skip_silent=False, jobs=1, logger_func=None,
+                 tuning=None, silent_folder=None, threshold=None, export_format=None, sample_rate=None):
+    """
+    Backs up the pedal's tracks (optionally only some slots) into dest_dir, or
+    into one archive at dest_dir + extension when archive is an ARCHIVE_FORMATS
+    key, or as a snapshot named after dest_dir in the dedup store next to it
+    when archive is STORE_ARCHIVE. Writes the manifest and reports. tuning
+    ({'jobs', 'buffer', 'order'}, see BossRC500Tune) overrides jobs for the
+    file copies.
+
+    Tracks are only checked for silence when skip_silent, silent_folder or
+    threshold (dBFS) is given; silent_folder puts kept silent tracks in that
+    subfolder. export_format and sample_rate (BossRC500Audio.EXPORT_FORMATS)
+    transcode a folder backup instead of copying it.
+
+    Returns {'dest', 'tracks' (manifest entries), 'skipped', 'errors', 'bytes'}.
+    """
+    log = logger_func or _quiet
+    trace = rc_trace.tracer
+
+    trace.phase("metadata")
+    metadata = parse_metadata(source, log)
+    if slots is not None:
+        slots = set(slots)
+        metadata = {k: v for k, v in metadata.items() if k in slots}
+
+    trace.phase("scan")
+    found = sorted(scan_wave_tracks(source, metadata, slots), key=lambda t: t['path'])
+    silent = set()
+    if skip_silent or silent_folder or threshold is not None:
+        trace.phase("silence")
+        log(f"Checking {len(found)} tracks for silence...")
+        silent = rc_audio.find_silent([t['path'] for t in found],
+                                      rc_audio.SILENCE_THRESHOLD_DB if threshold is None else threshold, jobs)
+        log(f"Silent tracks: {len(silent)}")
+
+    result = {'dest': dest_dir, 'tracks': [], 'skipped': [], 'errors': [], 'bytes': 0}
+    planned = []
+    for t in found:
+        is_silent = t['path'] in silent
+        if is_silent and skip_silent:
+            log(f"Skipped silent: {t['file']}")
+            result['skipped'].append(t['file'])
+            continue
+        name = f"{silent_folder}/{t['file']}" if is_silent and silent_folder else t['file']
+        planned.append(dict(t, name=name, silent=is_silent))
+
+    def entry(t):
+        return {
+            'file': t['name'], 'slot': t['slot'], 'track': t['track'],
+            'source': os.path.relpath(t['path'], source),
+            'size': os.path.getsize(t['path']),
+            'silent': t['silent'],
+        }
+
+    def done(t, e, verb):
+        log(f"{verb}: {e['file']}" + (" (silent)" if t['silent'] else ""))
+        result['tracks'].append(e)
+        result['bytes'] += e['size']
+
+    if archive == STORE_ARCHIVE:
+        store = rc_store.ChunkStore(os.path.join(os.path.dirname(os.path.abspath(dest_dir)), rc_store.STORE_NAME))
+        snapshot_name = os.path.basename(os.path.normpath(dest_dir))
+        log(f"Writing to dedup store: {store.root}")
+        trace.phase("store")
+        files = {}
+        new_chunks = new_bytes = 0
+        for t in planned:
+            e = entry(t)
+            try:
+                with trace.span("store file", file=e['file'], nbytes=e['size']):
+                    record, chunks, stored = store.add_file(t['path'])
+                files[e['file']] = record
+                new_chunks += chunks
+                new_bytes += stored
+                done(t, e, "Stored")
+            except Exception as err:
+                log(f"Error storing {e['file']}: {err}")
+                result['errors'].append({'file': e['file'], 'error': str(err)})
+        result['dest'] = store.write_snapshot(snapshot_name, build_manifest(metadata, result['tracks'], source), files)
+        log(f"Snapshot '{snapshot_name}': {result['bytes'] / 1048576:.1f} MB of audio, "
+            f"{new_chunks} new chunks, store grew by {new_bytes / 1048576:.1f} MB")
+        trace.phase(None)
+        return result
+
+    if archive:
+        archive_path = dest_dir + rc_archive.ARCHIVE_FORMATS[archive]
+        result['dest'] = archive_path
+        os.makedirs(os.path.dirname(os.path.abspath(archive_path)), exist_ok=True)
+        log(f"Writing archive: {archive_path}")
+        trace.phase("archive")
+        tracks = [entry(t) for t in planned]
+        with rc_archive.ArchiveWriter(archive_path, archive) as writer:
+            # Index goes first so a tar.xz restore can read it without a full pass
+            writer.add_index(build_manifest(metadata, tracks, source))
+            for t, e in zip(planned, tracks):
+                try:
+                    with trace.span("archive file", file=e['file'], nbytes=e['size']):
+                        writer.add_file(t['path'], e['file'])
+                    done(t, e, "Archived")
+                except Exception as err:
+                    log(f"Error archiving {e['file']}: {err}")
+                    result['errors'].append({'file': e['file'], 'error': str(err)})
+            trace.phase("reports")
+            reports = render_reports(metadata, tracks)
+            if reports:
+                writer.add_bytes(REPORT_MD_NAME, reports[0])
+                writer.add_bytes(REPORT_HTML_NAME, reports[1])
+        trace.phase(None)
+        return result
+
+    os.makedirs(dest_dir, exist_ok=True)
+    if silent_folder and any(t['silent'] for t in planned):
+        os.makedirs(os.path.join(dest_dir, silent_folder), exist_ok=True)
+    pairs = [(t['path'], os.path.join(dest_dir, *t['name'].split("/"))) for t in planned]
+    if export_format:
+        trace.phase("transcode")
+        log(f"Transcoding to {export_format}" + (f" @ {sample_rate} Hz" if sample_rate else "") + "...")
+        errors = (r if isinstance(r, Exception) else None
+                  for _, r in rc_audio.transcode_files(pairs, export_format, sample_rate))
+    else:
+        trace.phase("copy")
+        errors = (error for _, _, error in copy_files(pairs, **_copy_args(jobs, tuning)))
+    for t, (_, target), error in zip(planned, pairs, errors):
+        if error:
+            log(f"Error exporting {t['name']}: {error}")
+            result['errors'].append({'file': t['name'], 'error': str(error)})
+            continue
+        # The written file's size: a transcoded copy differs from the pedal's WAV
+        done(t, dict(entry(t), size=os.path.getsize(target)), "Exported")
+
+    trace.phase("reports")
+    write_manifest(dest_dir, metadata, result['tracks'], source, export_format, sample_rate)
+    create_reports(metadata, dest_dir, log, result['tracks'])
+    trace.phase(None)
+    return result
+
+def restore_targets(index_tracks, pedal_wave_dir, slots=None, skip_silent=False, logger_func=None):
+    """Maps manifest/index track entries to their ROLAND/WAVE paths. Returns {file: target}."""
+    log = logger_func or _quiet
+    wanted = {}
+    for t in index_tracks:
+        if slots is not None and t['slot'] not in slots:
+            continue
+        if skip_silent and t.get('silent'):
+            log(f"Skipped silent: {t['file']}")
+            continue
+        wanted[t['file']] = pedal_track_path(pedal_wave_dir, t['slot'], t['track'])
+    return wanted
+
+def restore_backup(backup_path, pedal_wave_dir, slots=None, skip_silent=False, jobs=1, logger_func=None,
+                   tuning=None, threshold=None):
+    """
+    Restores tracks (audio only) from a backup folder, archive or dedup store
+    snapshot onto the pedal. Returns {'restored': [files], 'skipped', 'errors'}.
+    tuning overrides jobs for folder copies, and threshold (dBFS) the silence
+    level for skip_silent on a folder (see backup_pedal).
+    """
+    log = logger_func or _quiet
+    trace = rc_trace.tracer
+    slots = set(slots) if slots is not None else None
+    result = {'restored': [], 'skipped': [], 'errors': []}
+
+    def make_dirs(wanted):
+        for target in wanted.values():
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+
+    if os.path.isfile(backup_path) and rc_archive.archive_format(backup_path):
+        index = rc_archive.read_index(backup_path)
+        if index is None:
+            raise ValueError(f"No index found in {backup_path}")
+        wanted = restore_targets(index.get('tracks', []), pedal_wave_dir, slots, skip_silent, log)
+        make_dirs(wanted)
+        trace.phase("extract")
+        for name, dest in rc_archive.extract_members(backup_path, wanted, log):
+            log(f"Restored: {os.path.basename(dest)} <- {name}")
+            result['restored'].append(name)
+        result['errors'] = [{'file': f, 'error': "not in archive"} for f in wanted if f not in result['restored']]
+        trace.phase(None)
+        return result
+
+    if os.path.isfile(backup_path) and rc_store.is_snapshot(backup_path):
+        snapshot = rc_store.load_snapshot(backup_path)
+        store = rc_store.store_for_snapshot(backup_path)
+        wanted = restore_targets(snapshot.get('tracks', []), pedal_wave_dir, slots, skip_silent, log)
+        make_dirs(wanted)
+        trace.phase("reassemble")
+        for name, dest in wanted.items():
+            try:
+                with trace.span("restore file", file=name, nbytes=snapshot['files'][name]['size']):
+                    store.restore_file(snapshot['files'][name], dest)
+                log(f"Restored: {os.path.basename(dest)} <- {name}")
+                result['restored'].append(name)
+            except Exception as e:
+                log(f"Error restoring {name}: {e}")
+                result['errors'].append({'file': name, 'error': str(e)})
+        trace.phase(None)
+        return result
+
+    def path(name):
+        return os.path.join(backup_path, *name.split("/"))
+
+    trace.phase("scan")
+    # Tracks the backup moved into the silent folder are restored too, unless skip_silent
+    listing = [(f, f) for f in sorted(os.listdir(backup_path))]
+    if os.path.isdir(path(SILENT_FOLDER)):
+        listing += [(f"{SILENT_FOLDER}/{f}", f) for f in sorted(os.listdir(path(SILENT_FOLDER)))]
+    tracks = []
+    for name, f in listing:
+        if not f.lower().endswith('.wav'):
+            continue
+        parsed = parse_export_filename(f)
+        if not parsed:
+            log(f"Skipped unknown file format: {name}")
+            result['skipped'].append(name)
+            continue
+        tracks.append({'file': name, 'slot': parsed[0], 'track': parsed[1], 'silent': name != f})
+    if slots is not None:
+        tracks = [t for t in tracks if t['slot'] in slots]
+    if skip_silent:
+        trace.phase("silence")
+        silent = rc_audio.find_silent([path(t['file']) for t in tracks if not t['silent']],
+                                      rc_audio.SILENCE_THRESHOLD_DB if threshold is None else threshold, jobs)
+        for t in tracks:
+            t['silent'] = t['silent'] or path(t['file']) in silent
+            if t['silent']:
+                result['skipped'].append(t['file'])
+
+    wanted = restore_targets(tracks, pedal_wave_dir, slots, skip_silent, log)
+    make_dirs(wanted)
+    trace.phase("restore")
+    pairs = [(path(name), target) for name, target in wanted.items()]
+    for (name, target), (_, _, error) in zip(wanted.items(), copy_files(pairs, span="restore file", **_copy_args(jobs, tuning))):
+        if error:
+            log(f"Error restoring {name}: {error}")
+            result['errors'].append({'file': name, 'error': str(error)})
+        else:
+            log(f"Restored: {os.path.basename(target)} <- {name}")
+            result['restored'].append(name)
+    trace.phase(None)
+    return result
+
+def delete_folders(folders, logger_func=None):
+    """Permanently deletes track folders from the pedal. Returns (deleted, errors)."""
+    log = logger_func or _quiet
+    deleted, errors = [], []
+    for folder in folders:
+        try:
+            with rc_trace.tracer.span("delete folder", folder=os.path.basename(folder)):
+                shutil.rmtree(folder)
+            log(f"Deleted: {os.path.basename(folder)}")
+            deleted.append(os.path.basename(folder))
+        except Exception as e:
+            log(f"Error deleting {folder}: {e}")
+            errors.append({'folder': os.path.basename(folder), 'error': str(e)})
+    return deleted, errors
@@ -0,0 +1,676 @@
+"""
+Boss RC-500 Daemon
+------------------
+A long-running local service that keeps the pedal index (memory metadata
+and track list) and the backup catalog in memory, so the GUI and scripts
+don't re-detect the pedal, re-parse MEMORY1.RC0 and re-walk ROLAND/WAVE on
+every launch.
+
+The index is refreshed in the background every few seconds, and only what
+changed is re-read: MEMORY1.RC0 is parsed again only when its size or
+modification time changes, and a track folder is re-listed only when its
+WAV files change. Backups, restores and deletes run as jobs, one at a time
+(the pedal is a single USB device), and their progress can be polled.
+
+API (JSON, localhost only):
+    GET  /status                      pedal, index age, counts, running job
+    GET  /memories?slots=1-10         memory metadata
+    GET  /tracks?slots=1-10           tracks on the pedal
+    GET  /backups                     backup folders, archives and snapshots
+    GET  /jobs, /jobs/<id>?since=N    job status (log lines from N on)
+    POST /refresh                     re-read the pedal now
+    POST /backup   {"dest", "slots", "archive", "skip_silent", "jobs"}
+    POST /restore  {"source", "slots", "skip_silent", "jobs"}
+    POST /delete   {"slots", "confirm": true}
+    POST /sync     {"library", "mode", "slots", "deletes", "dry_run", "confirm", "jobs"}
+                                      mode: to-library (default), to-pedal or both;
+                                      deleting from the pedal needs "confirm": true
+    POST /tune     {"folders"}                test drive speeds now (BossRC500Tune)
+
+Backups, restores and syncs without "jobs" use the settings measured by a
+tune job; the daemon never tests a drive on its own, it only says so when a
+pedal without a speed profile is connected.
+
+Security: every request must carry the session token in an X-RC500-Token
+header. The daemon makes a new token at each start and writes it to
+RC500_Daemon_<port>.token in the home folder, readable only by the user;
+DaemonClient picks it up from there (or from the RC500_DAEMON_TOKEN
+environment variable). Requests whose Host header isn't 127.0.0.1 or
+localhost on the daemon's port are refused, so a web page that re-points
+its own domain at 127.0.0.1 (DNS rebinding) can't reach it either. POST
+bodies must be application/json. Listening on anything but loopback is
+refused unless a token is given with --token.
+
+Usage:
+    python BossRC500Daemon.py [--pedal PATH] [--backups FOLDER] [--port 8500]
+
+Copyright (C) 2026 [pmonk.com]
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import os
+import hmac
+import json
+import time
+import queue
+import secrets
+import argparse
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import BossRC500Core as rc_core
+import BossRC500Archive as rc_archive
+import BossRC500Store as rc_store
+import BossRC500Sync as rc_sync
+import BossRC500Tune as rc_tune
+
+DAEMON_ENV = "RC500_DAEMON"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8500
+DEFAULT_POLL = 2.0
+TOKEN_ENV = "RC500_DAEMON_TOKEN"
+TOKEN_HEADER = "X-RC500-Token"
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+# Finished jobs kept for status queries
+JOB_HISTORY = 50
+
+
+def file_signature(path):
+    """(size, mtime_ns) of a file, or None if it is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+def slots_from(value):
+    """Slot set from "1-10,15", a list of ints, or None (all)."""
+    if value in (None, "", []):
+        return None
+    if isinstance(value, str):
+        slots = rc_core.parse_range(value)
+        if not slots:
+            raise ValueError(f"Invalid slot range: {value}")
+        return set(slots)
+    return {int(s) for s in value}
+
+# --- PEDAL INDEX ---
+
+class PedalIndex:
+    """Metadata and track list of the pedal, refreshed incrementally."""
+
+    def __init__(self, pedal=None):
+        self.pedal = pedal
+        self.lock = threading.RLock()
+        self.source = None
+        self.metadata = {}
+        self.meta_sig = None
+        self.folders = {}  # folder name -> (WAV signature, track entries)
+        self.tracks = []
+        self.version = 0
+        self.refreshed_at = None
+        self.refresh_ms = 0.0
+        self.stats = {'refreshes': 0, 'metadata_parses': 0, 'folder_scans': 0}
+
+    def locate(self):
+        if self.source and os.path.isdir(self.source):
+            return self.source
+        if self.pedal and os.path.basename(os.path.normpath(self.pedal)).upper() == "WAVE":
+            source = self.pedal if os.path.isdir(self.pedal) else None
+        else:
+            source = rc_core.find_pedal([self.pedal] if self.pedal else None)
+        return os.path.abspath(source) if source else None
+
+    def refresh(self, force=False):
+        """Re-reads what changed on the pedal. Returns True if the index changed."""
+        with self.lock:
+            start = time.perf_counter()
+            source = self.locate()
+            changed = source != self.source
+            if changed:
+                self.source = source
+                self.metadata, self.meta_sig, self.folders = {}, None, {}
+
+            if source:
+                changed |= self.refresh_metadata(source, force)
+                changed |= self.refresh_folders(source, force)
+
+            if changed:
+                self.tracks = sorted((t for _, entries in self.folders.values() for t in entries),
+                                     key=lambda t: t['path'])
+                for t in self.tracks:
+                    t['file'] = rc_core.build_export_name(f"{t['slot']:03d}", t['track'], self.metadata)
+                self.version += 1
+            self.stats['refreshes'] += 1
+            self.refreshed_at = time.time()
+            self.refresh_ms = (time.perf_counter() - start) * 1000
+            return changed
+
+    def refresh_metadata(self, source, force):
+        sig = file_signature(os.path.abspath(os.path.join(source, "..", "DATA", "MEMORY1.RC0")))
+        if not force and sig == self.meta_sig:
+            return False
+        self.metadata = rc_core.parse_metadata(source, None) if sig else {}
+        self.meta_sig = sig
+        self.stats['metadata_parses'] += 1
+        return True
+
+    def refresh_folders(self, source, force):
+        changed = False
+        seen = set()
+        with os.scandir(source) as it:
+            folders = [e for e in it if e.is_dir()]
+        for entry in folders:
+            parts = entry.name.split("_")
+            if len(parts) < 2 or not parts[0].isdigit():
+                continue
+            seen.add(entry.name)
+            with os.scandir(entry.path) as it:
+                wavs = sorted((f.name, st.st_size, st.st_mtime_ns)
+                              for f in it if f.name.lower().endswith(".wav") for st in (f.stat(),))
+            cached = self.folders.get(entry.name)
+            if not force and cached and cached[0] == wavs:
+                continue
+            self.folders[entry.name] = (wavs, [
+                {'path': os.path.join(entry.path, name), 'slot': int(parts[0]), 'track': parts[1], 'size': size}
+                for name, size, _ in wavs])
+            self.stats['folder_scans'] += 1
+            changed = True
+        for gone in set(self.folders) - seen:
+            del self.folders[gone]
+            changed = True
+        return changed
+
+    def memories(self, slots=None):
+        with self.lock:
+            return {k: v for k, v in sorted(self.metadata.items()) if slots is None or k in slots}
+
+    def track_list(self, slots=None):
+        with self.lock:
+            return [dict(t) for t in self.tracks if slots is None or t['slot'] in slots]
+
+# --- BACKUP CATALOG ---
+
+class BackupCatalog:
+    """Backup folders, archives and dedup store snapshots found in the backup folders."""
+
+    def __init__(self, roots):
+        self.roots = [os.path.abspath(r) for r in roots]
+        self.lock = threading.Lock()
+        self.entries = {}  # path -> (signature, summary)
+
+    def candidates(self):
+        for root in self.roots:
+            if not os.path.isdir(root):
+                continue
+            for entry in os.scandir(root):
+                if entry.is_dir() and entry.name == rc_store.STORE_NAME:
+                    snap_dir = os.path.join(entry.path, "snapshots")
+                    if os.path.isdir(snap_dir):
+                        for f in os.scandir(snap_dir):
+                            if f.name.endswith(rc_store.SNAPSHOT_EXT):
+                                yield "snapshot", f.path, file_signature(f.path)
+                elif entry.is_dir():
+                    manifest = os.path.join(entry.path, rc_core.MANIFEST_NAME)
+                    sig = file_signature(manifest)
+                    if sig:
+                        yield "folder", entry.path, sig
+                elif rc_archive.archive_format(entry.path):
+                    yield "archive", entry.path, file_signature(entry.path)
+
+    def summarize(self, kind, path):
+        if kind == "folder":
+            with open(os.path.join(path, rc_core.MANIFEST_NAME), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        elif kind == "archive":
+            data = rc_archive.read_index(path) or {}
+        else:
+            data = rc_store.load_snapshot(path)
+        tracks = data.get('tracks', [])
+        return {
+            'path': path, 'kind': kind, 'generated': data.get('generated', ""),
+            'tracks': len(tracks), 'slots': sorted({t['slot'] for t in tracks}),
+            'bytes': sum(t.get('size', 0) for t in tracks),
+        }
+
+    def refresh(self):
+        with self.lock:
+            found = {}
+            for kind, path, sig in self.candidates():
+                cached = self.entries.get(path)
+                if cached and cached[0] == sig:
+                    found[path] = cached
+                    continue
+                try:
+                    found[path] = (sig, self.summarize(kind, path))
+                except Exception as e:
+                    found[path] = (sig, {'path': path, 'kind': kind, 'error': str(e)})
+            self.entries = found
+
+    def backups(self):
+        with self.lock:
+            return sorted((s for _, s in self.entries.values()), key=lambda s: s.get('generated', ""), reverse=True)
+
+# --- JOBS ---
+
+class JobQueue:
+    """Runs pedal jobs one at a time on a worker thread."""
+
+    def __init__(self, index, catalog):
+        self.index = index
+        self.catalog = catalog
+        self.lock = threading.Lock()
+        self.jobs = {}
+        self.next_id = 1
+        self.pending = queue.Queue()
+        threading.Thread(target=self.worker, daemon=True).start()
+
+    def submit(self, kind, params):
+        with self.lock:
+            job = {'id': self.next_id, 'kind': kind, 'params': params, 'state': "queued",
+                   'created': time.time(), 'started': None, 'finished': None,
+                   'log': [], 'result': None, 'error': None}
+            self.jobs[job['id']] = job
+            self.next_id += 1
+            for old in sorted(self.jobs)[:-JOB_HISTORY]:
+                if self.jobs[old]['state'] in ("done", "failed"):
+                    del self.jobs[old]
+        self.pending.put(job)
+        return self.view(job)
+
+    def view(self, job, since=0):
+        with self.lock:
+            return dict(job, log=job['log'][since:], log_start=since)
+
+    def get(self, job_id, since=0):
+        with self.lock:
+            job = self.jobs.get(job_id)
+        return self.view(job, since) if job else None
+
+    def all(self):
+        with self.lock:
+            jobs = list(self.jobs.values())
+        return [dict(j, log=[], log_lines=len(j['log'])) for j in jobs]
+
+    def running(self):
+        with self.lock:
+            return [j['id'] for j in self.jobs.values() if j['state'] in ("queued", "running")]
+
+    def worker(self):
+        while True:
+            job = self.pending.get()
+            job['state'], job['started'] = "running", time.time()
+            try:
+                job['result'] = self.run(job)
+                job['state'] = "done"
+            except Exception as e:
+                job['error'] = str(e)
+                job['log'].append(f"Error: {e}")
+                job['state'] = "failed"
+            job['finished'] = time.time()
+            # The job changed the pedal or the backups: bring the index up to date now
+            try:
+                self.index.refresh()
+                self.catalog.refresh()
+            except Exception:
+                pass
+
+    def run(self, job):
+        params = job['params']
+        log = job['log'].append
+        source = self.index.locate()
+        if not source:
+            raise RuntimeError("Boss RC-500 not found")
+        slots = slots_from(params.get('slots'))
+        # Without "jobs" the copy settings come from the drive profiles saved by a
+        # tune job; drives that haven't been tested get the defaults (no probe here)
+        jobs = max(1, int(params.get('jobs') or rc_tune.DEFAULTS['jobs']))
+        tuned = not params.get('jobs')
+
+        def tuning(src, dst):
+            return rc_tune.transfer_settings(src, dst, probe_missing=False, logger_func=log)
+
+        if job['kind'] == "backup":
+            dest = params.get('dest') or os.path.join(
+                self.catalog.roots[0], f"Boss RC-500 Backup {datetime.now().strftime('%Y-%m-%d %H%M%S')}")
+            return rc_core.backup_pedal(source, dest, slots, params.get('archive'),
+                                        bool(params.get('skip_silent')), jobs, log,
+                                        tuning(source, dest) if tuned else None)
+        if job['kind'] == "restore":
+            return rc_core.restore_backup(params['source'], source, slots,
+                                          bool(params.get('skip_silent')), jobs, log,
+                                          tuning(params['source'], source) if tuned else None)
+        if job['kind'] == "sync":
+            def confirm(plan):
+                return params.get('confirm') is True or not plan['counts'].get(rc_sync.DELETE_PEDAL)
+            mode = rc_sync.MODE_NAMES[params.get('mode') or "to-library"]
+            result = rc_sync.run_sync(source, params['library'], mode, slots, bool(params.get('deletes')),
+                                      not params.get('dry_run'), jobs, log, tuning if tuned else None, confirm)
+            if result['pending'] and not params.get('dry_run') and not result['applied']:
+                raise RuntimeError("The sync would delete tracks from the pedal; send \"confirm\": true")
+            return result
+        if job['kind'] == "tune":
+            paths = [source] + list(params.get('folders') or [])
+            return {'profiles': [rc_tune.profile_for(p, force=params.get('force', True), logger_func=log)
+                                 for p in paths]}
+        folders = rc_core.find_slot_folders(source, slots)
+        deleted, errors = rc_core.delete_folders(folders, log)
+        return {'deleted': deleted, 'errors': errors}
+
+# --- HTTP API ---
+
+class Daemon:
+    def __init__(self, pedal=None, backup_roots=(), poll=DEFAULT_POLL, logger_func=None):
+        self.index = PedalIndex(pedal)
+        self.catalog = BackupCatalog(backup_roots or [os.path.join(os.getcwd(), "Backups")])
+        self.jobs = JobQueue(self.index, self.catalog)
+        self.poll = poll
+        self.started = time.time()
+        self.stop = threading.Event()
+        self.tuned = None
+        self.log = logger_func or (lambda m: None)
+
+    def check_tuning(self):
+        """Points out a newly connected pedal that has no speed profile yet."""
+        source = self.index.source
+        if source and source != self.tuned:
+            self.tuned = source
+            if rc_tune.profile_for(source, probe_missing=False) is None:
+                self.log(f"No speed profile for the pedal at {source}; default copy settings are used. "
+                         "Run a tune (POST /tune or BossRC500CLI.py tune) to measure it.")
+
+    def start_polling(self):
+        def loop():
+            while True:
+                try:
+                    self.check_tuning()
+                except Exception:
+                    pass
+                if self.stop.wait(self.poll):
+                    break
+                try:
+                    self.index.refresh()
+                    self.catalog.refresh()
+                except Exception:
+                    pass
+        threading.Thread(target=loop, daemon=True).start()
+
+    def status(self):
+        index = self.index
+        return {
+            'pedal': index.source, 'version': index.version,
+            'refreshed_at': index.refreshed_at, 'refresh_ms': round(index.refresh_ms, 2),
+            'memories': len(index.metadata), 'tracks': len(index.tracks),
+            'stats': dict(index.stats), 'backups': len(self.catalog.entries),
+            'backup_folders': self.catalog.roots, 'jobs': self.jobs.running(),
+            'uptime': round(time.time() - self.started, 1),
+        }
+
+    def handle(self, method, path, query, body):
+        """Returns (HTTP status, JSON-able payload)."""
+        parts = [p for p in path.split("/") if p]
+        if method == "GET":
+            if parts == ["status"]:
+                return 200, self.status()
+            if parts in (["memories"], ["tracks"]):
+                if query.get('refresh'):
+                    self.index.refresh()
+                slots = slots_from(query.get('slots'))
+                if parts == ["memories"]:
+                    return 200, {'pedal': self.index.source, 'memories': self.index.memories(slots)}
+                return 200, {'pedal': self.index.source, 'tracks': self.index.track_list(slots)}
+            if parts == ["backups"]:
+                return 200, {'backups': self.catalog.backups()}
+            if parts == ["jobs"]:
+                return 200, {'jobs': self.jobs.all()}
+            if len(parts) == 2 and parts[0] == "jobs" and parts[1].isdigit():
+                job = self.jobs.get(int(parts[1]), int(query.get('since', 0)))
+                return (200, job) if job else (404, {'error': "No such job"})
+            return 404, {'error': f"Unknown path: {path}"}
+
+        if method == "POST":
+            if parts == ["refresh"]:
+                self.index.refresh(force=True)
+                self.catalog.refresh()
+                return 200, self.status()
+            if parts == ["backup"]:
+                return 202, self.jobs.submit("backup", body)
+            if parts == ["restore"]:
+                if not body.get('source') or not os.path.exists(body['source']):
+                    return 400, {'error': f"Backup not found: {body.get('source')}"}
+                return 202, self.jobs.submit("restore", body)
+            if parts == ["delete"]:
+                if slots_from(body.get('slots')) is None:
+                    return 400, {'error': "delete needs slots"}
+                if body.get('confirm') is not True:
+                    return 400, {'error': "delete needs \"confirm\": true"}
+                return 202, self.jobs.submit("delete", body)
+            if parts == ["sync"]:
+                if not body.get('library'):
+                    return 400, {'error': "sync needs a library folder"}
+                if (body.get('mode') or "to-library") not in rc_sync.MODE_NAMES:
+                    return 400, {'error': f"Unknown sync mode: {body.get('mode')}"}
+                return 202, self.jobs.submit("sync", body)
+            if parts == ["tune"]:
+                return 202, self.jobs.submit("tune", body)
+            return 404, {'error': f"Unknown path: {path}"}
+
+        return 405, {'error': f"Method not allowed: {method}"}
+
+class RequestHandler(BaseHTTPRequestHandler):
+    # set by serve()
+    daemon = None
+    verbose = False
+    token = ""
+    allowed_hosts = ()
+
+    def respond(self, status, payload):
+        data = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def dispatch(self, method):
+        if self.headers.get("Host", "").lower() not in self.allowed_hosts:
+            return self.respond(403, {'error': "Host not allowed"})
+        if not hmac.compare_digest(self.headers.get(TOKEN_HEADER, ""), self.token):
+            return self.respond(403, {'error': f"Missing or wrong {TOKEN_HEADER}"})
+        url = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        body = {}
+        if method == "POST":
+            if self.headers.get("Content-Type", "").split(";")[0].strip() != "application/json":
+                return self.respond(415, {'error': "POST bodies must be application/json"})
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                return self.respond(400, {'error': "Invalid JSON"})
+        try:
+            status, payload = self.daemon.handle(method, url.path, query, body)
+        except ValueError as e:
+            status, payload = 400, {'error': str(e)}
+        except Exception as e:
+            status, payload = 500, {'error': str(e)}
+        self.respond(status, payload)
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def log_message(self, fmt, *args):
+        if self.verbose:
+            super().log_message(fmt, *args)
+
+def token_path(port=DEFAULT_PORT):
+    return os.path.join(os.path.expanduser("~"), f"RC500_Daemon_{port}.token")
+
+def write_token(token, port=DEFAULT_PORT):
+    """Saves the session token where only the current user can read it."""
+    path = token_path(port)
+    if os.path.exists(path):
+        os.remove(path)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+    return path
+
+def read_token(port=DEFAULT_PORT):
+    if os.environ.get(TOKEN_ENV):
+        return os.environ[TOKEN_ENV]
+    try:
+        with open(token_path(port), "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+def is_loopback(host):
+    return host in LOOPBACK_HOSTS or host.startswith("127.")
+
+def serve(daemon, host=DEFAULT_HOST, port=DEFAULT_PORT, verbose=False, token=None):
+    """
+    The HTTP server (not started). Without a token, only loopback addresses
+    are accepted. Returns (server, token).
+    """
+    if not is_loopback(host) and not token:
+        raise ValueError(f"Refusing to listen on {host} without --token")
+    token = token or secrets.token_urlsafe(32)
+    port = port or DEFAULT_PORT
+    hosts = {f"{h}:{port}" for h in ("127.0.0.1", "localhost", "[::1]")}
+    if not is_loopback(host):
+        hosts.add(f"{host.lower()}:{port}")
+    handler = type("Handler", (RequestHandler,), {'daemon': daemon, 'verbose': verbose,
+                                                  'token': token, 'allowed_hosts': frozenset(hosts)})
+    return ThreadingHTTPServer((host, port), handler), token
+
+# --- CLIENT ---
+
+class DaemonError(Exception):
+    pass
+
+class DaemonClient:
+    """Talks to a running daemon. URL defaults to RC500_DAEMON, then localhost:8500."""
+
+    def __init__(self, url=None, timeout=10.0, token=None):
+        self.url = (url or os.environ.get(DAEMON_ENV) or f"http://{DEFAULT_HOST}:{DEFAULT_PORT}").rstrip("/")
+        self.timeout = timeout
+        self.token = token or read_token(urllib.parse.urlsplit(self.url).port or DEFAULT_PORT)
+
+    def request(self, method, path, body=None, timeout=None):
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        req = urllib.request.Request(self.url + path, data=data, method=method)
+        req.add_header(TOKEN_HEADER, self.token)
+        if data is not None:
+            req.add_header("Content-Type", "application/json")
+        try:
+            with urllib.request.urlopen(req, timeout=timeout or self.timeout) as resp:
+                return json.loads(resp.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read().decode("utf-8")).get('error', str(e))
+            except ValueError:
+                message = str(e)
+            raise DaemonError(message) from None
+
+    def status(self, timeout=None):
+        return self.request("GET", "/status", timeout=timeout)
+
+    def memories(self, slots=None):
+        query = f"?slots={urllib.parse.quote(slots)}" if slots else ""
+        data = self.request("GET", "/memories" + query)
+        return {int(k): v for k, v in data['memories'].items()}
+
+    def tracks(self, slots=None):
+        query = f"?slots={urllib.parse.quote(slots)}" if slots else ""
+        return self.request("GET", "/tracks" + query)['tracks']
+
+    def check_pedal(self, source):
+        pedal = self.status()['pedal']
+        if not pedal or os.path.abspath(pedal) != os.path.abspath(source):
+            raise DaemonError("The daemon is not serving this pedal")
+
+    def pedal_metadata(self, source):
+        """Like parse_metadata(source), if the daemon serves that pedal."""
+        self.check_pedal(source)
+        return self.memories()
+
+    def pedal_listing(self, source, slots=None):
+        """(metadata, tracks) like parse_metadata + scan_wave_tracks, if the daemon serves source."""
+        self.check_pedal(source)
+        if slots is not None and not slots:
+            return self.memories(), []
+        slot_str = ",".join(str(s) for s in sorted(slots)) if slots else None
+        return self.memories(), self.tracks(slot_str)
+
+    def submit(self, kind, **params):
+        return self.request("POST", f"/{kind}", params)
+
+    def wait(self, job_id, logger_func=None, interval=0.2):
+        """Polls a job until it finishes, passing new log lines to logger_func."""
+        since = 0
+        while True:
+            job = self.request("GET", f"/jobs/{job_id}?since={since}")
+            for line in job['log']:
+                if logger_func: logger_func(line)
+            since += len(job['log'])
+            if job['state'] in ("done", "failed"):
+                return job
+            time.sleep(interval)
+
+def connect(url=None, timeout=0.3):
+    """A DaemonClient if a daemon answers at url, else None."""
+    client = DaemonClient(url)
+    try:
+        client.status(timeout=timeout)
+    except (OSError, DaemonError, ValueError):
+        return None
+    return client
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keep the Boss RC-500 index warm and serve it over HTTP/JSON.")
+    parser.add_argument("--pedal", help="pedal drive, mount point or ROLAND/WAVE folder (default: detect)")
+    parser.add_argument("--backups", nargs="+", default=[], help="backup folders to catalog (default: ./Backups)")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to listen on (keep it local)")
+    parser.add_argument("--token", help="fixed access token (required for non-loopback --host)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--poll", type=float, default=DEFAULT_POLL, help="seconds between change checks")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    if not is_loopback(args.host) and not args.token:
+        parser.error(f"refusing to listen on {args.host} without --token")
+
+    daemon = Daemon(args.pedal, args.backups, args.poll, print)
+    daemon.index.refresh()
+    daemon.catalog.refresh()
+    status = daemon.status()
+    print(f"Pedal: {status['pedal'] or 'not found (will keep looking)'}; "
+          f"{status['tracks']} tracks, {status['backups']} backups indexed in {status['refresh_ms']:.0f} ms")
+
+    server, token = serve(daemon, args.host, args.port, args.verbose, args.token)
+    token_file = write_token(token, args.port)
+    daemon.start_polling()
+    print(f"Listening on http://{args.host}:{args.port}/ (Ctrl+C to stop); token in {token_file}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.stop.set()
+        server.server_close()
+        try:
+            os.remove(token_file)
+        except OSError:
+            pass
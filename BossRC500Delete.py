@@ -26,74 +26,51 @@ The authors are not responsible for lost data.
 ALWAYS BACKUP YOUR LOOPS BEFORE USING THE DELETE FUNCTION.
 """
 import os
-import shutil
-import string
-
-def find_boss_drive():
-    available_drives = [f"{d}:/" for d in string.ascii_uppercase if os.path.exists(f"{d}:/")]
-    for drive in available_drives:
-        if os.path.exists(os.path.join(drive, "ROLAND", "WAVE")):
-            return os.path.join(drive, "ROLAND", "WAVE")
-    return None
-
-def parse_range(range_str):
-    ids = set()
-    parts = range_str.split(',')
-    for part in parts:
-        part = part.strip()
-        if '-' in part:
-            try:
-                start, end = map(int, part.split('-'))
-                ids.update(range(start, end + 1))
-            except ValueError:
-                continue
-        else:
-            try:
-                ids.add(int(part))
-            except ValueError:
-                continue
-    return sorted(list(ids))
+import sys
+
+import BossRC500Core as rc_core
+import BossRC500Trace as rc_trace
+
+def pause(prompt):
+    """Keeps the console window open when run by double-click."""
+    if sys.stdin and sys.stdin.isatty():
+        input(prompt)
 
 # --- MAIN ---
+# Set RC500_TRACE=1 to time the scan and each delete.
+# For unattended deletes use: python BossRC500CLI.py delete --slots 10-20 --yes
+trace = rc_trace.tracer
 print("--- Boss RC-500 Mass Deleter ---")
-source_dir = find_boss_drive()
+with trace.span("detect", cat="phase"):
+    source_dir = rc_core.find_pedal()
 
 if not source_dir:
     print("Error: Boss RC-500 not found.")
-    input("Press Enter to exit...")
-    exit()
+    pause("Press Enter to exit...")
+    sys.exit(1)
 
 print(f"Target: {source_dir}")
 
 # Input Range
 range_input = input("Enter memory slots to DELETE (e.g., '10-20' or '5, 8, 12'): ")
-target_slots = parse_range(range_input)
+target_slots = rc_core.parse_range(range_input)
 
 if not target_slots:
     print("No valid slots selected.")
-    exit()
+    sys.exit(1)
 
 # Scan for targets
-folders_to_delete = []
 print("\n--- Scanning for targets ---")
 
-for root, dirs, files in os.walk(source_dir):
-    folder_name = os.path.basename(root)
-    # Folder format is "001_1", "001_2", etc.
-    if "_" in folder_name:
-        try:
-            slot_str = folder_name.split("_")[0]
-            slot_num = int(slot_str)
-            
-            if slot_num in target_slots:
-                folders_to_delete.append(root)
-                print(f"[FOUND] Memory {slot_num}: {folder_name}")
-        except ValueError:
-            pass
+trace.phase("scan")
+folders_to_delete = rc_core.find_slot_folders(source_dir, target_slots)
+for folder in folders_to_delete:
+    print(f"[FOUND] Memory {int(os.path.basename(folder).split('_')[0])}: {os.path.basename(folder)}")
+trace.phase(None)
 
 if not folders_to_delete:
     print("\nNo matching folders found on the pedal.")
-    exit()
+    sys.exit(0)
 
 # --- CONFIRMATION ---
 print(f"\nWARNING: You are about to DELETE {len(folders_to_delete)} folders/tracks.")
@@ -104,14 +81,11 @@ confirm = input("Type 'DELETE' to confirm (or anything else to cancel): ")
 
 if confirm == "DELETE":
     print("\nDeleting...")
-    for folder in folders_to_delete:
-        try:
-            shutil.rmtree(folder) # PERMANENT DELETE
-            print(f"Deleted: {folder}")
-        except Exception as e:
-            print(f"Error deleting {folder}: {e}")
+    trace.phase("delete")
+    rc_core.delete_folders(folders_to_delete, print) # PERMANENT DELETE
     print("Deletion Complete.")
+    trace.finish("delete", os.getcwd(), print)
 else:
     print("Cancelled.")
     
-input("Press Enter to close...")
+pause("Press Enter to close...")
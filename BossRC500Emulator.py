@@ -0,0 +1,356 @@
+"""
+Boss RC-500 Pedal Emulator
+--------------------------
+Makes a local ROLAND tree behave like the pedal's slow USB storage, so the
+tools can be timed and tested without hardware.
+
+The emulator wraps Python's file functions (open, os.stat, os.scandir,
+os.remove, ...) for paths under the pedal folder and adds:
+
+- a fixed latency per operation (each open, stat, directory listing and
+  64 KB read/write counts as one operation),
+- a bandwidth cap shared by all threads,
+- random stalls,
+- a disconnect after N bytes or at random; every later access fails with an
+  I/O error until the optional reconnect delay has passed.
+
+Other paths are not touched. The wrapping only applies inside the current
+process: worker processes (analysis, transcoding) read at full speed, also
+when they are forked (Linux), because forked children undo it at start.
+
+Usage:
+    python BossRC500Emulator.py PEDAL_FOLDER [options] gui
+    python BossRC500Emulator.py PEDAL_FOLDER [options] export --archive zip
+    python BossRC500Emulator.py PEDAL_FOLDER [options] delete
+    python BossRC500Emulator.py PEDAL_FOLDER [options] cli --jobs 4 backup OUT
+
+The tool finds the pedal through the RC500_DRIVE environment variable,
+which is set to PEDAL_FOLDER. Use --generate to create a fake pedal there
+first (see BossRC500Fixture.py).
+
+Copyright (C) 2026 [pmonk.com]
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import io
+import os
+import sys
+import time
+import errno
+import random
+import runpy
+import builtins
+import argparse
+import threading
+
+import BossRC500Fixture as fixture
+
+TOOLS = {
+    "gui": "BossRC500GUI.py",
+    "export": "BossRC500Export.py",
+    "delete": "BossRC500Delete.py",
+    "cli": "BossRC500CLI.py",
+}
+
+# USB mass storage moves data in commands of roughly this size
+BLOCK_SIZE = 64 * 1024
+
+# os functions that take a path (or a directory fd) and count as one operation
+PATH_FUNCS = ("stat", "lstat", "scandir", "listdir", "remove", "unlink", "rmdir",
+              "mkdir", "rename", "replace", "utime", "chmod")
+
+
+class DeviceDisconnected(OSError):
+    pass
+
+class PedalEmulator:
+    """
+    Throttles file access under root. Use as a context manager or call
+    install() / uninstall(). Timings are in seconds, bandwidth in bytes/s.
+    """
+
+    def __init__(self, root, latency=0.0, bandwidth=None, stall_chance=0.0, stall_seconds=1.0,
+                 disconnect_after=None, disconnect_chance=0.0, reconnect_after=None, seed=None):
+        self.root = os.path.abspath(root)
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.stall_chance = stall_chance
+        self.stall_seconds = stall_seconds
+        self.disconnect_after = disconnect_after
+        self.disconnect_chance = disconnect_chance
+        self.reconnect_after = reconnect_after
+        self.rng = random.Random(seed)
+
+        self.lock = threading.Lock()
+        self.bus_free = 0.0
+        self.disconnected_at = None
+        self.fds = set()
+        self.orig = {}
+        self.installed = False
+        self.fork_hook = False
+        self.stats = {'ops': 0, 'bytes_read': 0, 'bytes_written': 0, 'stalls': 0,
+                      'disconnects': 0, 'failed_ops': 0, 'waited': 0.0}
+        self.started = None
+
+    # --- Device model ---
+
+    def covers(self, path, dir_fd=None):
+        if dir_fd is not None:
+            return dir_fd in self.fds
+        if isinstance(path, int):
+            return path in self.fds
+        try:
+            path = os.fsdecode(path)
+        except TypeError:
+            return False
+        full = os.path.abspath(path)
+        return full == self.root or full.startswith(self.root + os.sep)
+
+    def check_connected(self, path=None):
+        with self.lock:
+            if self.disconnected_at is not None:
+                if self.reconnect_after is not None and time.monotonic() - self.disconnected_at >= self.reconnect_after:
+                    self.disconnected_at = None
+                else:
+                    self.stats['failed_ops'] += 1
+                    raise DeviceDisconnected(errno.EIO, "Pedal disconnected", path)
+
+    def disconnect(self):
+        with self.lock:
+            if self.disconnected_at is None:
+                self.disconnected_at = time.monotonic()
+                self.stats['disconnects'] += 1
+
+    def wait(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+            with self.lock:
+                self.stats['waited'] += seconds
+
+    def operation(self, path=None):
+        """One command to the device: latency, maybe a stall or a disconnect."""
+        self.check_connected(path)
+        with self.lock:
+            self.stats['ops'] += 1
+            stall = self.stall_chance and self.rng.random() < self.stall_chance
+            drop = self.disconnect_chance and self.rng.random() < self.disconnect_chance
+            if stall:
+                self.stats['stalls'] += 1
+        self.wait(self.latency + (self.stall_seconds if stall else 0.0))
+        if drop:
+            self.disconnect()
+            self.check_connected(path)
+
+    def transfer(self, nbytes, written, path=None):
+        """Accounts for nbytes moving over the (shared) bus."""
+        with self.lock:
+            self.stats['bytes_written' if written else 'bytes_read'] += nbytes
+            moved = self.stats['bytes_read'] + self.stats['bytes_written']
+            delay = 0.0
+            if self.bandwidth:
+                now = time.monotonic()
+                self.bus_free = max(now, self.bus_free) + nbytes / self.bandwidth
+                delay = self.bus_free - now
+            drop = self.disconnect_after is not None and moved >= self.disconnect_after
+            if drop:
+                self.disconnect_after = None
+        self.wait(delay)
+        if drop:
+            self.disconnect()
+            self.check_connected(path)
+
+    # --- Patching ---
+
+    def install(self):
+        if self.installed:
+            return self
+        self.installed = True
+        self.started = time.monotonic()
+        self.orig['open'] = builtins.open
+        builtins.open = io.open = self.open_file
+        self.orig['os.open'] = os.open
+        self.orig['os.close'] = os.close
+        os.open = self.os_open
+        os.close = self.os_close
+        for name in PATH_FUNCS:
+            func = getattr(os, name)
+            self.orig[name] = func
+            setattr(os, name, self.wrap_path_func(func))
+        # A forked child would inherit the wrappers with a private copy of the
+        # throttle state; hooks can't be removed, so this one checks installed
+        if not self.fork_hook and hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self.uninstall)
+            self.fork_hook = True
+        return self
+
+    def uninstall(self):
+        # The originals stay in self.orig: code that kept a reference to a
+        # wrapper (e.g. a default argument bound at import) still calls it
+        if not self.installed:
+            return
+        self.installed = False
+        builtins.open = io.open = self.orig['open']
+        os.open = self.orig['os.open']
+        os.close = self.orig['os.close']
+        for name in PATH_FUNCS:
+            setattr(os, name, self.orig[name])
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, *exc):
+        self.uninstall()
+
+    def wrap_path_func(self, func):
+        def wrapper(path=".", *args, **kwargs):
+            if self.installed and self.covers(path, kwargs.get('dir_fd')):
+                self.operation(path)
+            return func(path, *args, **kwargs)
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+
+    def open_file(self, file, *args, **kwargs):
+        if not self.installed or not self.covers(file):
+            return self.orig['open'](file, *args, **kwargs)
+        self.operation(file)
+        return ThrottledFile(self, self.orig['open'](file, *args, **kwargs), file)
+
+    def os_open(self, path, *args, **kwargs):
+        covered = self.installed and self.covers(path, kwargs.get('dir_fd'))
+        if covered:
+            self.operation(path)
+        fd = self.orig['os.open'](path, *args, **kwargs)
+        if covered:
+            self.fds.add(fd)
+        return fd
+
+    def os_close(self, fd):
+        self.fds.discard(fd)
+        return self.orig['os.close'](fd)
+
+    def summary(self):
+        s = self.stats
+        elapsed = time.monotonic() - self.started if self.started else 0.0
+        moved = s['bytes_read'] + s['bytes_written']
+        rate = moved / elapsed / 1048576 if elapsed else 0.0
+        return (f"Emulator: {s['ops']} ops, {s['bytes_read'] / 1048576:.1f} MB read, "
+                f"{s['bytes_written'] / 1048576:.1f} MB written in {elapsed:.1f} s ({rate:.1f} MB/s), "
+                f"{s['waited']:.1f} s throttled, {s['stalls']} stalls, {s['disconnects']} disconnects, "
+                f"{s['failed_ops']} failed ops")
+
+class ThrottledFile:
+    """File object wrapper that splits reads/writes into device blocks."""
+
+    def __init__(self, emulator, f, path):
+        self._emulator = emulator
+        self._f = f
+        self._path = path
+
+    def fileno(self):
+        # Forces shutil to copy through read()/write() instead of sendfile
+        raise io.UnsupportedOperation("fileno")
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            parts = []
+            while True:
+                part = self.read(BLOCK_SIZE)
+                if not part:
+                    break
+                parts.append(part)
+            return self._f.read(0).__class__().join(parts)
+
+        parts = []
+        remaining = size
+        while remaining > 0:
+            self._emulator.operation(self._path)
+            part = self._f.read(min(remaining, BLOCK_SIZE))
+            self._emulator.transfer(len(part), False, self._path)
+            if not part:
+                break
+            parts.append(part)
+            remaining -= len(part)
+        return self._f.read(0).__class__().join(parts)
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def readline(self, size=-1):
+        self._emulator.operation(self._path)
+        line = self._f.readline(size)
+        self._emulator.transfer(len(line), False, self._path)
+        return line
+
+    def __iter__(self):
+        return iter(self.readline, self._f.read(0).__class__())
+
+    def write(self, data):
+        view = memoryview(data) if isinstance(data, (bytes, bytearray, memoryview)) else data
+        for start in range(0, len(view), BLOCK_SIZE):
+            self._emulator.operation(self._path)
+            piece = view[start:start + BLOCK_SIZE]
+            self._f.write(piece)
+            self._emulator.transfer(len(piece), True, self._path)
+        return len(view)
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a Boss RC-500 tool against a throttled fake pedal.")
+    parser.add_argument("pedal", help="folder containing the ROLAND tree")
+    parser.add_argument("--generate", action="store_true", help="create a fake pedal in the folder first")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="delay per operation")
+    parser.add_argument("--bandwidth-mb", type=float, default=20.0, help="MB/s (0 = unlimited)")
+    parser.add_argument("--stall-chance", type=float, default=0.0, help="chance per operation of a stall")
+    parser.add_argument("--stall-seconds", type=float, default=1.0)
+    parser.add_argument("--disconnect-after-mb", type=float, help="disconnect once this much data has moved")
+    parser.add_argument("--disconnect-chance", type=float, default=0.0, help="chance per operation of a disconnect")
+    parser.add_argument("--reconnect-after", type=float, help="seconds until the pedal comes back (default: never)")
+    parser.add_argument("--seed", type=int, help="seed for stalls and disconnects")
+    parser.add_argument("tool", help="gui, export, delete, cli or a path to a script")
+    parser.add_argument("tool_args", nargs=argparse.REMAINDER, help="arguments passed to the tool")
+    args = parser.parse_args()
+
+    if args.generate:
+        wave_dir, tracks, size = fixture.generate_pedal(args.pedal)
+        print(f"Created {tracks} tracks ({size / 1048576:.1f} MB) in {wave_dir}")
+
+    script = TOOLS.get(args.tool, args.tool)
+    if not os.path.isabs(script) and not os.path.exists(script):
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), script)
+
+    os.environ["RC500_DRIVE"] = os.path.abspath(args.pedal)
+    sys.argv = [script] + args.tool_args
+    emulator = PedalEmulator(
+        args.pedal,
+        latency=args.latency_ms / 1000,
+        bandwidth=args.bandwidth_mb * 1048576 or None,
+        stall_chance=args.stall_chance,
+        stall_seconds=args.stall_seconds,
+        disconnect_after=args.disconnect_after_mb * 1048576 if args.disconnect_after_mb is not None else None,
+        disconnect_chance=args.disconnect_chance,
+        reconnect_after=args.reconnect_after,
+        seed=args.seed,
+    )
+    with emulator:
+        try:
+            runpy.run_path(script, run_name="__main__")
+        finally:
+            print(emulator.summary())
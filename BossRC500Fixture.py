@@ -0,0 +1,146 @@
+"""
+Boss RC-500 Fixture Generator
+-----------------------------
+Builds a fake pedal tree for testing and benchmarking without hardware:
+
+    <root>/ROLAND/WAVE/001_1/001_1.WAV ...
+    <root>/ROLAND/DATA/MEMORY1.RC0, MEMORY2.RC0
+
+Memories get random names, tempos and time signatures; each has 0-2 tracks
+of varying length (32-bit float stereo, like the pedal records). The output
+depends only on the seed, so benchmark runs are comparable.
+
+Usage: python BossRC500Fixture.py <output folder> [--memories 99] [--seed 500]
+
+Copyright (C) 2026 [pmonk.com]
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import os
+import sys
+import math
+import array
+import random
+import struct
+import argparse
+
+MEMORY_COUNT = 99
+SAMPLE_RATE = 44100
+CHANNELS = 2
+NAME_LENGTH = 12
+
+WORDS = ("Intro", "Verse", "Chorus", "Bridge", "Outro", "Groove", "Funk", "Blues",
+         "Jam", "Riff", "Ambient", "Drone", "Bass", "Lead", "Chords", "Loop",
+         "Swing", "Reggae", "Rock", "Ballad", "Idea", "Take")
+
+# Rough per-memory settings so the file is about the size of a real one
+EXTRA_TAGS = ("PlyLvl", "Pan", "One", "TrkFx", "PlyMod", "Measure", "LoopSync",
+              "TempoSync", "Input", "Output", "Reverse", "StartMode", "StopMode",
+              "FadeTime", "DubMode", "Undo", "Bounce", "Quantize", "Mic", "Inst")
+
+
+def wav_header(frames, channels=CHANNELS, sample_rate=SAMPLE_RATE):
+    """RIFF header for 32-bit float PCM."""
+    data_size = frames * channels * 4
+    return (b"RIFF" + struct.pack("<I", 36 + data_size) + b"WAVE"
+            + b"fmt " + struct.pack("<IHHIIHH", 16, 3, channels, sample_rate,
+                                    sample_rate * channels * 4, channels * 4, 32)
+            + b"data" + struct.pack("<I", data_size))
+
+def write_track(path, rng, seconds, sample_rate=SAMPLE_RATE):
+    """
+    Writes a loop made of short tonal segments. Each segment repeats one
+    cycle of a chord, which keeps generation fast without numpy.
+    """
+    frames = int(seconds * sample_rate)
+    with open(path, "wb") as f:
+        f.write(wav_header(frames, sample_rate=sample_rate))
+        written = 0
+        while written < frames:
+            seg = min(frames - written, int(sample_rate * rng.uniform(0.1, 0.5)))
+            period = rng.randint(40, 400)
+            level = rng.uniform(0.05, 0.5)
+            pan = rng.uniform(0.3, 1.0)
+            cycle = array.array("f")
+            for i in range(period):
+                x = level * (math.sin(2 * math.pi * i / period)
+                             + 0.5 * math.sin(4 * math.pi * i / period)
+                             + 0.25 * math.sin(6 * math.pi * i / period)) / 1.75
+                cycle.append(x * pan)
+                cycle.append(x * (1.3 - pan))
+            if sys.byteorder != "little":
+                cycle.byteswap()
+            raw = cycle.tobytes()
+            reps, rest = divmod(seg, period)
+            f.write(raw * reps + raw[:rest * CHANNELS * 4])
+            written += seg
+
+def memory_block(mem_id, name, tempo, beat, rng):
+    """One <mem> record in the layout parse_metadata reads."""
+    chars = "".join(f"<C{i:02d}>{ord(c)}</C{i:02d}>" for i, c in enumerate(name.ljust(NAME_LENGTH)))
+    tracks = "".join(
+        f"<TRACK{t}>" + "".join(f"<{tag}>{rng.randint(0, 100)}</{tag}>" for tag in EXTRA_TAGS) + f"</TRACK{t}>"
+        for t in (1, 2))
+    return (f'<mem id="{mem_id}">\n<NAME>{chars}</NAME>\n'
+            f"<MASTER><Tempo>{tempo}</Tempo><Beat>{beat}</Beat><DubMode>0</DubMode></MASTER>\n"
+            f"{tracks}\n"
+            f"<RHYTHM><Pattern>{rng.randint(0, 56)}</Pattern><Kit>{rng.randint(0, 15)}</Kit></RHYTHM>\n"
+            f"</mem>\n")
+
+def generate_pedal(root, memories=MEMORY_COUNT, seed=500, min_seconds=0.5, max_seconds=3.0,
+                   empty_ratio=0.2, logger_func=None):
+    """
+    Creates a fake pedal under root. Returns (ROLAND/WAVE path, track count, audio bytes).
+    """
+    rng = random.Random(seed)
+    wave_dir = os.path.join(root, "ROLAND", "WAVE")
+    data_dir = os.path.join(root, "ROLAND", "DATA")
+    os.makedirs(wave_dir, exist_ok=True)
+    os.makedirs(data_dir, exist_ok=True)
+
+    blocks = []
+    track_count = 0
+    total_bytes = 0
+    for mem_id in range(MEMORY_COUNT):
+        name = f"{rng.choice(WORDS)} {rng.choice(WORDS)}"[:NAME_LENGTH]
+        tempo = rng.choice((1200, 1200, rng.randint(600, 2000)))
+        beat = rng.choice((2, 2, 2, 1, 7, 13))
+        blocks.append(memory_block(mem_id, name, tempo, beat, rng))
+
+        slot = mem_id + 1
+        if slot > memories or rng.random() < empty_ratio:
+            continue
+        # Tracks in one memory usually share a loop length (or a multiple of it)
+        seconds = rng.uniform(min_seconds, max_seconds)
+        for track in range(1, rng.choice((1, 2, 2)) + 1):
+            folder = os.path.join(wave_dir, f"{slot:03d}_{track}")
+            os.makedirs(folder, exist_ok=True)
+            path = os.path.join(folder, f"{slot:03d}_{track}.WAV")
+            write_track(path, rng, seconds * rng.choice((1, 1, 2)))
+            track_count += 1
+            total_bytes += os.path.getsize(path)
+        if logger_func and slot % 10 == 0:
+            logger_func(f"Generated memory {slot}...")
+
+    content = '<?xml version="1.0" encoding="utf-8"?>\n<database name="RC-500" revision="0">\n' + "".join(blocks) + "</database>\n"
+    for fname in ("MEMORY1.RC0", "MEMORY2.RC0"):
+        with open(os.path.join(data_dir, fname), "w", encoding="utf-8") as f:
+            f.write(content)
+
+    return wave_dir, track_count, total_bytes
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a fake Boss RC-500 tree for testing.")
+    parser.add_argument("output", help="folder to create the ROLAND tree in")
+    parser.add_argument("--memories", type=int, default=MEMORY_COUNT, help="memories with audio (1-99)")
+    parser.add_argument("--seed", type=int, default=500)
+    parser.add_argument("--max-seconds", type=float, default=3.0, help="longest loop length")
+    args = parser.parse_args()
+
+    wave_dir, tracks, size = generate_pedal(args.output, args.memories, args.seed,
+                                            max_seconds=args.max_seconds, logger_func=print)
+    print(f"Created {tracks} tracks ({size / 1048576:.1f} MB) in {wave_dir}")
@@ -44,8 +44,6 @@ Copyright (C) 2026 [pmonk.com]
 """
 
 import os
-import shutil
-import string
 import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
@@ -53,160 +51,44 @@ from datetime import datetime
 import re
 import webbrowser
 
-# --- METADATA HELPERS ---
+import BossRC500Audio as rc_audio
+import BossRC500Archive as rc_archive
+import BossRC500Browser as rc_browser
+import BossRC500Daemon as rc_daemon
+import BossRC500Store as rc_store
+import BossRC500Sync as rc_sync
+import BossRC500Trace as rc_trace
+import BossRC500Tune as rc_tune
+
+from BossRC500Core import (
+    find_pedal, parse_metadata, parse_range, format_range, build_export_name, scan_wave_tracks,
+    pedal_key, find_slot_folders, backup_pedal, restore_backup, delete_folders,
+    STORE_ARCHIVE, SILENT_FOLDER, REPORT_HTML_NAME, FINGERPRINT_INDEX_NAME,
+    write_manifest, load_manifest, tracks_from_folder, analyze_tracks,
+    check_tempos, apply_tempo_suggestions, find_backup_duplicates, create_reports,
+)
 
-def get_time_signature_map(beat_val):
-    beat_map = {
-        0: "2/4", 1: "3/4", 2: "4/4", 3: "5/4", 4: "6/4",
-        5: "7/4", 6: "5/8", 7: "6/8", 8: "7/8", 9: "8/8",
-        10: "9/8", 11: "10/8", 12: "11/8", 13: "12/8",
-        14: "13/8", 15: "14/8", 16: "15/8"
-    }
-    return beat_map.get(beat_val, "?")
+# --- MAIN GUI ---
 
-def parse_metadata(boss_wave_path, logger_func):
-    """Parses MEMORY1.RC0 for Name, BPM, Time Sig, and Context."""
-    metadata = {}
-    try:
-        data_dir = os.path.abspath(os.path.join(boss_wave_path, "..", "DATA"))
-        xml_path = os.path.join(data_dir, "MEMORY1.RC0")
-        
-        if not os.path.exists(xml_path):
-            if logger_func: logger_func("Warning: MEMORY1.RC0 not found.")
-            return {}
+SILENT_COPY = "Copy & flag"
+SILENT_SKIP = "Skip"
+SILENT_SEPARATE = "Move to 'Silent' folder"
+SILENT_MODES = (SILENT_COPY, SILENT_SKIP, SILENT_SEPARATE)
 
-        if logger_func: logger_func("Reading metadata...")
-        
-        with open(xml_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
+BUNDLE_NONE = "None"
+BUNDLE_MIX = "Stereo mixdown"
+BUNDLE_STEMS = "Multichannel stems"
+BUNDLE_BOTH = "Mixdown + stems"
+BUNDLE_MODES = (BUNDLE_NONE, BUNDLE_MIX, BUNDLE_STEMS, BUNDLE_BOTH)
+BUNDLE_FOLDER = "Mixdowns"
 
-        mem_pattern = r'<mem id="(\d+)">(.*?)</mem>'
-        mem_blocks = re.findall(mem_pattern, content, re.DOTALL)
-        
-        for mem_id_str, mem_content in mem_blocks:
-            mem_id = int(mem_id_str) + 1
-            data = {'name': '', 'bpm': '', 'ts': '', 'ts_raw': '', 'pattern': '', 'kit': ''}
-            
-            # Name
-            name_codes = re.findall(r'<C(\d+)>(\d+)</C\d+>', mem_content)
-            if name_codes:
-                name_codes.sort(key=lambda x: int(x[0]))
-                chars = [chr(int(c)) for _, c in name_codes]
-                raw_name = "".join(chars).strip()
-                data['name'] = "".join([c for c in raw_name if c.isalnum() or c in ('-', '_', ' ')])
-
-            # BPM
-            tempo = re.search(r'<Tempo>(\d+)</Tempo>', mem_content)
-            if tempo:
-                bpm = int(tempo.group(1)) / 10.0
-                data['bpm'] = f"{int(bpm)}bpm" if bpm.is_integer() else f"{bpm}bpm"
-
-            # Time Sig
-            beat = re.search(r'<Beat>(\d+)</Beat>', mem_content)
-            if beat:
-                val = int(beat.group(1))
-                data['ts_raw'] = val
-                data['ts'] = get_time_signature_map(val)
-            
-            # Context
-            pat = re.search(r'<Pattern>(\d+)</Pattern>', mem_content)
-            if pat: data['pattern'] = pat.group(1)
-            kit = re.search(r'<Kit>(\d+)</Kit>', mem_content)
-            if kit: data['kit'] = kit.group(1)
+ARCHIVE_NONE = "Folder"
+ARCHIVE_STORE = "Dedup store"
+ARCHIVE_CHOICES = (ARCHIVE_NONE,) + tuple(rc_archive.ARCHIVE_FORMATS) + (ARCHIVE_STORE,)
 
-            metadata[mem_id] = data
-            
-        return metadata
-    except Exception as e:
-        if logger_func: logger_func(f"Error parsing metadata: {str(e)}")
-        return {}
-
-def create_reports(metadata, dest_dir, logger_func):
-    """Generates Markdown and HTML reports."""
-    md_path = os.path.join(dest_dir, "RC500_Library_Report.md")
-    html_path = os.path.join(dest_dir, "RC500_Library_Report.html")
-    
-    html_rows = ""
-    md_rows = ""
-    
-    if not metadata:
-        return None
-
-    sorted_ids = sorted(metadata.keys())
-    for mem_id in sorted_ids:
-        m = metadata[mem_id]
-        context_parts = []
-        if m['pattern']: context_parts.append(f"Pattern {m['pattern']}")
-        if m['kit']: context_parts.append(f"Kit {m['kit']}")
-        context_str = ", ".join(context_parts) if context_parts else "-"
-        
-        name = m['name'] or "Empty"
-        ts = m['ts'] or "-"
-        ts_raw = m['ts_raw'] if m['ts_raw'] != '' else "-"
-        bpm = m['bpm'] or "-"
-
-        # Markdown Row
-        md_rows += f"| {mem_id:02d} | {name} | {bpm} | {ts_raw} | {ts} | {context_str} |\n"
-        
-        # HTML Row
-        html_rows += f"""
-        <tr>
-            <td>{mem_id:02d}</td>
-            <td class="name">{name}</td>
-            <td>{bpm}</td>
-            <td>{ts_raw}</td>
-            <td class="highlight">{ts}</td>
-            <td class="context">{context_str}</td>
-        </tr>"""
-
-    # Write Markdown
-    with open(md_path, "w", encoding="utf-8") as f:
-        f.write("# Boss RC-500 Library Report\n\n")
-        f.write("| Memory | Name | BPM | Beat (XML) | Time Sig | Context |\n")
-        f.write("| :--- | :--- | :--- | :---: | :---: | :--- |\n")
-        f.write(md_rows)
-    
-    # Write HTML
-    html_content = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <title>Boss RC-500 Library Report</title>
-        <style>
-            body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background: #f4f4f9; color: #333; padding: 20px; }}
-            h1 {{ color: #444; border-bottom: 2px solid #ddd; padding-bottom: 10px; }}
-            table {{ width: 100%; border-collapse: collapse; background: white; box-shadow: 0 1px 3px rgba(0,0,0,0.2); }}
-            th, td {{ padding: 12px 15px; text-align: left; border-bottom: 1px solid #ddd; }}
-            th {{ background-color: #007bff; color: white; text-transform: uppercase; font-size: 0.85rem; }}
-            tr:hover {{ background-color: #f1f1f1; }}
-            .name {{ font-weight: bold; color: #2c3e50; }}
-            .highlight {{ color: #d63031; font-weight: bold; }}
-            .context {{ font-style: italic; color: #666; }}
-            .footer {{ margin-top: 20px; font-size: 0.8rem; color: #777; }}
-        </style>
-    </head>
-    <body>
-        <h1>RC-500 Loop Library</h1>
-        <table>
-            <thead>
-                <tr>
-                    <th>#</th><th>Name</th><th>BPM</th><th>XML Beat</th><th>Time Sig</th><th>Context / Kit</th>
-                </tr>
-            </thead>
-            <tbody>{html_rows}</tbody>
-        </table>
-        <div class="footer">Generated on {datetime.now().strftime('%Y-%m-%d %H:%M')}</div>
-    </body>
-    </html>
-    """
-    with open(html_path, "w", encoding="utf-8") as f:
-        f.write(html_content)
-        
-    logger_func(f"Reports generated:\n -> {md_path}\n -> {html_path}")
-    return html_path
-
-# --- MAIN GUI ---
+EXPORT_ORIGINAL = "Original (copy)"
+EXPORT_ORIGINAL_RATE = "Original"
+EXPORT_RATES = (EXPORT_ORIGINAL_RATE, "44100", "48000", "88200", "96000")
 
 class BossRC500App:
     def __init__(self, root):
@@ -227,14 +109,41 @@ class BossRC500App:
         self.is_running = False
         self.html_report_path = None
         self.final_dest_dir = None
+        self.daemon = None
+        self.autotune = True
         
         # Backup Logic Vars
         self.backup_mode_var = tk.StringVar(value="all") # "all" or "range"
         self.backup_range_var = tk.StringVar()
+        self.analyze_var = tk.BooleanVar(value=rc_audio.HAVE_NUMPY)
+        self.silent_mode_var = tk.StringVar(value=SILENT_COPY)
+        self.silent_threshold_var = tk.StringVar(value=str(rc_audio.SILENCE_THRESHOLD_DB))
+        self.import_skip_silent_var = tk.BooleanVar(value=True)
+        self.find_dupes_var = tk.BooleanVar(value=rc_audio.HAVE_NUMPY)
+        self.check_tempo_var = tk.BooleanVar(value=rc_audio.HAVE_NUMPY)
+        self.fix_tempo_var = tk.BooleanVar(value=False)
+        self.export_format_var = tk.StringVar(value=EXPORT_ORIGINAL)
+        self.export_rate_var = tk.StringVar(value=EXPORT_ORIGINAL_RATE)
+        self.bundle_mode_var = tk.StringVar(value=BUNDLE_NONE)
+        self.archive_var = tk.StringVar(value=ARCHIVE_NONE)
+        self.import_range_var = tk.StringVar()
+        self.trace_var = tk.BooleanVar(value=rc_trace.tracer.enabled)
 
         # Delete Logic Vars
         self.delete_range_var = tk.StringVar()
 
+        # Sync Logic Vars
+        self.sync_library_var = tk.StringVar(value=os.path.join(os.getcwd(), "Library"))
+        self.sync_mode_var = tk.StringVar(value=rc_sync.TO_LIBRARY)
+        self.sync_range_var = tk.StringVar()
+        self.sync_deletes_var = tk.BooleanVar(value=False)
+
+        # Browser Vars
+        self.browser_filter_var = tk.StringVar()
+        self.browser_status_var = tk.StringVar(value="Open this tab or press Refresh to load.")
+        self.browser_loaded = False
+        self.browser_filter_job = None
+
         # --- Layout ---
         self.create_widgets()
         self.scan_drive() # Auto-scan on startup
@@ -247,6 +156,8 @@ class BossRC500App:
         ttk.Label(conn_frame, text="Pedal Drive:").pack(side="left")
         ttk.Entry(conn_frame, textvariable=self.source_dir, width=40, state="readonly").pack(side="left", padx=5)
         ttk.Button(conn_frame, text="Rescan", command=self.scan_drive).pack(side="left")
+        ttk.Button(conn_frame, text="Test Speed", command=self.start_speed_test).pack(side="left", padx=5)
+        ttk.Checkbutton(conn_frame, text="Trace timings", variable=self.trace_var).pack(side="right")
 
         # 2. Tabs
         self.notebook = ttk.Notebook(self.root)
@@ -267,6 +178,17 @@ class BossRC500App:
         self.notebook.add(self.tab_delete, text="Delete Loops")
         self.setup_delete_tab()
 
+        # Tab 4: Sync
+        self.tab_sync = ttk.Frame(self.notebook, padding=10)
+        self.notebook.add(self.tab_sync, text="Sync Library")
+        self.setup_sync_tab()
+
+        # Tab 5: Loop Browser
+        self.tab_browser = ttk.Frame(self.notebook, padding=10)
+        self.notebook.add(self.tab_browser, text="Loop Browser")
+        self.setup_browser_tab()
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+
         # 3. Log
         log_frame = ttk.LabelFrame(self.root, text="Activity Log", padding=5)
         log_frame.pack(fill="both", expand=True, padx=10, pady=5)
@@ -305,6 +227,38 @@ class BossRC500App:
         hbox.pack(fill="x")
         ttk.Entry(hbox, textvariable=self.dest_dir).pack(side="left", fill="x", expand=True)
         ttk.Button(hbox, text="Browse...", command=self.browse_dest).pack(side="right", padx=5)
+        ttk.Label(hbox, text="Save As:").pack(side="left", padx=(10, 0))
+        ttk.Combobox(hbox, textvariable=self.archive_var, values=ARCHIVE_CHOICES, width=12, state="readonly").pack(side="left", padx=5)
+
+        # Format
+        format_box = ttk.Frame(self.tab_backup)
+        format_box.pack(fill="x", pady=(5, 0))
+        ttk.Label(format_box, text="Export Format:").pack(side="left")
+        ttk.Combobox(format_box, textvariable=self.export_format_var, values=(EXPORT_ORIGINAL,) + tuple(rc_audio.EXPORT_FORMATS), width=20, state="readonly").pack(side="left", padx=5)
+        ttk.Label(format_box, text="Sample Rate:").pack(side="left", padx=(10, 0))
+        ttk.Combobox(format_box, textvariable=self.export_rate_var, values=EXPORT_RATES, width=10, state="readonly").pack(side="left", padx=5)
+
+        bundle_box = ttk.Frame(self.tab_backup)
+        bundle_box.pack(fill="x", pady=(5, 0))
+        ttk.Label(bundle_box, text="Per-Memory Bundles:").pack(side="left")
+        ttk.Combobox(bundle_box, textvariable=self.bundle_mode_var, values=BUNDLE_MODES, width=20, state="readonly").pack(side="left", padx=5)
+
+        # Options
+        ttk.Checkbutton(self.tab_backup, text="Analyze levels (peak / RMS / loudness / clipping) after backup", variable=self.analyze_var).pack(anchor="w", pady=(5, 0))
+
+        ttk.Checkbutton(self.tab_backup, text="Find duplicate loops (audio fingerprint)", variable=self.find_dupes_var).pack(anchor="w")
+
+        tempo_box = ttk.Frame(self.tab_backup)
+        tempo_box.pack(fill="x")
+        ttk.Checkbutton(tempo_box, text="Check tempo against audio", variable=self.check_tempo_var).pack(side="left")
+        ttk.Checkbutton(tempo_box, text="Use estimated BPM in filenames when it disagrees", variable=self.fix_tempo_var).pack(side="left", padx=10)
+
+        silent_box = ttk.Frame(self.tab_backup)
+        silent_box.pack(fill="x", pady=(5, 0))
+        ttk.Label(silent_box, text="Silent tracks:").pack(side="left")
+        ttk.Combobox(silent_box, textvariable=self.silent_mode_var, values=SILENT_MODES, width=22, state="readonly").pack(side="left", padx=5)
+        ttk.Label(silent_box, text="Threshold (dBFS):").pack(side="left", padx=(10, 0))
+        ttk.Entry(silent_box, textvariable=self.silent_threshold_var, width=6).pack(side="left", padx=5)
         
         # Big Button
         btn_frame = ttk.Frame(self.tab_backup)
@@ -330,6 +284,8 @@ class BossRC500App:
         self.btn_open_folder = ttk.Button(action_frame, text="Open Backup Folder", command=self.open_backup_folder, state="disabled")
         self.btn_open_folder.pack(side="left", fill="x", expand=True, padx=5)
 
+        ttk.Button(action_frame, text="Analyze Folder...", command=self.start_analyze_folder).pack(side="left", fill="x", expand=True, padx=5)
+
     def setup_import_tab(self):
         ttk.Label(self.tab_import, text="Import WAV files back to the Boss RC-500", font=("Arial", 10, "bold")).pack(anchor="w", pady=(0, 5))
         
@@ -346,12 +302,21 @@ class BossRC500App:
         # Source
         src_frame = ttk.Frame(self.tab_import)
         src_frame.pack(fill="x", pady=10)
-        ttk.Label(src_frame, text="Select Backup Folder (containing exported WAVs):").pack(anchor="w")
+        ttk.Label(src_frame, text="Select Backup Folder (containing exported WAVs) or Backup Archive:").pack(anchor="w")
         
         hbox = ttk.Frame(src_frame)
         hbox.pack(fill="x")
         ttk.Entry(hbox, textvariable=self.import_source_dir).pack(side="left", fill="x", expand=True)
-        ttk.Button(hbox, text="Browse...", command=self.browse_import_source).pack(side="right", padx=5)
+        ttk.Button(hbox, text="Archive...", command=self.browse_import_archive).pack(side="right", padx=5)
+        ttk.Button(hbox, text="Browse...", command=self.browse_import_source).pack(side="right")
+
+        range_box = ttk.Frame(self.tab_import)
+        range_box.pack(fill="x", pady=(0, 5))
+        ttk.Label(range_box, text="Only Slots:").pack(side="left")
+        ttk.Entry(range_box, textvariable=self.import_range_var, width=20).pack(side="left", padx=5)
+        ttk.Label(range_box, text="(optional, e.g. 1-10, 15)", font=("Arial", 9, "italic"), foreground="gray").pack(side="left")
+
+        ttk.Checkbutton(self.tab_import, text="Skip silent / empty tracks (uses the Backup tab threshold)", variable=self.import_skip_silent_var).pack(anchor="w")
 
         ttk.Button(self.tab_import, text="RESTORE AUDIO TO PEDAL", command=self.start_import_thread).pack(fill="x", pady=20)
 
@@ -367,6 +332,56 @@ class BossRC500App:
         ttk.Button(btn_frame, text="Preview (Scan Only)", command=self.preview_delete).pack(side="left", fill="x", expand=True, padx=5)
         ttk.Button(btn_frame, text="DELETE PERMANENTLY", command=self.confirm_delete).pack(side="right", fill="x", expand=True, padx=5)
 
+    def setup_sync_tab(self):
+        ttk.Label(self.tab_sync, text="Keep the pedal and a library folder in step", font=("Arial", 10, "bold")).pack(anchor="w")
+        ttk.Label(self.tab_sync, text="Only tracks that differ (by size and checksum) are copied.").pack(anchor="w")
+
+        lib_frame = ttk.Frame(self.tab_sync)
+        lib_frame.pack(fill="x", pady=10)
+        ttk.Label(lib_frame, text="Library Folder:").pack(anchor="w")
+        hbox = ttk.Frame(lib_frame)
+        hbox.pack(fill="x")
+        ttk.Entry(hbox, textvariable=self.sync_library_var).pack(side="left", fill="x", expand=True)
+        ttk.Button(hbox, text="Browse...", command=self.browse_sync_library).pack(side="right", padx=5)
+
+        mode_box = ttk.Frame(self.tab_sync)
+        mode_box.pack(fill="x", pady=(0, 5))
+        ttk.Label(mode_box, text="Direction:").pack(side="left")
+        ttk.Combobox(mode_box, textvariable=self.sync_mode_var, values=rc_sync.SYNC_MODES, width=18, state="readonly").pack(side="left", padx=5)
+        ttk.Label(mode_box, text="Only Slots:").pack(side="left", padx=(10, 0))
+        ttk.Entry(mode_box, textvariable=self.sync_range_var, width=15).pack(side="left", padx=5)
+        ttk.Label(mode_box, text="(optional)", font=("Arial", 9, "italic"), foreground="gray").pack(side="left")
+
+        ttk.Checkbutton(self.tab_sync, text="Delete tracks that are missing on the other side", variable=self.sync_deletes_var).pack(anchor="w")
+        ttk.Label(self.tab_sync, text="Restores to the pedal are audio only; memory names are synced to the library.", font=("Arial", 9, "italic"), foreground="gray").pack(anchor="w", pady=(5, 0))
+
+        btn_frame = ttk.Frame(self.tab_sync)
+        btn_frame.pack(fill="x", pady=15)
+        ttk.Button(btn_frame, text="Preview Sync (Dry Run)", command=lambda: self.start_sync_thread(apply=False)).pack(side="left", fill="x", expand=True, padx=5)
+        ttk.Button(btn_frame, text="APPLY SYNC", command=lambda: self.start_sync_thread(apply=True)).pack(side="right", fill="x", expand=True, padx=5)
+
+    def setup_browser_tab(self):
+        top = ttk.Frame(self.tab_browser)
+        top.pack(fill="x")
+        ttk.Label(top, text="Filter:").pack(side="left")
+        entry = ttk.Entry(top, textvariable=self.browser_filter_var)
+        entry.pack(side="left", fill="x", expand=True, padx=5)
+        ttk.Button(top, text="Refresh", command=self.start_browser_load).pack(side="right")
+        self.browser_filter_var.trace_add("write", lambda *a: self.schedule_browser_filter())
+
+        ttk.Label(self.tab_browser, text="Pedal, sync library and every backup in the destination folder. Click a heading to sort; Ctrl+A selects all shown.",
+                  font=("Arial", 9, "italic"), foreground="gray").pack(anchor="w", pady=(2, 5))
+
+        self.browser_tree = rc_browser.VirtualTree(self.tab_browser, on_change=self.update_browser_status)
+        self.browser_tree.pack(fill="both", expand=True)
+        ttk.Label(self.tab_browser, textvariable=self.browser_status_var).pack(anchor="w", pady=(5, 0))
+
+        btn_frame = ttk.Frame(self.tab_browser)
+        btn_frame.pack(fill="x", pady=(5, 0))
+        ttk.Button(btn_frame, text="Back Up Selected", command=self.browser_backup).pack(side="left", fill="x", expand=True, padx=5)
+        ttk.Button(btn_frame, text="Restore Selected", command=self.browser_restore).pack(side="left", fill="x", expand=True, padx=5)
+        ttk.Button(btn_frame, text="Delete Selected", command=self.browser_delete).pack(side="left", fill="x", expand=True, padx=5)
+
     # --- SHARED HELPERS ---
 
     def log(self, message):
@@ -377,24 +392,112 @@ class BossRC500App:
             self.log_text.config(state="disabled")
         self.root.after(0, _append)
 
+    def start_trace(self):
+        """Turns span recording on or off for the operation that is starting."""
+        rc_trace.tracer.enabled = self.trace_var.get()
+        rc_trace.tracer.reset()
+
+    def finish_trace(self, operation):
+        """Saves the operation's trace in the backup destination and logs the summary."""
+        try:
+            rc_trace.tracer.finish(operation, self.dest_dir.get(), self.log)
+        except Exception as e:
+            self.log(f"Could not save trace: {e}")
+
+    def drop_trace(self):
+        """Discards the trace of an operation that was cancelled before it did anything."""
+        rc_trace.tracer.reset()
+        rc_trace.tracer.enabled = False
+
     def scan_drive(self):
         self.log("Scanning for Boss RC-500...")
-        found = False
-        available_drives = [f"{d}:/" for d in string.ascii_uppercase if os.path.exists(f"{d}:/")]
-        
-        for drive in available_drives:
-            candidate = os.path.join(drive, "ROLAND", "WAVE")
-            if os.path.exists(candidate):
-                self.source_dir.set(candidate)
-                self.log(f"Found pedal at: {candidate}")
-                self.status_msg.set(f"Connected: {candidate}")
-                found = True
-                break
+        self.start_trace()
+        with rc_trace.tracer.span("detect", cat="phase"):
+            candidate = None
+            self.daemon = rc_daemon.connect()
+            if self.daemon:
+                candidate = self.daemon.status().get('pedal')
+            if not candidate:
+                candidate = find_pedal()
+        found = candidate is not None
+        if found:
+            self.source_dir.set(candidate)
+            self.log(f"Found pedal at: {candidate}" + (f" (index from {self.daemon.url})" if self.daemon else ""))
+            self.status_msg.set(f"Connected: {candidate}")
         
         if not found:
             self.source_dir.set("")
             self.log("Error: Pedal not found.")
             self.status_msg.set("Not Connected")
+        self.finish_trace("detect")
+        self.browser_loaded = False
+        if found and self.autotune:
+            self.load_pedal_profile(candidate)
+
+    # --- I/O TUNING ---
+
+    def load_pedal_profile(self, pedal):
+        """Logs the pedal's remembered I/O profile. New pedals are only tested when asked (Test Speed)."""
+        try:
+            known = rc_tune.profile_for(pedal, probe_missing=False)
+        except Exception as e:
+            self.log(f"Could not read the I/O profile: {e}")
+            return
+        if known:
+            for line in rc_tune.describe(known):
+                self.log(line)
+        else:
+            self.log("This pedal's speed hasn't been tested; default copy settings are used. "
+                     "Click Test Speed to measure it (writes a few MB of temporary files to the pedal).")
+
+    def start_speed_test(self):
+        if not self.source_dir.get():
+            messagebox.showerror("Error", "Pedal not connected.")
+            return
+        if self.is_running:
+            return
+        self.is_running = True
+        threading.Thread(target=self.run_speed_test, daemon=True).start()
+
+    def run_speed_test(self):
+        """Re-tests the pedal and the backup destination and logs the copy settings they give."""
+        try:
+            pedal = rc_tune.profile_for(self.source_dir.get(), force=True, logger_func=self.log)
+            dest = rc_tune.profile_for(self.dest_dir.get(), force=True, logger_func=self.log)
+            self.log(f"Backup: {rc_tune.describe_settings(rc_tune.choose_settings(pedal, dest))}")
+            self.log(f"Restore: {rc_tune.describe_settings(rc_tune.choose_settings(dest, pedal))}")
+        except Exception as e:
+            self.log(f"I/O test failed: {e}")
+        finally:
+            self.is_running = False
+
+    def transfer_settings(self, source, dest):
+        """Copy settings from the drives' I/O profiles (defaults for untested drives or when autotuning is off)."""
+        if not self.autotune:
+            return dict(rc_tune.DEFAULTS)
+        try:
+            return rc_tune.transfer_settings(source, dest, probe_missing=False, logger_func=self.log)
+        except Exception as e:
+            self.log(f"I/O test failed, using default copy settings: {e}")
+            return dict(rc_tune.DEFAULTS)
+
+    def read_pedal(self, source, target_slots=None):
+        """(metadata, tracks) from the daemon's warm index when it serves this pedal, else from the drive."""
+        if self.daemon:
+            try:
+                return self.daemon.pedal_listing(source, target_slots)
+            except (OSError, rc_daemon.DaemonError):
+                self.daemon = None
+        metadata = parse_metadata(source, self.log)
+        return metadata, scan_wave_tracks(source, metadata, target_slots)
+
+    def read_metadata(self, source):
+        if self.daemon:
+            try:
+                return self.daemon.pedal_metadata(source)
+            except (OSError, rc_daemon.DaemonError):
+                self.daemon = None
+        return parse_metadata(source, lambda x: None)
 
     def browse_dest(self):
         d = filedialog.askdirectory(initialdir=self.dest_dir.get())
@@ -404,28 +507,75 @@ class BossRC500App:
         d = filedialog.askdirectory()
         if d: self.import_source_dir.set(d)
 
+    def browse_sync_library(self):
+        d = filedialog.askdirectory(initialdir=self.sync_library_var.get())
+        if d: self.sync_library_var.set(d)
+
+    def browse_import_archive(self):
+        types = [("Backup Archives", " ".join(f"*{ext}" for ext in rc_archive.ARCHIVE_FORMATS.values())),
+                 ("Dedup Store Snapshots", f"*{rc_store.SNAPSHOT_EXT}")]
+        f = filedialog.askopenfilename(filetypes=types)
+        if f: self.import_source_dir.set(f)
+
+    def get_archive_format(self):
+        fmt = self.archive_var.get()
+        return fmt if fmt in rc_archive.ARCHIVE_FORMATS else None
+
     def toggle_backup_range_state(self):
         if self.backup_mode_var.get() == "range":
             self.entry_backup_range.config(state="normal")
         else:
             self.entry_backup_range.config(state="disabled")
 
-    def parse_range(self, range_str):
-        ids = set()
-        parts = range_str.split(',')
-        for part in parts:
-            part = part.strip()
-            if not part: continue
-            if '-' in part:
-                try:
-                    start, end = map(int, part.split('-'))
-                    ids.update(range(start, end + 1))
-                except ValueError: continue
-            else:
-                try:
-                    ids.add(int(part))
-                except ValueError: continue
-        return sorted(list(ids))
+    def get_export_format(self):
+        """Returns (EXPORT_FORMATS key or None, sample rate or None). None means copy as-is."""
+        export_format = self.export_format_var.get()
+        rate = self.export_rate_var.get()
+        sample_rate = int(rate) if rate != EXPORT_ORIGINAL_RATE else None
+        if export_format == EXPORT_ORIGINAL:
+            if not sample_rate:
+                return None, None
+            export_format = "32-bit float"  # resampling only, keep full precision
+        return export_format, sample_rate
+
+    def get_silence_threshold(self):
+        try:
+            return float(self.silent_threshold_var.get())
+        except ValueError:
+            return rc_audio.SILENCE_THRESHOLD_DB
+
+    def detect_silent(self, paths):
+        """Returns the set of silent paths, logging how many were found."""
+        threshold = self.get_silence_threshold()
+        self.log(f"Checking {len(paths)} tracks for silence (< {threshold} dBFS)...")
+        silent = rc_audio.find_silent(paths, threshold)
+        if not rc_audio.HAVE_NUMPY:
+            self.log("Note: numpy is not installed, only empty tracks can be detected.")
+        self.log(f"Silent tracks: {len(silent)}")
+        return silent
+
+    def get_fingerprint_index(self):
+        return rc_audio.FingerprintIndex(os.path.join(self.dest_dir.get(), FINGERPRINT_INDEX_NAME))
+
+    def index_pedal(self, source):
+        """Fingerprints every track on the pedal (cached by size/mtime) and returns the index."""
+        index = self.get_fingerprint_index()
+        tracks = scan_wave_tracks(source, {})
+        self.log(f"Fingerprinting {len(tracks)} pedal tracks...")
+        index.update_location(rc_audio.FingerprintIndex.PEDAL,
+                              [dict(t, file=pedal_key(t['path'], source)) for t in tracks])
+        index.save()
+        return index
+
+    def pedal_duplicates(self, index, path, source):
+        """Returns (pedal duplicates, backup duplicates) for one track on the pedal."""
+        entry = index.entries.get((rc_audio.FingerprintIndex.PEDAL, pedal_key(path, source)))
+        if not entry:
+            return [], []
+        dupes = index.find_duplicates(entry)
+        on_pedal = [d for d in dupes if d['location'] == rc_audio.FingerprintIndex.PEDAL]
+        in_backups = [d for d in dupes if d['location'] != rc_audio.FingerprintIndex.PEDAL]
+        return on_pedal, in_backups
 
     # --- BACKUP LOGIC ---
 
@@ -437,7 +587,7 @@ class BossRC500App:
 
         if self.backup_mode_var.get() == "range":
             r = self.backup_range_var.get()
-            if not r or not self.parse_range(r):
+            if not r or not parse_range(r):
                 messagebox.showerror("Error", "Please enter a valid range (e.g. 1-10).")
                 return
         
@@ -450,44 +600,50 @@ class BossRC500App:
             source = self.source_dir.get()
             self.log("--- STARTING PREVIEW (NO FILES COPIED) ---")
             
-            metadata = parse_metadata(source, self.log)
-            
             mode = self.backup_mode_var.get()
             target_slots = None
             if mode == "range":
-                target_slots = self.parse_range(self.backup_range_var.get())
+                target_slots = parse_range(self.backup_range_var.get())
                 self.log(f"Previewing range: {target_slots}")
             else:
                 self.log("Previewing ALL slots...")
 
+            metadata, found = self.read_pedal(source, target_slots)
+            silent = self.detect_silent([t['path'] for t in found])
+
+            if self.check_tempo_var.get():
+                tempos = check_tempos([t for t in found if t['path'] not in silent], metadata, self.log)
+                if self.fix_tempo_var.get():
+                    fixed = apply_tempo_suggestions(metadata, tempos)
+                    for t in found:
+                        t['file'] = build_export_name(f"{t['slot']:03d}", t['track'], fixed)
+
+            index = None
+            if self.find_dupes_var.get() and rc_audio.HAVE_NUMPY:
+                index = self.index_pedal(source)
+
             count = 0
-            for root, dirs, files in os.walk(source):
-                for file in files:
-                    if file.lower().endswith('.wav'):
-                        try:
-                            folder_raw = os.path.basename(root)
-                            parts = folder_raw.split('_')
-                            if len(parts) >= 2:
-                                mem_slot = parts[0]
-                                track_num = parts[1]
-                                mem_int = int(mem_slot)
-                                
-                                if mode == "range" and mem_int not in target_slots:
-                                    continue 
-
-                                fname_parts = [f"Memory_{mem_slot}"]
-                                if mem_int in metadata:
-                                    m = metadata[mem_int]
-                                    if m['name']: fname_parts[0] = f"{mem_slot}_{m['name']}"
-                                    if m['bpm']: fname_parts.append(m['bpm'])
-                                    if m['ts']: fname_parts.append(m['ts'].replace('/', '-'))
-                                
-                                new_name = "_".join(fname_parts) + f"_Track_{track_num}.wav"
-                                
-                                self.log(f"[PREVIEW] Found: {new_name}")
-                                count += 1
-                        except Exception: pass
-            
+            backed_up = 0
+            for t in found:
+                note = ""
+                if index:
+                    on_pedal, in_backups = self.pedal_duplicates(index, t['path'], source)
+                    if on_pedal:
+                        note = f" (duplicate of {', '.join(rc_audio.describe_duplicate(d) for d in on_pedal)})"
+                    if in_backups:
+                        backed_up += 1
+
+                if t['path'] in silent:
+                    self.log(f"[PREVIEW] Silent: {t['file']}{note}")
+                else:
+                    self.log(f"[PREVIEW] Found: {t['file']}{note}")
+                count += 1
+
+            if index:
+                self.log(f"{backed_up} of {count} tracks already exist in earlier backups.")
+
+            if silent:
+                self.log(f"Silent tracks will be handled as: {self.silent_mode_var.get()}")
             self.log(f"--- PREVIEW COMPLETE: {count} loops found ---")
 
         except Exception as e:
@@ -504,71 +660,104 @@ class BossRC500App:
         
         if self.backup_mode_var.get() == "range":
             r = self.backup_range_var.get()
-            if not r or not self.parse_range(r):
+            if not r or not parse_range(r):
                 messagebox.showerror("Error", "Please enter a valid range (e.g. 1-10).")
                 return
 
         self.btn_view_report.config(state="disabled")
         self.btn_open_folder.config(state="disabled")
         
+        if self.get_export_format()[0] and not rc_audio.HAVE_NUMPY:
+            messagebox.showerror("Error", "Converting the export format needs numpy.\n\npip install numpy")
+            return
+
         self.is_running = True
         self.progress.start(10)
         threading.Thread(target=self.run_backup, daemon=True).start()
 
     def run_backup(self):
+        trace = rc_trace.tracer
         try:
+            self.start_trace()
             source = self.source_dir.get()
             base_dest = self.dest_dir.get()
             folder_name = f"Boss RC-500 Backup {datetime.now().strftime('%Y-%m-%d')}"
             self.final_dest_dir = os.path.join(base_dest, folder_name)
             
-            mode = self.backup_mode_var.get()
             target_slots = None
-            if mode == "range":
-                target_slots = self.parse_range(self.backup_range_var.get())
+            if self.backup_mode_var.get() == "range":
+                target_slots = parse_range(self.backup_range_var.get())
                 self.log(f"Starting Backup for slots: {target_slots}")
             else:
                 self.log("Starting Backup for ALL slots...")
 
-            if not os.path.exists(self.final_dest_dir): 
-                os.makedirs(self.final_dest_dir)
-            
-            metadata = parse_metadata(source, self.log)
-            
-            count = 0
-            for root, dirs, files in os.walk(source):
-                for file in files:
-                    if file.lower().endswith('.wav'):
-                        try:
-                            folder_raw = os.path.basename(root)
-                            parts = folder_raw.split('_')
-                            if len(parts) >= 2:
-                                mem_slot = parts[0]
-                                track_num = parts[1]
-                                mem_int = int(mem_slot)
-                                
-                                if mode == "range" and mem_int not in target_slots:
-                                    continue 
-
-                                fname_parts = [f"Memory_{mem_slot}"]
-                                if mem_int in metadata:
-                                    m = metadata[mem_int]
-                                    if m['name']: fname_parts[0] = f"{mem_slot}_{m['name']}"
-                                    if m['bpm']: fname_parts.append(m['bpm'])
-                                    if m['ts']: fname_parts.append(m['ts'].replace('/', '-'))
-                                
-                                new_name = "_".join(fname_parts) + f"_Track_{track_num}.wav"
-                                shutil.copy2(os.path.join(root, file), os.path.join(self.final_dest_dir, new_name))
-                                self.log(f"Exported: {new_name}")
-                                count += 1
-                        except Exception: pass
-            
-            if mode == "range" and target_slots:
-                report_metadata = {k: v for k, v in metadata.items() if k in target_slots}
-            else:
-                report_metadata = metadata
+            archive = self.get_archive_format()
+            if self.archive_var.get() == ARCHIVE_STORE:
+                archive = STORE_ARCHIVE
+            export_format, sample_rate = self.get_export_format()
+            post = self.bundle_mode_var.get() != BUNDLE_NONE or self.analyze_var.get() \
+                or self.check_tempo_var.get() or self.find_dupes_var.get()
+            if archive and (export_format or post):
+                self.log(f"Note: {self.archive_var.get()} backups hold the original audio only; format, "
+                         "mixdown, tempo, level and duplicate options need a folder backup.")
+
+            silent_mode = self.silent_mode_var.get()
+            if not rc_audio.HAVE_NUMPY:
+                self.log("Note: numpy is not installed, only empty tracks can be detected.")
+            tuning = dict(rc_tune.DEFAULTS) if archive or export_format else self.transfer_settings(source, base_dest)
+            result = backup_pedal(
+                source, self.final_dest_dir, target_slots, archive, silent_mode == SILENT_SKIP, tuning['jobs'],
+                self.log, tuning, silent_folder=SILENT_FOLDER if silent_mode == SILENT_SEPARATE else None,
+                threshold=self.get_silence_threshold(), export_format=export_format, sample_rate=sample_rate)
+            count = len(result['tracks'])
+
+            if archive == STORE_ARCHIVE:
+                self.final_dest_dir = os.path.join(base_dest, rc_store.STORE_NAME)
+                self.log(f"--- Backup Complete: {count} loops ---")
+                self.root.after(0, lambda: self.btn_open_folder.config(state="normal"))
+                self.root.after(0, lambda: messagebox.showinfo("Success", f"Backed up {count} loops to snapshot:\n{folder_name}"))
+                return
 
-            self.html_report_path = create_reports(report_metadata, self.final_dest_dir, self.log)
+            if archive:
+                self.final_dest_dir = base_dest
+                self.log(f"Archive size: {os.path.getsize(result['dest']) / 1048576:.1f} MB")
+                self.log(f"--- Backup Complete: {count} loops ---")
+                self.root.after(0, lambda: self.btn_open_folder.config(state="normal"))
+                self.root.after(0, lambda: messagebox.showinfo("Success", f"Backed up {count} loops to:\n{result['dest']}"))
+                return
+
+            if post:
+                metadata, tracks, _ = load_manifest(self.final_dest_dir)
+
+                if self.check_tempo_var.get():
+                    trace.phase("tempo")
+                    audible = [dict(t, path=os.path.join(self.final_dest_dir, t['file'])) for t in tracks if not t['silent']]
+                    tempos = check_tempos(audible, metadata, self.log)
+                    for slot, tempo in tempos.items():
+                        if slot in metadata:
+                            metadata[slot] = dict(metadata[slot], tempo_check=tempo)
+                    if self.fix_tempo_var.get():
+                        self.rename_for_tempo(tracks, apply_tempo_suggestions(metadata, tempos))
+
+                bundles = []
+                if self.bundle_mode_var.get() != BUNDLE_NONE:
+                    trace.phase("bundles")
+                    bundles = self.render_bundles(tracks, export_format)
+
+                if self.analyze_var.get():
+                    trace.phase("analysis")
+                    analyze_tracks(tracks, self.final_dest_dir, self.log)
+
+                if self.find_dupes_var.get():
+                    trace.phase("duplicates")
+                    find_backup_duplicates(tracks, self.final_dest_dir, self.get_fingerprint_index(), self.log)
+
+                trace.phase("reports")
+                write_manifest(self.final_dest_dir, metadata, tracks, source, export_format, sample_rate, bundles)
+                create_reports(metadata, self.final_dest_dir, self.log, tracks)
+
+            report = os.path.join(self.final_dest_dir, REPORT_HTML_NAME)
+            self.html_report_path = report if os.path.exists(report) else None
             
             self.log(f"--- Backup Complete: {count} loops ---")
             
@@ -578,6 +767,101 @@ class BossRC500App:
 
         except Exception as e:
             self.log(f"Error: {e}")
+        finally:
+            self.finish_trace("backup")
+            self.is_running = False
+            self.root.after(0, self.progress.stop)
+
+    def rename_for_tempo(self, tracks, fixed_metadata):
+        """Renames exported files whose BPM was corrected by the tempo check."""
+        for t in tracks:
+            folder, old_name = os.path.split(t['file'])
+            new_name = build_export_name(f"{t['slot']:03d}", t['track'], fixed_metadata)
+            if new_name == old_name:
+                continue
+            new_file = f"{folder}/{new_name}" if folder else new_name
+            os.replace(os.path.join(self.final_dest_dir, t['file']), os.path.join(self.final_dest_dir, new_file))
+            self.log(f"Renamed: {old_name} -> {new_name}")
+            t['file'] = new_file
+
+    def render_bundles(self, tracks, export_format):
+        """Writes a mixdown and/or stem file per memory from the exported tracks."""
+        if not rc_audio.HAVE_NUMPY:
+            self.log("Mixdowns skipped: numpy is not installed (pip install numpy).")
+            return []
+
+        mode = self.bundle_mode_var.get()
+        out_dir = os.path.join(self.final_dest_dir, BUNDLE_FOLDER)
+        os.makedirs(out_dir, exist_ok=True)
+
+        by_slot = {}
+        for t in tracks:
+            by_slot.setdefault(t['slot'], []).append(t)
+
+        memories = []
+        for slot in sorted(by_slot):
+            slot_tracks = sorted(by_slot[slot], key=lambda t: int(t['track']) if str(t['track']).isdigit() else 0)
+            base = re.sub(r"_Track_[^_]+\.wav$", "", os.path.basename(slot_tracks[0]['file']), flags=re.IGNORECASE)
+            mix = os.path.join(out_dir, f"{base}_Mix.wav") if mode in (BUNDLE_MIX, BUNDLE_BOTH) else None
+            stems = os.path.join(out_dir, f"{base}_Stems.wav") if mode in (BUNDLE_STEMS, BUNDLE_BOTH) else None
+            paths = [os.path.join(self.final_dest_dir, t['file']) for t in slot_tracks]
+            memories.append((slot, paths, mix, stems))
+
+        self.log(f"Rendering {mode.lower()} for {len(memories)} memories...")
+        # Transcoded tracks are already in the target format; raw copies mix to float
+        bundles = []
+        for (slot, paths, mix, stems), (_, result) in zip(memories, rc_audio.render_memories(memories, export_format or "32-bit float")):
+            if 'error' in result:
+                self.log(f"Mixdown error #{slot:02d}: {result['error']}")
+                continue
+            for path in (mix, stems):
+                if path:
+                    self.log(f"Rendered: {os.path.basename(path)}")
+            if result['partial']:
+                self.log(f"Note #{slot:02d}: looped tracks cut short to fit: {', '.join(result['partial'])}")
+            bundles.append(dict(result, slot=slot,
+                                mix=f"{BUNDLE_FOLDER}/{os.path.basename(mix)}" if mix else None,
+                                stems=f"{BUNDLE_FOLDER}/{os.path.basename(stems)}" if stems else None))
+        return bundles
+
+    def start_analyze_folder(self):
+        if self.is_running: return
+        if not rc_audio.HAVE_NUMPY:
+            messagebox.showerror("Error", "Level analysis needs numpy.\n\npip install numpy")
+            return
+
+        folder = filedialog.askdirectory(initialdir=self.final_dest_dir or self.dest_dir.get())
+        if not folder: return
+
+        self.is_running = True
+        self.progress.start(10)
+        threading.Thread(target=self.run_analyze_folder, args=(folder,), daemon=True).start()
+
+    def run_analyze_folder(self, folder):
+        try:
+            self.log(f"--- ANALYZING: {folder} ---")
+            loaded = load_manifest(folder)
+            if loaded:
+                metadata, tracks, source = loaded
+            else:
+                metadata, tracks, source = {}, tracks_from_folder(folder), ""
+
+            if not tracks:
+                self.log("No exported WAV files found in that folder.")
+                return
+
+            analyze_tracks(tracks, folder, self.log)
+            write_manifest(folder, metadata, tracks, source)
+            report = create_reports(metadata, folder, self.log, tracks)
+            if report:
+                self.html_report_path = report
+                self.final_dest_dir = folder
+                self.root.after(0, lambda: self.btn_view_report.config(state="normal"))
+                self.root.after(0, lambda: self.btn_open_folder.config(state="normal"))
+
+            self.log(f"--- ANALYSIS COMPLETE: {len(tracks)} tracks ---")
+        except Exception as e:
+            self.log(f"Analysis Error: {e}")
         finally:
             self.is_running = False
             self.root.after(0, self.progress.stop)
@@ -590,6 +874,73 @@ class BossRC500App:
         if self.final_dest_dir and os.path.exists(self.final_dest_dir):
             os.startfile(self.final_dest_dir)
 
+    # --- LOOP BROWSER ---
+
+    def on_tab_changed(self, event=None):
+        if self.notebook.select() == str(self.tab_browser) and not self.browser_loaded:
+            self.start_browser_load()
+
+    def start_browser_load(self):
+        self.browser_loaded = True
+        self.browser_status_var.set("Loading...")
+        threading.Thread(target=self.run_browser_load, daemon=True).start()
+
+    def run_browser_load(self):
+        try:
+            rows = rc_browser.build_rows(self.source_dir.get(), self.dest_dir.get(), self.sync_library_var.get(), self.log)
+            self.root.after(0, lambda: self.browser_tree.set_rows(rows))
+        except Exception as e:
+            self.log(f"Could not load the loop browser: {e}")
+            self.root.after(0, lambda: self.browser_status_var.set("Loading failed."))
+
+    def schedule_browser_filter(self):
+        # Wait for a pause in typing so fast typists don't filter on every key
+        if self.browser_filter_job:
+            self.root.after_cancel(self.browser_filter_job)
+        self.browser_filter_job = self.root.after(120, self.apply_browser_filter)
+
+    def apply_browser_filter(self):
+        self.browser_filter_job = None
+        self.browser_tree.set_filter(self.browser_filter_var.get())
+
+    def update_browser_status(self, shown, total, selected):
+        self.browser_status_var.set(f"{shown} of {total} memories shown, {selected} selected")
+
+    def browser_selection(self, pedal):
+        """Selected rows from the pedal (pedal=True) or from backups (pedal=False)."""
+        return [r for r in self.browser_tree.selected_rows() if (r['kind'] == rc_browser.PEDAL) == pedal]
+
+    def browser_backup(self):
+        rows = self.browser_selection(pedal=True)
+        if not rows:
+            messagebox.showerror("Error", "Select one or more Pedal rows to back up.")
+            return
+        self.backup_mode_var.set("range")
+        self.backup_range_var.set(format_range(r['slot'] for r in rows))
+        self.toggle_backup_range_state()
+        self.notebook.select(self.tab_backup)
+        self.log(f"Backup range set from the browser: {self.backup_range_var.get()}")
+
+    def browser_restore(self):
+        rows = self.browser_selection(pedal=False)
+        sources = {r['path'] for r in rows}
+        if len(sources) != 1:
+            messagebox.showerror("Error", "Select rows from one backup, archive or snapshot to restore.")
+            return
+        self.import_source_dir.set(sources.pop())
+        self.import_range_var.set(format_range(r['slot'] for r in rows))
+        self.notebook.select(self.tab_import)
+        self.log(f"Restore set from the browser: slots {self.import_range_var.get()} from {self.import_source_dir.get()}")
+
+    def browser_delete(self):
+        rows = self.browser_selection(pedal=True)
+        if not rows:
+            messagebox.showerror("Error", "Select one or more Pedal rows to delete.")
+            return
+        self.delete_range_var.set(format_range(r['slot'] for r in rows))
+        self.notebook.select(self.tab_delete)
+        self.preview_delete()
+
     # --- IMPORT LOGIC ---
 
     def start_import_thread(self):
@@ -597,7 +948,7 @@ class BossRC500App:
             messagebox.showerror("Error", "Pedal not connected.")
             return
         if not self.import_source_dir.get():
-            messagebox.showerror("Error", "Please select a backup folder.")
+            messagebox.showerror("Error", "Please select a backup folder or archive.")
             return
 
         if not messagebox.askyesno("Confirm Import", "This will overwrite any existing audio in the target memory slots.\n\nContinue?"):
@@ -608,53 +959,24 @@ class BossRC500App:
 
     def run_import(self):
         try:
-            backup_folder = self.import_source_dir.get()
+            self.start_trace()
+            backup_path = self.import_source_dir.get()
             pedal_wave_dir = self.source_dir.get() # ROLAND/WAVE
             
             self.log("--- STARTING IMPORT ---")
-            
-            files = [f for f in os.listdir(backup_folder) if f.lower().endswith('.wav')]
-            if not files:
-                self.log("No WAV files found in backup folder.")
-                return
 
-            count = 0
-            
-            for f in files:
-                # Regex 1: "Memory_01_Name_Track_1.wav"
-                match = re.match(r"Memory_(\d+)_.*Track_(\d+)\.wav", f, re.IGNORECASE)
-                
-                # Regex 2: "098_Memory98_...Track_1.wav" (Number first)
-                if not match:
-                    match = re.match(r"(\d+)_.*Track_(\d+)\.wav", f, re.IGNORECASE)
-                
-                # Regex 3: "Memory_01_Track_1.wav" (Simple)
-                if not match:
-                    match = re.match(r"Memory_(\d+)_Track_(\d+)\.wav", f, re.IGNORECASE)
-
-                if match:
-                    slot_str = match.group(1) 
-                    track_str = match.group(2)
-                    
-                    # Normalize to Boss Format
-                    slot_int = int(slot_str)
-                    boss_folder_name = f"{slot_int:03d}_{track_str}" # "098_1"
-                    boss_file_name = f"{slot_int:03d}_{track_str}.WAV" # "098_1.WAV"
-                    
-                    # Target Paths
-                    target_folder = os.path.join(pedal_wave_dir, boss_folder_name)
-                    target_file = os.path.join(target_folder, boss_file_name)
-                    
-                    if not os.path.exists(target_folder):
-                        os.makedirs(target_folder)
-                        
-                    src_file = os.path.join(backup_folder, f)
-                    shutil.copy2(src_file, target_file)
-                    
-                    self.log(f"Restored: #{slot_int} Trk {track_str}")
-                    count += 1
-                else:
-                    self.log(f"Skipped unknown file format: {f}")
+            only_slots = None
+            if self.import_range_var.get().strip():
+                only_slots = parse_range(self.import_range_var.get())
+                self.log(f"Restoring slots: {only_slots}")
+
+            skip_silent = self.import_skip_silent_var.get()
+            if skip_silent and not rc_audio.HAVE_NUMPY:
+                self.log("Note: numpy is not installed, only empty tracks can be detected.")
+            tuning = self.transfer_settings(backup_path, pedal_wave_dir)
+            result = restore_backup(backup_path, pedal_wave_dir, only_slots, skip_silent, tuning['jobs'],
+                                    self.log, tuning, self.get_silence_threshold())
+            count = len(result['restored'])
 
             self.log(f"--- IMPORT COMPLETE: {count} files restored ---")
             messagebox.showinfo("Import Complete", f"Restored {count} audio files.\n\nRemember to rename them on the pedal!")
@@ -662,6 +984,7 @@ class BossRC500App:
         except Exception as e:
             self.log(f"Import Error: {e}")
         finally:
+            self.finish_trace("import")
             self.is_running = False
 
     # --- DELETE LOGIC ---
@@ -672,29 +995,39 @@ class BossRC500App:
         range_str = self.delete_range_var.get()
         if not range_str: return []
         
-        targets = self.parse_range(range_str)
-        folders_found = []
-        for root, dirs, files in os.walk(source):
-            folder_name = os.path.basename(root)
-            if "_" in folder_name:
-                try:
-                    slot = int(folder_name.split("_")[0])
-                    if slot in targets:
-                        folders_found.append(root)
-                except ValueError: pass
-        return folders_found
+        return find_slot_folders(source, parse_range(range_str))
 
     def preview_delete(self):
+        if self.is_running: return
+        self.is_running = True
+        self.progress.start(10)
+        threading.Thread(target=self.run_preview_delete, daemon=True).start()
+
+    def run_preview_delete(self):
+        try:
+            self.preview_delete_targets()
+        except Exception as e:
+            self.log(f"Error: {e}")
+        finally:
+            self.is_running = False
+            self.root.after(0, self.progress.stop)
+
+    def preview_delete_targets(self):
         targets = self.get_delete_targets()
         source = self.source_dir.get()
         
-        self.log(f"--- PREVIEW DELETE ---")
+        self.log("--- PREVIEW DELETE ---")
         if not targets:
             self.log("No matching loops found for that range.")
             return
 
         self.log("Reading metadata to identify tracks...")
-        metadata = parse_metadata(source, lambda x: None)
+        metadata = self.read_metadata(source)
+
+        index = None
+        if self.find_dupes_var.get() and rc_audio.HAVE_NUMPY:
+            index = self.index_pedal(source)
+        target_set = set(targets)
 
         for folder in targets:
             folder_name = os.path.basename(folder)
@@ -706,40 +1039,126 @@ class BossRC500App:
                 elif slot in metadata:
                     name = "No Name"
                 
-                self.log(f"[FOUND] #{slot} ({name}) -> {folder_name}")
+                note = ""
+                if index:
+                    notes = []
+                    for wav in [f for f in os.listdir(folder) if f.lower().endswith('.wav')]:
+                        on_pedal, in_backups = self.pedal_duplicates(index, os.path.join(folder, wav), source)
+                        # Only count copies that will survive this delete
+                        on_pedal = [d for d in on_pedal if os.path.join(source, os.path.dirname(d['file'])) not in target_set]
+                        if on_pedal:
+                            notes.append(f"duplicate of {rc_audio.describe_duplicate(on_pedal[0])}")
+                        if in_backups:
+                            notes.append(f"backed up in {in_backups[0]['location']}")
+                    if notes:
+                        note = " [" + "; ".join(notes) + "]"
+
+                self.log(f"[FOUND] #{slot} ({name}) -> {folder_name}{note}")
             except:
                 self.log(f"[FOUND] {folder_name}")
         
         self.log(f"Total found: {len(targets)}")
 
     def confirm_delete(self):
-        targets = self.get_delete_targets()
-        if not targets:
-            messagebox.showinfo("Info", "No loops found to delete.")
-            return
+        if self.is_running: return
+        self.start_trace()
+        deleted = False
+        try:
+            with rc_trace.tracer.span("scan", cat="phase"):
+                targets = self.get_delete_targets()
+            if not targets:
+                messagebox.showinfo("Info", "No loops found to delete.")
+                return
 
-        msg = f"You are about to PERMANENTLY DELETE {len(targets)} loops from the pedal.\n\n"
-        msg += "Make sure you have used the Backup tab first!\n\nContinue?"
-        
-        if not messagebox.askyesno("Confirm Delete", msg, icon='warning'):
-            self.log("Delete cancelled.")
-            return
+            msg = f"You are about to PERMANENTLY DELETE {len(targets)} loops from the pedal.\n\n"
+            msg += "Make sure you have used the Backup tab first!\n\nContinue?"
+            
+            if not messagebox.askyesno("Confirm Delete", msg, icon='warning'):
+                self.log("Delete cancelled.")
+                return
 
-        if not messagebox.askyesno("Final Warning", "This cannot be undone. Are you absolutely sure?"):
-            self.log("Delete cancelled.")
-            return
+            if not messagebox.askyesno("Final Warning", "This cannot be undone. Are you absolutely sure?"):
+                self.log("Delete cancelled.")
+                return
 
-        self.log("--- STARTING DELETE ---")
-        for folder in targets:
-            try:
-                shutil.rmtree(folder)
-                self.log(f"Deleted: {os.path.basename(folder)}")
-            except Exception as e:
-                self.log(f"Error deleting {folder}: {e}")
+            self.log("--- STARTING DELETE ---")
+            rc_trace.tracer.phase("delete")
+            delete_folders(targets, self.log)
+            deleted = True
+        finally:
+            if deleted:
+                self.finish_trace("delete")
+            else:
+                self.drop_trace()
         
         self.log("--- DELETE COMPLETE ---")
         messagebox.showinfo("Done", "Deletion complete.")
 
+    # --- SYNC LOGIC ---
+
+    def start_sync_thread(self, apply):
+        if not self.source_dir.get():
+            messagebox.showerror("Error", "Pedal not connected.")
+            return
+        if not self.sync_library_var.get():
+            messagebox.showerror("Error", "Please select a library folder.")
+            return
+        if self.is_running: return
+
+        only_slots = None
+        if self.sync_range_var.get().strip():
+            only_slots = set(parse_range(self.sync_range_var.get()))
+        args = (self.source_dir.get(), self.sync_library_var.get(), self.sync_mode_var.get(),
+                only_slots, self.sync_deletes_var.get(), apply)
+
+        self.is_running = True
+        threading.Thread(target=self.run_sync, args=args, daemon=True).start()
+
+    def run_sync(self, source, library_dir, mode, only_slots, deletes, apply):
+        """Plans the sync on the worker thread; applying is confirmed on the Tk thread first."""
+        try:
+            self.log(f"--- {'SYNC' if apply else 'PREVIEW SYNC'}: {mode} ---")
+            plan = rc_sync.prepare_sync(source, library_dir, mode, only_slots, deletes, self.log)
+        except Exception as e:
+            self.log(f"Sync Error: {e}")
+            self.is_running = False
+            return
+
+        if not apply:
+            self.is_running = False
+        elif not plan['pending']:
+            self.log("--- Already in sync ---")
+            self.is_running = False
+        else:
+            self.root.after(0, self.confirm_sync, plan)
+
+    def confirm_sync(self, plan):
+        if not messagebox.askyesno("Confirm Sync", f"Apply sync ({plan['summary']})?"):
+            self.log("Sync cancelled.")
+            self.is_running = False
+            return
+        pedal_deletes = plan['counts'].get(rc_sync.DELETE_PEDAL, 0)
+        if pedal_deletes:
+            msg = f"This sync will PERMANENTLY DELETE {pedal_deletes} loops from the pedal.\n\n"
+            msg += "Make sure you have used the Backup tab first!\n\nContinue?"
+            if not messagebox.askyesno("Confirm Delete", msg, icon='warning') \
+                    or not messagebox.askyesno("Final Warning", "This cannot be undone. Are you absolutely sure?"):
+                self.log("Sync cancelled.")
+                self.is_running = False
+                return
+        threading.Thread(target=self.apply_sync, args=(plan,), daemon=True).start()
+
+    def apply_sync(self, plan):
+        try:
+            rc_sync.apply_plan(plan, rc_tune.DEFAULTS['jobs'], self.log, self.transfer_settings)
+            count = len(plan['todo'])
+            self.log(f"--- SYNC COMPLETE: {count} actions ---")
+            self.root.after(0, lambda: messagebox.showinfo("Sync Complete", f"Applied {count} sync actions."))
+        except Exception as e:
+            self.log(f"Sync Error: {e}")
+        finally:
+            self.is_running = False
+
 if __name__ == "__main__":
     root = tk.Tk()
     app = BossRC500App(root)
@@ -0,0 +1,361 @@
+"""
+Boss RC-500 Backup Pruning
+--------------------------
+Retention rules for the dated backups that pile up in a backup folder
+(backup folders, archives and dedup store snapshots).
+
+Rules (like most backup tools): keep the newest N backups, plus the newest
+backup of each of the last N days, weeks, months and years. Anything no
+rule keeps expires. A size budget then expires the oldest remaining
+backups until the folder fits. Backup folders and archives form one series
+and the snapshots of a dedup store another; the rules apply to each series
+separately and the newest backup of a series is never pruned.
+
+Freed space is counted by what actually leaves the disk:
+- Files are tracked by inode, so a file hardlinked into several backup
+  folders (rsync --link-dest style) only counts once, and only when the
+  last backup using it goes. Links from outside the backup folder keep
+  the data alive and are never counted as freed.
+- A dedup store snapshot is a small JSON file; its chunks are shared with
+  other snapshots. Deleting a snapshot only frees the chunks no remaining
+  snapshot uses, and those are the only chunks removed. Nothing else in the
+  store is read or scanned, so expiring snapshots stays cheap.
+
+Don't prune while a backup is being written into the same dedup store.
+
+Used by: python BossRC500CLI.py prune FOLDER --daily 7 --weekly 4 --max-size 50G --yes
+
+Copyright (C) 2026 [pmonk.com]
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import os
+import re
+import json
+import shutil
+from datetime import datetime
+
+import BossRC500Core as rc_core
+import BossRC500Archive as rc_archive
+import BossRC500Store as rc_store
+import BossRC500Trace as rc_trace
+
+# Folder names the tools create (GUI / CLI / daemon, and the older Export script)
+DATED_NAME = re.compile(r"^Boss RC-500 (Loop )?Backups? (\d{4}-\d{2}-\d{2})(?: (\d{6}))?")
+
+# (rule, bucket of a datetime); 'last' keeps every backup up to its count
+RULES = (
+    ('last', lambda d: d),
+    ('daily', lambda d: d.date()),
+    ('weekly', lambda d: d.isocalendar()[:2]),
+    ('monthly', lambda d: (d.year, d.month)),
+    ('yearly', lambda d: d.year),
+)
+
+SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+
+def parse_size(text):
+    """'50G', '750M', '1.5T' or plain bytes -> bytes. None if invalid."""
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*", str(text), re.IGNORECASE)
+    if not m:
+        return None
+    return int(float(m.group(1)) * SIZE_UNITS[m.group(2).upper()])
+
+def format_size(nbytes):
+    return f"{nbytes / 1048576:.1f} MB" if nbytes < 1024 ** 3 else f"{nbytes / 1024 ** 3:.2f} GB"
+
+def disk_usage(st):
+    """Bytes a file takes on disk (allocated blocks where the OS reports them)."""
+    blocks = getattr(st, 'st_blocks', None)
+    return blocks * 512 if blocks is not None else st.st_size
+
+# --- DISCOVERY ---
+
+def backup_date(path, manifest):
+    """When a backup was made: its manifest, else its name, else its modification time."""
+    generated = (manifest or {}).get('generated')
+    if generated:
+        try:
+            return datetime.strptime(generated, '%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            pass
+    m = DATED_NAME.match(os.path.basename(path))
+    if m:
+        return datetime.strptime(m.group(2) + (m.group(3) or "000000"), '%Y-%m-%d%H%M%S')
+    return datetime.fromtimestamp(os.path.getmtime(path))
+
+def find_backups(folder, logger_func=None):
+    """
+    Backups directly inside folder, newest first:
+    [{'path', 'kind', 'date', 'chunks' (snapshots only)}].
+
+    Only what the tools created is considered, so nothing else in the folder
+    is ever pruned: folders with a dated backup name (not the sync library or
+    other folders, even with a manifest), archives with a backup index or a
+    dated name, and dedup store snapshots.
+    """
+    found = []
+    for entry in sorted(os.scandir(folder), key=lambda e: e.name):
+        try:
+            if entry.is_dir() and entry.name == rc_store.STORE_NAME:
+                snap_dir = os.path.join(entry.path, "snapshots")
+                if not os.path.isdir(snap_dir):
+                    continue
+                for f in sorted(os.listdir(snap_dir)):
+                    if f.endswith(rc_store.SNAPSHOT_EXT):
+                        path = os.path.join(snap_dir, f)
+                        snapshot = rc_store.load_snapshot(path)
+                        chunks = {d for record in snapshot.get('files', {}).values() for d in record['chunks']}
+                        found.append({'path': path, 'kind': "snapshot", 'date': backup_date(path, snapshot),
+                                      'store': entry.path, 'chunks': chunks})
+            elif entry.is_dir():
+                if not DATED_NAME.match(entry.name):
+                    continue
+                manifest = None
+                if os.path.exists(os.path.join(entry.path, rc_core.MANIFEST_NAME)):
+                    with open(os.path.join(entry.path, rc_core.MANIFEST_NAME), "r", encoding="utf-8") as f:
+                        manifest = json.load(f)
+                found.append({'path': entry.path, 'kind': "folder", 'date': backup_date(entry.path, manifest)})
+            elif rc_archive.archive_format(entry.path):
+                index = rc_archive.read_index(entry.path)
+                if index is None and not DATED_NAME.match(entry.name):
+                    continue
+                found.append({'path': entry.path, 'kind': "archive", 'date': backup_date(entry.path, index)})
+        except Exception as e:
+            if logger_func: logger_func(f"Skipped {entry.name}: {e}")
+    found.sort(key=lambda b: b['date'], reverse=True)
+    return found
+
+# --- POLICY ---
+
+def series(backup):
+    """Snapshots are a series per store; folders and archives are one series."""
+    return backup.get('store', "")
+
+def apply_policy(backups, last=0, daily=0, weekly=0, monthly=0, yearly=0):
+    """
+    Marks each backup (newest first) with b['keep'] = list of rules keeping
+    it. Each rule keeps the newest backup of its first N buckets, per series.
+    """
+    counts = {'last': last, 'daily': daily, 'weekly': weekly, 'monthly': monthly, 'yearly': yearly}
+    groups = {}
+    for b in backups:
+        b['keep'] = []
+        groups.setdefault(series(b), []).append(b)
+    for group in groups.values():
+        for rule, bucket in RULES:
+            seen = set()
+            for b in group:
+                if len(seen) >= counts[rule]:
+                    break
+                key = bucket(b['date'])
+                if key not in seen:
+                    seen.add(key)
+                    b['keep'].append(rule)
+        group[0]['keep'] = group[0]['keep'] or ['newest']
+    return backups
+
+# --- SPACE ---
+
+class SpaceMap:
+    """
+    The disk objects (file inodes, store chunks) behind each backup, with
+    reference counts, so removing backups tells how many bytes really go.
+    """
+
+    def __init__(self):
+        self.size = {}       # object -> bytes on disk
+        self.refs = {}       # object -> references from backups still counted
+        self.pinned = set()  # objects also linked from outside the backups
+        self.links = {}      # file object -> links seen inside the backups
+        self.nlink = {}      # file object -> st_nlink
+        self.owned = {}      # backup path -> [object, ...]
+        self.chunk_files = {}  # chunk object -> path
+
+    def add_file(self, owner, path):
+        st = os.stat(path)
+        key = ("file", st.st_dev, st.st_ino)
+        self.size[key] = disk_usage(st)
+        self.refs[key] = self.refs.get(key, 0) + 1
+        self.links[key] = self.links.get(key, 0) + 1
+        self.nlink[key] = st.st_nlink
+        self.owned.setdefault(owner, []).append(key)
+
+    def add_backup(self, backup):
+        path = backup['path']
+        self.owned.setdefault(path, [])
+        if backup['kind'] == "folder":
+            for root, dirs, files in os.walk(path):
+                for f in files:
+                    self.add_file(path, os.path.join(root, f))
+        else:
+            self.add_file(path, path)
+        if backup['kind'] == "snapshot":
+            store = backup['store']
+            for digest in backup['chunks']:
+                key = ("chunk", store, digest)
+                if key not in self.size:
+                    chunk = os.path.join(store, "chunks", digest[:2], digest)
+                    try:
+                        st = os.stat(chunk)
+                    except OSError:
+                        continue
+                    self.size[key] = disk_usage(st)
+                    self.chunk_files[key] = chunk
+                    if st.st_nlink > 1:
+                        self.pinned.add(key)
+                self.refs[key] = self.refs.get(key, 0) + 1
+                self.owned[path].append(key)
+
+    def finish(self):
+        """Pins files whose link count shows links outside the backups."""
+        for key, seen in self.links.items():
+            if self.nlink[key] > seen:
+                self.pinned.add(key)
+
+    def used(self):
+        return sum(self.size[k] for k, n in self.refs.items() if n > 0 and k in self.size)
+
+    def remove(self, path):
+        """Drops a backup's references. Returns (freed bytes, chunk objects freed)."""
+        freed, chunks = 0, []
+        for key in self.owned.get(path, []):
+            self.refs[key] -= 1
+            if self.refs[key] == 0 and key in self.size:
+                if key not in self.pinned:
+                    freed += self.size[key]
+                if key[0] == "chunk":
+                    chunks.append(key)
+        return freed, chunks
+
+# --- PRUNE ---
+
+def plan_prune(folder, last=1, daily=0, weekly=0, monthly=0, yearly=0, max_bytes=None, logger_func=None):
+    """
+    Works out what to prune without deleting anything.
+    Returns {'backups', 'expired', 'kept', 'used', 'freed', 'chunks', 'space'}.
+    """
+    log = logger_func or (lambda m: None)
+    with rc_trace.tracer.span("scan backups", cat="prune"):
+        backups = apply_policy(find_backups(folder, log), last, daily, weekly, monthly, yearly)
+        space = SpaceMap()
+        for b in backups:
+            space.add_backup(b)
+        space.finish()
+    used = space.used()
+
+    expired, freed, chunks = [], 0, []
+    for b in backups:
+        if not b['keep']:
+            b['reason'] = "no rule keeps it"
+            expired.append(b)
+            f, c = space.remove(b['path'])
+            b['freed'] = f
+            freed += f
+            chunks += c
+
+    kept = [b for b in backups if b['keep']]
+    if max_bytes is not None:
+        # Oldest first, never the newest backup of a series
+        newest = {}
+        for b in backups:
+            newest.setdefault(series(b), b['path'])
+        candidates = [b for b in kept if newest[series(b)] != b['path']]
+        while candidates and space.used() > max_bytes:
+            b = candidates.pop()
+            kept.remove(b)
+            b['keep'] = []
+            b['reason'] = f"over the {format_size(max_bytes)} budget"
+            f, c = space.remove(b['path'])
+            b['freed'] = f
+            freed += f
+            chunks += c
+            expired.append(b)
+
+    return {'backups': backups, 'expired': expired, 'kept': kept, 'used': used,
+            'freed': freed, 'chunks': chunks, 'space': space}
+
+def delete_chunks(plan, log):
+    """Removes the store chunks no remaining snapshot uses. Returns the number removed."""
+    space = plan['space']
+    # A snapshot written since the scan may reuse a chunk: keep those
+    expired = {b['path'] for b in plan['expired']}
+    known = {b['path'] for b in plan['backups']}
+    in_use = set()
+    for store in {key[1] for key in plan['chunks']}:
+        snap_dir = os.path.join(store, "snapshots")
+        for f in os.listdir(snap_dir):
+            path = os.path.join(snap_dir, f)
+            if f.endswith(rc_store.SNAPSHOT_EXT) and path not in known and path not in expired:
+                snapshot = rc_store.load_snapshot(path)
+                in_use |= {(store, d) for record in snapshot.get('files', {}).values() for d in record['chunks']}
+    removed = 0
+    for key in plan['chunks']:
+        if (key[1], key[2]) in in_use:
+            continue
+        try:
+            os.remove(space.chunk_files[key])
+            removed += 1
+        except OSError as e:
+            log(f"Error removing chunk {key[2][:12]}: {e}")
+    return removed
+
+def prune(folder, last=1, daily=0, weekly=0, monthly=0, yearly=0, max_bytes=None, dry_run=False, logger_func=None):
+    """
+    Applies the retention rules to the backups in folder.
+    Returns {'kept', 'expired', 'deleted', 'errors', 'used', 'freed', 'chunks'}.
+    """
+    log = logger_func or (lambda m: None)
+    trace = rc_trace.tracer
+    trace.phase("plan")
+    plan = plan_prune(folder, last, daily, weekly, monthly, yearly, max_bytes, log)
+
+    for b in plan['backups']:
+        label = f"{b['date']:%Y-%m-%d %H:%M}  {os.path.basename(b['path'])}"
+        if b['keep']:
+            log(f"[KEEP] {label} ({', '.join(b['keep'])})")
+        else:
+            log(f"[{'WOULD PRUNE' if dry_run else 'PRUNE'}] {label} ({b['reason']}, frees {format_size(b['freed'])})")
+
+    result = {
+        'kept': [b['path'] for b in plan['kept']],
+        'expired': [{'path': b['path'], 'kind': b['kind'], 'date': f"{b['date']:%Y-%m-%d %H:%M:%S}",
+                     'reason': b['reason'], 'freed': b['freed']} for b in plan['expired']],
+        'deleted': [], 'errors': [], 'used': plan['used'], 'freed': plan['freed'], 'chunks': len(plan['chunks']),
+    }
+    if dry_run or not plan['expired']:
+        trace.phase(None)
+        log(f"{len(plan['expired'])} of {len(plan['backups'])} backups would be pruned, "
+            f"freeing {format_size(plan['freed'])} of {format_size(plan['used'])}")
+        return result
+
+    trace.phase("delete")
+    # Snapshot files go first so a half-finished prune never leaves a snapshot without its chunks
+    for b in sorted(plan['expired'], key=lambda b: b['kind'] != "snapshot"):
+        try:
+            with trace.span("delete backup", cat="prune", nbytes=b['freed'], file=os.path.basename(b['path'])):
+                if b['kind'] == "folder":
+                    shutil.rmtree(b['path'])
+                else:
+                    os.remove(b['path'])
+            result['deleted'].append(b['path'])
+        except OSError as e:
+            log(f"Error deleting {b['path']}: {e}")
+            result['errors'].append(b['path'])
+    if plan['chunks'] and not any(b['kind'] == "snapshot" for b in plan['expired'] if b['path'] in result['errors']):
+        with trace.span("delete chunks", cat="prune"):
+            result['chunks'] = delete_chunks(plan, log)
+    else:
+        result['chunks'] = 0
+    if result['errors']:
+        result['freed'] = sum(b['freed'] for b in plan['expired'] if b['path'] in result['deleted'])
+    trace.phase(None)
+
+    log(f"Pruned {len(result['deleted'])} of {len(plan['backups'])} backups, "
+        f"freed {format_size(result['freed'])} ({result['chunks']} store chunks)")
+    return result
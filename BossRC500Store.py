@@ -0,0 +1,215 @@
+"""
+Boss RC-500 Dedup Store
+-----------------------
+A backup store for overdub-heavy libraries. Each WAV is split into
+content-defined chunks with a rolling hash, so a loop that was re-saved with
+one new overdub section shares every unchanged chunk with the old version.
+Unique chunks are stored once, zlib-compressed; each snapshot is a small JSON
+file listing the chunks of every track.
+
+Layout:
+    RC500_Store/chunks/ab/abcdef...   compressed chunk data
+    RC500_Store/snapshots/<name>.json manifest + chunk list per file
+
+Chunk boundaries use a Gear-style rolling hash over the last few bytes,
+computed for a whole buffer at once with numpy when it is installed (plain
+Python otherwise, which is much slower but gives identical chunks).
+
+Copyright (C) 2026 [pmonk.com]
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import os
+import json
+import zlib
+import random
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+STORE_NAME = "RC500_Store"
+SNAPSHOT_EXT = ".json"
+
+# A boundary is placed where the low CHUNK_BITS bits of the rolling hash are
+# zero: ~32 KB average chunks, clamped to [CHUNK_MIN, CHUNK_MAX].
+CHUNK_BITS = 15
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+CHUNK_MIN = 8 * 1024
+CHUNK_MAX = 256 * 1024
+
+READ_BUFFER = 4 * 1024 * 1024
+COMPRESS_LEVEL = 6
+
+# Fixed table so chunk boundaries are identical across runs and machines.
+_rng = random.Random(0x52433530)
+GEAR = [_rng.getrandbits(32) for _ in range(256)]
+GEAR_NP = np.array(GEAR, dtype=np.uint32) if np is not None else None
+
+
+def rolling_candidates(data):
+    """
+    Positions (end offsets) in data where the rolling hash marks a boundary.
+
+    The low CHUNK_BITS bits of a Gear hash only depend on the last CHUNK_BITS
+    bytes, so they can be computed for every position with CHUNK_BITS shifted
+    vector adds instead of a per-byte loop.
+    """
+    n = len(data)
+    if np is not None:
+        b = GEAR_NP[np.frombuffer(data, dtype=np.uint8)]
+        h = b.copy()
+        for k in range(1, CHUNK_BITS):
+            h[k:] += b[:-k] << np.uint32(k)
+        return (np.nonzero((h & CHUNK_MASK) == 0)[0] + 1).tolist()
+
+    hits = []
+    h = 0
+    for i in range(n):
+        h = ((h << 1) + GEAR[data[i]]) & 0xFFFFFFFF
+        if h & CHUNK_MASK == 0:
+            hits.append(i + 1)
+    return hits
+
+def chunk_boundaries(data, final):
+    """
+    Splits data into chunk lengths honouring CHUNK_MIN/CHUNK_MAX.
+    Unless final is set, the bytes after the last boundary are left over
+    for the next buffer.
+    """
+    lengths = []
+    start = 0
+    for pos in rolling_candidates(data):
+        while pos - start > CHUNK_MAX:
+            lengths.append(CHUNK_MAX)
+            start += CHUNK_MAX
+        if pos - start >= CHUNK_MIN:
+            lengths.append(pos - start)
+            start = pos
+    while len(data) - start > CHUNK_MAX:
+        lengths.append(CHUNK_MAX)
+        start += CHUNK_MAX
+    if final and start < len(data):
+        lengths.append(len(data) - start)
+    return lengths
+
+def iter_chunks(path):
+    """Yields the content-defined chunks of a file, streaming it in READ_BUFFER pieces."""
+    pending = b""
+    with open(path, "rb") as f:
+        while True:
+            buf = f.read(READ_BUFFER)
+            final = not buf
+            data = pending + buf
+            if not data:
+                return
+            pos = 0
+            for length in chunk_boundaries(data, final):
+                yield data[pos:pos + length]
+                pos += length
+            pending = data[pos:]
+            if final:
+                return
+
+class ChunkStore:
+    """Content-addressed chunk storage plus named snapshots."""
+
+    def __init__(self, root):
+        self.root = root
+        self.chunk_dir = os.path.join(root, "chunks")
+        self.snapshot_dir = os.path.join(root, "snapshots")
+        os.makedirs(self.chunk_dir, exist_ok=True)
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+
+    def chunk_path(self, digest):
+        return os.path.join(self.chunk_dir, digest[:2], digest)
+
+    def add_file(self, path):
+        """
+        Stores a file's chunks. Returns (record, new chunk count, new stored bytes),
+        where record = {'size', 'sha256', 'chunks': [digest, ...]}.
+        """
+        digests = []
+        whole = hashlib.sha256()
+        size = 0
+        new_chunks = 0
+        new_bytes = 0
+        for chunk in iter_chunks(path):
+            whole.update(chunk)
+            size += len(chunk)
+            digest = hashlib.sha256(chunk).hexdigest()
+            digests.append(digest)
+            target = self.chunk_path(digest)
+            if not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                packed = zlib.compress(chunk, COMPRESS_LEVEL)
+                tmp = target + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.write(packed)
+                os.replace(tmp, target)
+                new_chunks += 1
+                new_bytes += len(packed)
+        return {'size': size, 'sha256': whole.hexdigest(), 'chunks': digests}, new_chunks, new_bytes
+
+    def read_chunk(self, digest):
+        with open(self.chunk_path(digest), "rb") as f:
+            return zlib.decompress(f.read())
+
+    def restore_file(self, record, dest, workers=4):
+        """
+        Reassembles a file from its chunk list. Chunks are read and
+        decompressed on a small thread pool (zlib releases the GIL) and
+        written in order.
+        """
+        whole = hashlib.sha256()
+        with open(dest, "wb") as out, ThreadPoolExecutor(max_workers=workers) as pool:
+            for data in pool.map(self.read_chunk, record['chunks']):
+                whole.update(data)
+                out.write(data)
+        if whole.hexdigest() != record['sha256']:
+            raise IOError(f"Checksum mismatch restoring {os.path.basename(dest)}")
+
+    # --- Snapshots ---
+
+    def snapshot_path(self, name):
+        return os.path.join(self.snapshot_dir, name + SNAPSHOT_EXT)
+
+    def write_snapshot(self, name, manifest, files):
+        """Saves a snapshot: the backup manifest plus {file: record}."""
+        data = dict(manifest, files=files)
+        tmp = self.snapshot_path(name) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.snapshot_path(name))
+        return self.snapshot_path(name)
+
+    def list_snapshots(self):
+        return sorted(f[:-len(SNAPSHOT_EXT)] for f in os.listdir(self.snapshot_dir) if f.endswith(SNAPSHOT_EXT))
+
+    def stored_bytes(self):
+        total = 0
+        for root, dirs, files in os.walk(self.chunk_dir):
+            for f in files:
+                total += os.path.getsize(os.path.join(root, f))
+        return total
+
+def load_snapshot(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def is_snapshot(path):
+    """True if path is a snapshot file inside a dedup store."""
+    parent = os.path.dirname(os.path.abspath(path))
+    return (path.lower().endswith(SNAPSHOT_EXT) and os.path.basename(parent) == "snapshots"
+            and os.path.isdir(os.path.join(os.path.dirname(parent), "chunks")))
+
+def store_for_snapshot(path):
+    """The ChunkStore a snapshot file belongs to."""
+    return ChunkStore(os.path.dirname(os.path.dirname(os.path.abspath(path))))
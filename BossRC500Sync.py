@@ -0,0 +1,400 @@
+"""
+Boss RC-500 Library Sync
+------------------------
+Keeps the pedal and a library folder of exported WAVs in step.
+
+Tracks are matched by (memory slot, track number). Sizes are compared first
+and SHA-256 digests only when the sizes agree; digests are cached in
+RC500_Sync.json in the library folder (keyed by size + modification time),
+so re-syncing after a small change only reads the tracks that changed.
+
+Modes:
+- Pedal -> Library: the library mirrors the pedal (backups and renames).
+- Library -> Pedal: the pedal mirrors the library (restores, audio only).
+- Both ways: whichever side changed since the last sync wins; tracks changed
+  on both sides are reported as conflicts and left alone.
+
+Deleting tracks that are missing on the other side is optional.
+
+prepare_sync() plans and apply_plan() carries the plan out, so a front end
+can ask before anything changes; run_sync() does both for scripts (the CLI's
+sync command and the daemon's /sync job).
+
+Copyright (C) 2026 [pmonk.com]
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import os
+import json
+import hashlib
+
+import BossRC500Core as rc_core
+
+SYNC_STATE_NAME = "RC500_Sync.json"
+
+TO_LIBRARY = "Pedal -> Library"
+TO_PEDAL = "Library -> Pedal"
+TWO_WAY = "Both ways"
+SYNC_MODES = (TO_LIBRARY, TO_PEDAL, TWO_WAY)
+# Names for the command line and the daemon API
+MODE_NAMES = {"to-library": TO_LIBRARY, "to-pedal": TO_PEDAL, "both": TWO_WAY}
+
+# Action types
+BACKUP = "backup"
+RESTORE = "restore"
+RENAME = "rename"
+DELETE_PEDAL = "delete-pedal"
+DELETE_LIBRARY = "delete-library"
+CONFLICT = "conflict"
+
+HASH_BUFFER = 1024 * 1024
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BUFFER), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def track_key(slot, track):
+    return f"{int(slot):03d}_{track}"
+
+class SyncState:
+    """
+    Digest cache and last-sync record, stored in the library folder.
+
+    Files are cached under a root name plus relative path (e.g.
+    'pedal:001_1/001_1.WAV') so a pedal mounted on a different drive
+    letter still hits the cache.
+    """
+
+    def __init__(self, library_dir, roots):
+        self.path = os.path.join(library_dir, SYNC_STATE_NAME)
+        self.roots = roots
+        self.hashes = {}
+        self.synced = {}
+        self.hashed = 0
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.hashes = data.get('hashes', {})
+                self.synced = data.get('synced', {})
+            except (OSError, ValueError):
+                pass
+
+    def cache_key(self, path):
+        full = os.path.abspath(path)
+        for name, root in self.roots.items():
+            try:
+                rel = os.path.relpath(full, os.path.abspath(root))
+            except ValueError:  # different drive (Windows)
+                continue
+            if not rel.startswith(".."):
+                return f"{name}:{rel.replace(os.sep, '/')}"
+        return full
+
+    def digest(self, path):
+        st = os.stat(path)
+        key = self.cache_key(path)
+        cached = self.hashes.get(key)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        digest = file_digest(path)
+        self.hashes[key] = [st.st_size, st.st_mtime_ns, digest]
+        self.hashed += 1
+        return digest
+
+    def same(self, a, b):
+        return os.path.getsize(a) == os.path.getsize(b) and self.digest(a) == self.digest(b)
+
+    def record(self, pedal, library):
+        """Remembers every track that is identical on both sides after a sync."""
+        for key in set(pedal) | set(library):
+            name = track_key(*key)
+            p, l = pedal.get(key), library.get(key)
+            if p and l and os.path.exists(p) and os.path.exists(l) and self.same(p, l):
+                self.synced[name] = self.digest(p)
+            else:
+                self.synced.pop(name, None)
+
+    def save(self):
+        # Drop cache entries for files that no longer exist
+        live = {}
+        for key, value in self.hashes.items():
+            name, _, rel = key.partition(":")
+            root = self.roots.get(name)
+            if root and os.path.exists(os.path.join(root, rel)):
+                live[key] = value
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({'hashes': live, 'synced': self.synced}, f)
+        os.replace(tmp, self.path)
+
+def plan_sync(pedal, library, names, library_dir, mode, state, deletes=False):
+    """
+    Works out the minimal set of actions to bring both sides in step.
+
+    pedal:   {(slot, track): WAV path on the pedal}
+    library: {(slot, track): WAV path in the library}
+    names:   {(slot, track): export filename for the pedal's current metadata}
+
+    Returns a list of {'action', 'slot', 'track', 'src', 'dst'} dicts;
+    BACKUP may also carry 'replace' (an old library file to remove).
+    """
+    actions = []
+
+    def add(action, key, src=None, dst=None, **extra):
+        actions.append(dict(action=action, slot=key[0], track=key[1], src=src, dst=dst, **extra))
+
+    def backup(key):
+        dst = os.path.join(library_dir, names[key])
+        old = library.get(key)
+        if old and os.path.basename(old) != names[key]:
+            add(BACKUP, key, pedal[key], dst, replace=old)
+        else:
+            add(BACKUP, key, pedal[key], dst)
+
+    def changed(path, key):
+        return state.digest(path) != state.synced.get(track_key(*key))
+
+    for key in sorted(set(pedal) | set(library), key=lambda k: (k[0], str(k[1]))):
+        p, l = pedal.get(key), library.get(key)
+
+        if p and l:
+            if state.same(p, l):
+                if mode != TO_PEDAL and os.path.basename(l) != names[key]:
+                    add(RENAME, key, l, os.path.join(library_dir, names[key]))
+                continue
+            if mode == TO_LIBRARY:
+                backup(key)
+            elif mode == TO_PEDAL:
+                add(RESTORE, key, l, p)
+            else:
+                p_changed, l_changed = changed(p, key), changed(l, key)
+                if p_changed and not l_changed:
+                    backup(key)
+                elif l_changed and not p_changed:
+                    add(RESTORE, key, l, p)
+                else:
+                    add(CONFLICT, key, p, l)
+
+        elif p:
+            if mode == TO_LIBRARY:
+                backup(key)
+            elif mode == TWO_WAY and (changed(p, key) or not deletes):
+                backup(key)
+            elif deletes:
+                add(DELETE_PEDAL, key, p)
+
+        else:
+            if mode == TO_PEDAL:
+                add(RESTORE, key, l, None)
+            elif mode == TWO_WAY and (changed(l, key) or not deletes):
+                add(RESTORE, key, l, None)
+            elif deletes:
+                add(DELETE_LIBRARY, key, l)
+
+    return actions
+
+def describe_action(action):
+    label = f"#{action['slot']} Trk {action['track']}"
+    kind = action['action']
+    if kind == BACKUP:
+        return f"[BACKUP] {label} -> {os.path.basename(action['dst'])}"
+    if kind == RESTORE:
+        return f"[RESTORE] {label} <- {os.path.basename(action['src'])}"
+    if kind == RENAME:
+        return f"[RENAME] {os.path.basename(action['src'])} -> {os.path.basename(action['dst'])}"
+    if kind == DELETE_PEDAL:
+        return f"[DELETE PEDAL] {label}"
+    if kind == DELETE_LIBRARY:
+        return f"[DELETE LIBRARY] {os.path.basename(action['src'])}"
+    return f"[CONFLICT] {label} changed on both sides since the last sync; skipped"
+
+def summarize(actions):
+    counts = {}
+    for a in actions:
+        counts[a['action']] = counts.get(a['action'], 0) + 1
+    return counts
+
+def diff_memories(old, new, slots=None):
+    """Lists MEMORY1.RC0 record changes (name / BPM / time signature) between two metadata dicts."""
+    changes = []
+    for slot in sorted(set(old) | set(new)):
+        if slots is not None and slot not in slots:
+            continue
+        a, b = old.get(slot), new.get(slot)
+        if a is None or b is None:
+            continue
+        for field in ('name', 'bpm', 'ts'):
+            if a.get(field) != b.get(field):
+                changes.append(f"[MEMORY] #{slot} {field}: '{a.get(field)}' -> '{b.get(field)}'")
+    return changes
+
+# --- RUNNING A SYNC ---
+
+def _quiet(message):
+    pass
+
+def scan_sides(source, library_dir, only_slots=None, logger_func=None):
+    """Returns (metadata, pedal {key: path}, export names {key: file}, library {key: path})."""
+    metadata = rc_core.parse_metadata(source, logger_func or _quiet)
+    pedal_tracks = rc_core.scan_wave_tracks(source, metadata, only_slots)
+    pedal = {(t['slot'], t['track']): t['path'] for t in pedal_tracks}
+    names = {(t['slot'], t['track']): t['file'] for t in pedal_tracks}
+    library = {(t['slot'], t['track']): os.path.join(library_dir, t['file'])
+               for t in rc_core.tracks_from_folder(library_dir)
+               if only_slots is None or t['slot'] in only_slots}
+    return metadata, pedal, names, library
+
+def prepare_sync(source, library_dir, mode, only_slots=None, deletes=False, logger_func=None):
+    """
+    Scans both sides and logs the plan; nothing is copied or deleted yet.
+
+    Returns a plan for apply_plan: 'actions' (from plan_sync), 'todo' (the
+    actions that are not conflicts), 'counts' and 'summary', 'memory_changes',
+    and 'pending', which is False when there is nothing to apply.
+    """
+    log = logger_func or _quiet
+    os.makedirs(library_dir, exist_ok=True)
+    metadata, pedal, names, library = scan_sides(source, library_dir, only_slots, log)
+    log(f"Pedal: {len(pedal)} tracks, Library: {len(library)} tracks")
+
+    state = SyncState(library_dir, {'pedal': source, 'library': library_dir})
+    actions = plan_sync(pedal, library, names, library_dir, mode, state, deletes)
+    log(f"Checksummed {state.hashed} changed files (others matched the cache).")
+    state.save()
+
+    manifest = rc_core.load_manifest(library_dir)
+    library_metadata = manifest[0] if manifest else {}
+    memory_changes = diff_memories(library_metadata, metadata, only_slots)
+    for line in memory_changes:
+        log(line)
+    for a in actions:
+        log(describe_action(a))
+
+    counts = summarize(actions)
+    summary = ", ".join(f"{n} {kind}" for kind, n in sorted(counts.items())) or "nothing to do"
+    log(f"Plan: {summary}")
+
+    todo = [a for a in actions if a['action'] != CONFLICT]
+    return {'source': source, 'library_dir': library_dir, 'mode': mode, 'only_slots': only_slots,
+            'state': state, 'library_metadata': library_metadata, 'memory_changes': memory_changes,
+            'actions': actions, 'todo': todo, 'counts': counts, 'summary': summary,
+            'pending': bool(todo or (memory_changes and mode != TO_PEDAL))}
+
+def apply_actions(actions, source, library_dir, jobs=1, logger_func=None, tuning=None):
+    """
+    Carries out planned sync actions. tuning, if given, is called with
+    (source folder, destination folder) and returns that direction's copy
+    settings (BossRC500Tune). Returns (library filenames written, errors).
+    """
+    log = logger_func or _quiet
+    by_kind = {}
+    for a in actions:
+        by_kind.setdefault(a['action'], []).append(a)
+    errors = []
+
+    def failed(a, e):
+        log(f"Error: {describe_action(a)}: {e}")
+        errors.append({'file': os.path.basename(a['src']), 'action': a['action'], 'error': str(e)})
+
+    for a in by_kind.get(RENAME, []):
+        try:
+            os.replace(a['src'], a['dst'])
+            log(f"Done: {describe_action(a)}")
+        except Exception as e:
+            failed(a, e)
+
+    touched = set()
+    backups = by_kind.get(BACKUP, [])
+    restores = [dict(a, dst=a['dst'] or rc_core.pedal_track_path(source, a['slot'], a['track']))
+                for a in by_kind.get(RESTORE, [])]
+    for group, src_dir, dst_dir in ((backups, source, library_dir), (restores, library_dir, source)):
+        if not group:
+            continue
+        for a in group:
+            os.makedirs(os.path.dirname(a['dst']), exist_ok=True)
+        settings = (tuning(src_dir, dst_dir) if tuning else None) or {'jobs': jobs}
+        copies = rc_core.copy_files([(a['src'], a['dst']) for a in group], settings['jobs'], span="sync file",
+                                    buffer=settings.get('buffer'), order=settings.get('order'))
+        for a, (_, _, error) in zip(group, copies):
+            try:
+                if error:
+                    raise error
+                if a.get('replace'):
+                    os.remove(a['replace'])
+                if a['action'] == BACKUP:
+                    touched.add(os.path.basename(a['dst']))
+                log(f"Done: {describe_action(a)}")
+            except Exception as e:
+                failed(a, e)
+
+    pedal_deletes = by_kind.get(DELETE_PEDAL, [])
+    if pedal_deletes:
+        _, delete_errors = rc_core.delete_folders([os.path.dirname(a['src']) for a in pedal_deletes], log)
+        errors += delete_errors
+    for a in by_kind.get(DELETE_LIBRARY, []):
+        try:
+            os.remove(a['src'])
+            log(f"Done: {describe_action(a)}")
+        except Exception as e:
+            failed(a, e)
+    return touched, errors
+
+def update_library_manifest(library_dir, old_metadata, metadata, touched, source, logger_func=None):
+    """Rewrites the library manifest, keeping analysis results for files that were not replaced."""
+    manifest = rc_core.load_manifest(library_dir)
+    old_tracks = {t['file']: t for t in manifest[1]} if manifest else {}
+    merged = dict(old_metadata)
+    merged.update(metadata)
+    tracks = []
+    for t in rc_core.tracks_from_folder(library_dir):
+        old = old_tracks.get(t['file'])
+        tracks.append(old if old and t['file'] not in touched and old.get('size') == t['size'] else t)
+    rc_core.write_manifest(library_dir, merged, tracks, source)
+    rc_core.create_reports(merged, library_dir, logger_func or _quiet, tracks)
+
+def apply_plan(plan, jobs=1, logger_func=None, tuning=None):
+    """
+    Applies a plan from prepare_sync, then records the synced state and
+    (unless the pedal is the target) refreshes the library manifest.
+    Returns the errors.
+    """
+    log = logger_func or _quiet
+    source, library_dir, state = plan['source'], plan['library_dir'], plan['state']
+    touched, errors = apply_actions(plan['todo'], source, library_dir, jobs, log, tuning)
+
+    metadata, pedal, _, library = scan_sides(source, library_dir, plan['only_slots'], log)
+    state.record(pedal, library)
+    state.save()
+    if plan['mode'] != TO_PEDAL:
+        update_library_manifest(library_dir, plan['library_metadata'], metadata, touched, source, log)
+    return errors
+
+def run_sync(source, library_dir, mode, only_slots=None, deletes=False, apply=False, jobs=1,
+             logger_func=None, tuning=None, confirm=None):
+    """
+    Plans a sync and, with apply, carries it out. confirm, if given, is
+    called with the plan before anything changes and can return False to
+    stop. Returns {'pedal', 'library', 'mode', 'actions', 'counts',
+    'memory_changes', 'pending', 'applied', 'errors'}.
+    """
+    log = logger_func or _quiet
+    plan = prepare_sync(source, library_dir, mode, only_slots, deletes, log)
+    applied, errors = False, []
+    if apply and plan['pending']:
+        if confirm and not confirm(plan):
+            log("Sync cancelled.")
+        else:
+            errors = apply_plan(plan, jobs, log, tuning)
+            applied = True
+    return {'pedal': source, 'library': library_dir, 'mode': mode, 'actions': plan['actions'],
+            'counts': plan['counts'], 'memory_changes': plan['memory_changes'],
+            'pending': plan['pending'], 'applied': applied, 'errors': errors}
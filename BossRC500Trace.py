@@ -0,0 +1,176 @@
+"""
+Boss RC-500 Timing Traces
+-------------------------
+Lightweight spans around the phases of an operation (detect, metadata,
+scan, copy, reports, ...) and around each file transfer. At the end of an
+operation the spans are written as a Chrome trace (open it in
+chrome://tracing or https://ui.perfetto.dev) and summarised in the log.
+
+Tracing is off unless enabled (GUI checkbox, --trace, or the RC500_TRACE
+environment variable). When off, span() returns a shared no-op object and
+phase() returns immediately, so the instrumented code runs as before.
+
+RC500_TRACE=1 turns tracing on; if it names a folder, traces are saved there.
+
+Copyright (C) 2026 [pmonk.com]
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import os
+import json
+import time
+import threading
+from datetime import datetime
+
+TRACE_ENV = "RC500_TRACE"
+TRACE_PREFIX = "RC500_Trace"
+
+
+class _NullSpan:
+    """Returned by span() while tracing is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add_bytes(self, nbytes):
+        pass
+
+NULL_SPAN = _NullSpan()
+
+class Span:
+    __slots__ = ("tracer", "name", "cat", "nbytes", "args", "start")
+
+    def __init__(self, tracer, name, cat, nbytes, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.nbytes = nbytes
+        self.args = args
+        self.start = None
+
+    def add_bytes(self, nbytes):
+        self.nbytes += nbytes
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self, time.perf_counter())
+        return False
+
+class Tracer:
+    """Collects spans for one operation at a time."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.events = []
+            self.origin = time.perf_counter()
+            self.current = None
+
+    def span(self, name, cat="transfer", nbytes=0, **args):
+        """Times a block: with tracer.span("copy", file=name, nbytes=size): ..."""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, cat, nbytes, args)
+
+    def phase(self, name=None):
+        """Ends the running phase and starts the next one (None just ends it)."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.current is not None:
+            self.current.__exit__(None, None, None)
+            self.current = None
+        if name:
+            self.current = Span(self, name, "phase", 0, {})
+            self.current.start = now
+
+    def record(self, span, end):
+        event = {
+            'name': span.name, 'cat': span.cat, 'ph': "X",
+            'ts': round((span.start - self.origin) * 1e6, 1),
+            'dur': round((end - span.start) * 1e6, 1),
+            'pid': os.getpid(), 'tid': threading.get_ident(),
+            'args': dict(span.args),
+        }
+        if span.nbytes:
+            event['args']['bytes'] = span.nbytes
+            seconds = end - span.start
+            if seconds > 0:
+                event['args']['MB/s'] = round(span.nbytes / seconds / 1048576, 2)
+        with self.lock:
+            self.events.append(event)
+
+    def summary(self):
+        """Rows of (name, count, seconds, bytes) per span name, phases first in order of appearance."""
+        rows = {}
+        with self.lock:
+            events = sorted(self.events, key=lambda e: (e['cat'] != "phase", e['ts']))
+        for e in events:
+            row = rows.setdefault(e['name'], [e['name'], 0, 0.0, 0])
+            row[1] += 1
+            row[2] += e['dur'] / 1e6
+            row[3] += e['args'].get('bytes', 0)
+        return [tuple(r) for r in rows.values()]
+
+    def summary_lines(self):
+        lines = [f"  {'Phase':<16} {'Count':>6} {'Time (s)':>9} {'MB':>8} {'MB/s':>8}"]
+        for name, count, seconds, nbytes in self.summary():
+            mb = nbytes / 1048576
+            rate = f"{mb / seconds:8.1f}" if nbytes and seconds > 0 else f"{'':>8}"
+            size = f"{mb:8.1f}" if nbytes else f"{'':>8}"
+            lines.append(f"  {name:<16} {count:6d} {seconds:9.3f} {size} {rate}")
+        return lines
+
+    def export(self, path, operation=""):
+        """Writes the spans as a Chrome trace JSON file."""
+        with self.lock:
+            data = {
+                'traceEvents': list(self.events),
+                'displayTimeUnit': "ms",
+                'otherData': {'operation': operation, 'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')},
+            }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        return path
+
+    def finish(self, operation, folder, logger_func):
+        """
+        Ends the operation: writes RC500_Trace_<operation>_<time>.json into
+        folder (or the RC500_TRACE folder) and logs the summary table.
+        Returns the trace path, or None if tracing is off.
+        """
+        if not self.enabled:
+            return None
+        self.phase(None)
+        if not self.events:
+            return None
+
+        env_dir = os.environ.get(TRACE_ENV, "")
+        if os.path.isdir(env_dir):
+            folder = env_dir
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"{TRACE_PREFIX}_{operation}_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+        self.export(path, operation)
+
+        logger_func(f"Timing summary ({operation}):")
+        for line in self.summary_lines():
+            logger_func(line)
+        logger_func(f"Trace saved: {path}")
+        self.reset()
+        return path
+
+tracer = Tracer(enabled=bool(os.environ.get(TRACE_ENV)))
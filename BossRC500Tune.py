@@ -0,0 +1,368 @@
+"""
+Boss RC-500 I/O Autotuner
+-------------------------
+Measures how fast a volume (the pedal, a backup drive) reads and writes,
+picks copy settings for backups and restores from that, and remembers the
+results per device so the probe only runs once.
+
+The probe (a few seconds, at most about 50 MB) measures:
+- sequential throughput for several buffer sizes,
+- throughput with 1, 2 and 4 files copied at once,
+- the time per file (open + small read, or create + small write + flush).
+
+Reads use the WAVs already on the volume. Writes go to a temporary folder
+(on the pedal: next to ROLAND) that is deleted again; every write is
+flushed to the device so caches don't hide a slow cable.
+
+Settings for a copy come from the source's read and the destination's
+write results: the buffer size and number of parallel copies that get
+within a few percent of the best throughput (the smallest such value wins),
+and largest files first when copying in parallel so no copy is left
+running alone at the end. Speeds that look like a USB 1.1 link or a slow
+hub are called out in the log.
+
+Profiles are kept in RC500_Tuning.json in the home folder (or the path in
+the RC500_TUNING environment variable), keyed by volume (label and serial
+number on Windows, mount point and size elsewhere).
+
+Copyright (C) 2026 [pmonk.com]
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import io
+import os
+import json
+import time
+import shutil
+import threading
+import statistics
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+TUNING_ENV = "RC500_TUNING"
+TUNING_NAME = "RC500_Tuning.json"
+PROBE_FOLDER = ".rc500_probe"
+
+PROBE_BLOCKS = (64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024)
+PROBE_JOBS = (1, 2, 4)
+# Each measurement moves up to PROBE_BYTES or stops after PROBE_SECONDS
+# (a slow pedal), and LATENCY_FILES files are timed for the per-file cost
+PROBE_BYTES = 4 * 1024 * 1024
+PROBE_SECONDS = 0.5
+LATENCY_FILES = 16
+# A setting within this fraction of the best result counts as just as good
+GOOD_ENOUGH = 0.95
+
+# USB 1.1 tops out around 1 MB/s; a healthy RC-500 link is well above this
+SLOW_MBPS = 5.0
+SLOW_FILE_MS = 50.0
+
+DEFAULTS = {'jobs': 4, 'buffer': 1024 * 1024, 'order': "path"}
+
+_lock = threading.Lock()
+
+
+# --- DEVICES ---
+
+def volume_root(path):
+    path = os.path.abspath(path)
+    while not os.path.ismount(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+def existing_folder(path):
+    """path, or its nearest existing parent (a backup folder may not exist yet)."""
+    path = os.path.abspath(path)
+    while not os.path.isdir(path) and os.path.dirname(path) != path:
+        path = os.path.dirname(path)
+    return path
+
+def device_id(path):
+    """A name for the volume holding path that survives re-plugging."""
+    root = volume_root(existing_folder(path))
+    if os.name == "nt":
+        try:
+            import ctypes
+            label = ctypes.create_unicode_buffer(261)
+            serial = ctypes.c_uint32()
+            if ctypes.windll.kernel32.GetVolumeInformationW(root, label, 261, ctypes.byref(serial),
+                                                            None, None, None, 0):
+                return f"{label.value or 'NO NAME'} {serial.value:08X}"
+        except (AttributeError, OSError):
+            pass
+    try:
+        total = shutil.disk_usage(root).total
+    except OSError:
+        total = 0
+    return f"{root} {total}"
+
+def is_pedal(path):
+    path = os.path.normpath(os.path.abspath(path))
+    return (os.path.basename(path).upper() == "WAVE"
+            and os.path.basename(os.path.dirname(path)).upper() == "ROLAND")
+
+def probe_folder(path):
+    """Where write tests go: next to ROLAND on the pedal, else in the folder itself."""
+    if is_pedal(path):
+        return os.path.dirname(os.path.dirname(os.path.abspath(path)))
+    return existing_folder(path)
+
+def wav_files(path, limit=500):
+    """Up to limit WAV paths below path, largest first."""
+    found = []
+    for root, dirs, files in os.walk(existing_folder(path)):
+        dirs[:] = [d for d in dirs if d != PROBE_FOLDER]
+        for f in files:
+            if f.lower().endswith(".wav"):
+                found.append(os.path.join(root, f))
+                if len(found) >= limit:
+                    break
+        if len(found) >= limit:
+            break
+    return sorted(found, key=os.path.getsize, reverse=True)
+
+# --- PROBES ---
+
+def _mbps(nbytes, seconds):
+    return round(nbytes / 1048576 / max(seconds, 1e-6), 1)
+
+class _Files:
+    """Hands out WAVs in turn so each measurement reads files the others didn't."""
+
+    def __init__(self, paths):
+        self.paths = paths
+        self.next = 0
+
+    def take(self, nbytes):
+        taken, total = [], 0
+        for _ in range(len(self.paths)):
+            if total >= nbytes:
+                break
+            path = self.paths[self.next % len(self.paths)]
+            self.next += 1
+            taken.append(path)
+            total += os.path.getsize(path)
+        return taken
+
+def _read(paths, block, nbytes):
+    done = 0
+    deadline = time.perf_counter() + PROBE_SECONDS
+    for path in paths:
+        with open(path, "rb", buffering=0) as f:
+            while done < nbytes and time.perf_counter() < deadline:
+                data = f.read(block)
+                if not data:
+                    break
+                done += len(data)
+        if done >= nbytes or time.perf_counter() >= deadline:
+            break
+    return done
+
+def _write(path, block, nbytes):
+    data = b"\0" * block
+    done = 0
+    deadline = time.perf_counter() + PROBE_SECONDS
+    with open(path, "wb", buffering=0) as f:
+        while done < nbytes and (done == 0 or time.perf_counter() < deadline):
+            f.write(data)
+            done += block
+        # Flush to the device so the OS cache doesn't hide a slow drive
+        try:
+            os.fsync(f.fileno())
+        except io.UnsupportedOperation:
+            pass
+    return done
+
+def probe_read(paths):
+    # Time the per-file cost first, before the throughput passes have pulled
+    # these files into the page cache (that would time memory, not the device)
+    times = []
+    for path in paths[-LATENCY_FILES:]:
+        start = time.perf_counter()
+        os.stat(path)
+        with open(path, "rb", buffering=0) as f:
+            f.read(4096)
+        times.append(time.perf_counter() - start)
+
+    files = _Files(paths)
+    blocks = {}
+    for block in PROBE_BLOCKS:
+        start = time.perf_counter()
+        done = _read(files.take(PROBE_BYTES), block, PROBE_BYTES)
+        blocks[str(block)] = _mbps(done, time.perf_counter() - start)
+    best = max(PROBE_BLOCKS, key=lambda b: blocks[str(b)])
+
+    jobs = {}
+    for n in PROBE_JOBS:
+        groups = [files.take(PROBE_BYTES // n) for _ in range(n)]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=n) as pool:
+            done = sum(pool.map(lambda g: _read(g, best, PROBE_BYTES // n), groups))
+        jobs[str(n)] = _mbps(done, time.perf_counter() - start)
+    return {'blocks': blocks, 'jobs': jobs, 'file_ms': round(statistics.median(times) * 1000, 2)}
+
+def probe_write(folder):
+    work = os.path.join(folder, PROBE_FOLDER)
+    os.makedirs(work, exist_ok=True)
+    try:
+        blocks = {}
+        for block in PROBE_BLOCKS:
+            start = time.perf_counter()
+            done = _write(os.path.join(work, f"block_{block}.tmp"), block, PROBE_BYTES)
+            blocks[str(block)] = _mbps(done, time.perf_counter() - start)
+        best = max(PROBE_BLOCKS, key=lambda b: blocks[str(b)])
+
+        jobs = {}
+        for n in PROBE_JOBS:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=n) as pool:
+                done = sum(pool.map(lambda i: _write(os.path.join(work, f"jobs_{n}_{i}.tmp"), best, PROBE_BYTES // n),
+                                    range(n)))
+            jobs[str(n)] = _mbps(done, time.perf_counter() - start)
+
+        times = []
+        for i in range(LATENCY_FILES):
+            start = time.perf_counter()
+            _write(os.path.join(work, f"small_{i}.tmp"), 4096, 4096)
+            times.append(time.perf_counter() - start)
+        return {'blocks': blocks, 'jobs': jobs, 'file_ms': round(statistics.median(times) * 1000, 2)}
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+def health_warnings(profile):
+    warnings = []
+    for side in ("read", "write"):
+        result = profile.get(side)
+        if not result:
+            continue
+        best = max(list(result['blocks'].values()) + list(result['jobs'].values()))
+        if best < SLOW_MBPS:
+            warnings.append(f"{side} speed {best:.1f} MB/s is very low: check the USB cable, try another port "
+                            f"and avoid hubs (USB 1.1 ports run at about 1 MB/s)")
+        if result['file_ms'] > SLOW_FILE_MS:
+            warnings.append(f"{side} takes {result['file_ms']:.0f} ms per file: the drive or hub is slow to respond")
+    return warnings
+
+def probe(path, logger_func=None):
+    """Measures the volume holding path. Returns its profile dict."""
+    log = logger_func or (lambda m: None)
+    log(f"Testing I/O speed of {path}...")
+    profile = {'device': device_id(path), 'path': os.path.abspath(path),
+               'probed': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+    paths = wav_files(path)
+    if paths:
+        profile['read'] = probe_read(paths)
+    try:
+        profile['write'] = probe_write(probe_folder(path))
+    except OSError as e:
+        log(f"Write test skipped: {e}")
+    profile['warnings'] = health_warnings(profile)
+    for line in describe(profile):
+        log(line)
+    return profile
+
+def describe(profile):
+    """Log lines for a profile."""
+    lines = [f"I/O profile of {profile['path']} ({profile['device']}, tested {profile['probed']}):"]
+    for side in ("read", "write"):
+        result = profile.get(side)
+        if not result:
+            continue
+        blocks = ", ".join(f"{int(b) // 1024} KB {v:.1f}" for b, v in result['blocks'].items())
+        jobs = ", ".join(f"{n}x {v:.1f}" for n, v in result['jobs'].items())
+        lines.append(f"  {side:5} MB/s by buffer: {blocks} | by parallel files: {jobs} | "
+                     f"{result['file_ms']:.1f} ms per file")
+    for w in profile.get('warnings', []):
+        lines.append(f"  WARNING: {w}")
+    return lines
+
+# --- PROFILES ---
+
+def tuning_path():
+    return os.environ.get(TUNING_ENV) or os.path.join(os.path.expanduser("~"), TUNING_NAME)
+
+def load_profiles():
+    try:
+        with open(tuning_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_profile(profile):
+    with _lock:
+        profiles = load_profiles()
+        profiles[profile['device']] = profile
+        path = tuning_path()
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(profiles, f, indent=2)
+        os.replace(tmp, path)
+
+def profile_for(path, force=False, probe_missing=True, logger_func=None):
+    """The remembered profile of path's volume; probes (and remembers) it if needed."""
+    if not force:
+        known = load_profiles().get(device_id(path))
+        if known or not probe_missing:
+            return known
+    profile = probe(path, logger_func)
+    try:
+        save_profile(profile)
+    except OSError as e:
+        if logger_func: logger_func(f"Could not save the I/O profile: {e}")
+    return profile
+
+# --- SETTINGS ---
+
+def _pick(options, read, write):
+    """Smallest option whose min(read, write) speed is within GOOD_ENOUGH of the best."""
+    speeds = {}
+    for option in options:
+        values = [side[str(option)] for side in (read, write) if side and str(option) in side]
+        if values:
+            speeds[option] = min(values)
+    if not speeds:
+        return None
+    best = max(speeds.values())
+    return min(o for o, v in speeds.items() if v >= best * GOOD_ENOUGH)
+
+def choose_settings(source_profile, dest_profile):
+    """{'jobs', 'buffer', 'order'} for copying from source's volume to dest's."""
+    read = (source_profile or {}).get('read') or {}
+    write = (dest_profile or {}).get('write') or {}
+    settings = dict(DEFAULTS)
+    buffer = _pick(PROBE_BLOCKS, read.get('blocks'), write.get('blocks'))
+    jobs = _pick(PROBE_JOBS, read.get('jobs'), write.get('jobs'))
+    if buffer:
+        settings['buffer'] = buffer
+    if jobs:
+        settings['jobs'] = jobs
+    settings['order'] = "size" if settings['jobs'] > 1 else "path"
+    return settings
+
+def describe_settings(settings):
+    order = "largest files first" if settings['order'] == "size" else "in pedal order"
+    jobs = f"{settings['jobs']} files at a time" if settings['jobs'] > 1 else "one file at a time"
+    return f"{jobs}, {settings['buffer'] // 1024} KB buffer, {order}"
+
+def transfer_settings(source, dest, probe_missing=True, logger_func=None):
+    """
+    Copy settings for source -> dest from their remembered profiles, probing
+    volumes that haven't been measured yet (unless probe_missing is False).
+    """
+    log = logger_func or (lambda m: None)
+    source_profile = profile_for(source, probe_missing=probe_missing, logger_func=log)
+    dest_profile = profile_for(dest, probe_missing=probe_missing, logger_func=log)
+    settings = choose_settings(source_profile, dest_profile)
+    log(f"Transfer settings: {describe_settings(settings)}"
+        + ("" if source_profile and dest_profile else " (defaults for untested drives)"))
+    for profile in (source_profile, dest_profile):
+        for w in (profile or {}).get('warnings', []):
+            log(f"WARNING: {w}")
+    return settings
@@ -0,0 +1,49 @@
+"""
+Shared pytest setup. The tools are flat scripts in the repository root, so
+that folder goes on sys.path; fake pedals come from BossRC500Fixture.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import BossRC500Fixture as rc_fixture
+
+
+@pytest.fixture
+def pedal(tmp_path):
+    """A small fake pedal (about a dozen short tracks). Returns its ROLAND/WAVE folder."""
+    wave_dir, _, _ = rc_fixture.generate_pedal(str(tmp_path / "pedal"), memories=10, max_seconds=0.5,
+                                               min_seconds=0.2)
+    return wave_dir
+
+
+@pytest.fixture
+def empty_pedal(tmp_path):
+    """A second pedal with no tracks. Returns its ROLAND/WAVE folder."""
+    wave_dir = tmp_path / "empty" / "ROLAND" / "WAVE"
+    wave_dir.mkdir(parents=True)
+    return str(wave_dir)
+
+
+def wave_contents(wave_dir):
+    """{'001_1/001_1.WAV': bytes} for every track on a pedal."""
+    contents = {}
+    for folder in sorted(os.listdir(wave_dir)):
+        for f in os.listdir(os.path.join(wave_dir, folder)):
+            with open(os.path.join(wave_dir, folder, f), "rb") as fh:
+                contents[f"{folder}/{f}"] = fh.read()
+    return contents
+
+
+def silence(path):
+    """Overwrites a fake pedal track's audio with digital silence (header kept)."""
+    size = os.path.getsize(path)
+    with open(path, "r+b") as f:
+        f.seek(44)
+        f.write(bytes(size - 44))
@@ -0,0 +1,105 @@
+"""Silence detection, duplicate fingerprints and transcoding of fake pedal tracks."""
+
+import os
+import shutil
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import BossRC500Audio as rc_audio
+import BossRC500Core as rc_core
+import BossRC500Fixture as rc_fixture
+from conftest import silence
+
+
+def write_level(path, db, seconds=0.3):
+    """A float WAV holding one constant level (dBFS); no samples at all for db None."""
+    frames = int(seconds * rc_fixture.SAMPLE_RATE) if db is not None else 0
+    level = 10 ** (db / 20.0) if db is not None else 0.0
+    with open(path, "wb") as f:
+        f.write(rc_fixture.wav_header(frames))
+        f.write(np.full((frames, rc_fixture.CHANNELS), level, dtype="<f4").tobytes())
+    return str(path)
+
+
+def read_samples(path):
+    return np.concatenate(list(rc_audio.iter_wav_blocks(path)))
+
+
+def pedal_tracks(wave_dir):
+    metadata = rc_core.parse_metadata(wave_dir, lambda m: None)
+    return sorted(rc_core.scan_wave_tracks(wave_dir, metadata), key=lambda t: t['path'])
+
+
+def test_find_silent(pedal, tmp_path):
+    tracks = [t['path'] for t in pedal_tracks(pedal)]
+    silence(tracks[0])
+    quiet = write_level(tmp_path / "quiet.wav", -70)
+    soft = write_level(tmp_path / "soft.wav", -50)
+    empty = write_level(tmp_path / "empty.wav", None)
+
+    assert rc_audio.find_silent(tracks[:3] + [quiet, soft, empty], jobs=2) == {tracks[0], quiet, empty}
+    assert rc_audio.find_silent([quiet, soft], threshold_db=-40, jobs=1) == {quiet, soft}
+
+
+def test_duplicates_are_grouped(pedal, tmp_path):
+    original = pedal_tracks(pedal)[0]['path']
+    copy_dir = os.path.join(pedal, "007_1")
+    os.makedirs(copy_dir)
+    shutil.copy2(original, os.path.join(copy_dir, "007_1.WAV"))
+    # Same audio at half the gain still matches
+    quieter_dir = os.path.join(pedal, "008_1")
+    os.makedirs(quieter_dir)
+    with open(original, "rb") as src, open(os.path.join(quieter_dir, "008_1.WAV"), "wb") as dst:
+        header = src.read(44)
+        dst.write(header + (np.frombuffer(src.read(), dtype="<f4") * 0.5).tobytes())
+    silence(pedal_tracks(pedal)[1]['path'])
+
+    tracks = pedal_tracks(pedal)
+    index = rc_audio.FingerprintIndex(str(tmp_path / rc_core.FINGERPRINT_INDEX_NAME))
+    entries = index.update_location(index.PEDAL, tracks, jobs=1)
+    by_path = {t['path']: entries[t['file']] for t in tracks}
+
+    def dupes(track):
+        return {(d['slot'], d['track']) for d in index.find_duplicates(by_path[track['path']])}
+
+    group = {(1, "1"), (7, "1"), (8, "1")}
+    for t in tracks:
+        if (t['slot'], t['track']) in group:
+            assert dupes(t) == group - {(t['slot'], t['track'])}
+        else:
+            assert not dupes(t) & group
+    # Silent tracks never match anything
+    assert by_path[tracks[1]['path']]['fp'] is None and not dupes(tracks[1])
+
+
+def test_transcode_keeps_the_audio(pedal, tmp_path):
+    src = pedal_tracks(pedal)[0]['path']
+    out = str(tmp_path / "out.wav")
+    assert list(rc_audio.transcode_files([(src, out)], "24-bit PCM", jobs=1)) == [(src, os.path.getsize(out))]
+
+    before, after = rc_audio.read_wav_info(src), rc_audio.read_wav_info(out)
+    assert (after['format'], after['bits']) == (rc_audio.WAVE_FORMAT_PCM, 24)
+    assert (after['sample_rate'], after['frames']) == (before['sample_rate'], before['frames'])
+    assert np.abs(read_samples(out) - read_samples(src)).max() < 2 ** -22
+
+
+def test_resample(pedal, tmp_path):
+    src = pedal_tracks(pedal)[0]['path']
+    out = str(tmp_path / "out.wav")
+    [(_, size)] = rc_audio.transcode_files([(src, out)], "16-bit PCM", 22050, jobs=1)
+    assert size == os.path.getsize(out)
+
+    before, after = rc_audio.read_wav_info(src), rc_audio.read_wav_info(out)
+    assert (after['bits'], after['sample_rate'], after['channels']) == (16, 22050, before['channels'])
+    assert abs(after['frames'] - before['frames'] / 2) <= 2
+    rms = [np.sqrt(np.mean(read_samples(p) ** 2)) for p in (src, out)]
+    assert rms[1] == pytest.approx(rms[0], rel=0.05)
+
+
+def test_transcode_reports_unreadable_files(tmp_path):
+    bad = tmp_path / "bad.wav"
+    bad.write_bytes(b"not a wav")
+    [(src, result)] = rc_audio.transcode_files([(str(bad), str(tmp_path / "out.wav"))], "16-bit PCM", jobs=1)
+    assert src == str(bad) and isinstance(result, Exception)
@@ -0,0 +1,82 @@
+"""Backups to a folder, an archive and the dedup store, restored onto a second pedal."""
+
+import os
+
+import pytest
+
+import BossRC500Core as rc_core
+import BossRC500Store as rc_store
+from conftest import wave_contents, silence
+
+
+@pytest.mark.parametrize("archive", [None, "zip", "tar.xz", rc_core.STORE_ARCHIVE])
+def test_round_trip(tmp_path, pedal, empty_pedal, archive):
+    result = rc_core.backup_pedal(pedal, str(tmp_path / "backups" / "Boss RC-500 Backup 2026-01-01"), archive=archive)
+    assert not result['errors']
+    assert len(result['tracks']) == len(wave_contents(pedal))
+
+    restored = rc_core.restore_backup(result['dest'], empty_pedal)
+    assert not restored['errors']
+    assert wave_contents(empty_pedal) == wave_contents(pedal)
+
+
+@pytest.mark.parametrize("archive", [None, "zip", "tar.xz", rc_core.STORE_ARCHIVE])
+def test_restore_some_slots(tmp_path, pedal, empty_pedal, archive):
+    result = rc_core.backup_pedal(pedal, str(tmp_path / "Boss RC-500 Backup 2026-01-01"), archive=archive)
+    slots = {t['slot'] for t in result['tracks'][:2]}
+
+    rc_core.restore_backup(result['dest'], empty_pedal, slots=slots)
+    expected = {k: v for k, v in wave_contents(pedal).items() if int(k[:3]) in slots}
+    assert wave_contents(empty_pedal) == expected
+
+
+def test_store_keeps_each_chunk_once(tmp_path, pedal):
+    first = rc_core.backup_pedal(pedal, str(tmp_path / "Boss RC-500 Backup 2026-01-01"), archive=rc_core.STORE_ARCHIVE)
+    store = rc_store.ChunkStore(os.path.join(str(tmp_path), rc_store.STORE_NAME))
+    stored = store.stored_bytes()
+
+    second = rc_core.backup_pedal(pedal, str(tmp_path / "Boss RC-500 Backup 2026-01-02"), archive=rc_core.STORE_ARCHIVE)
+    assert store.stored_bytes() == stored
+    assert store.list_snapshots() == ["Boss RC-500 Backup 2026-01-01", "Boss RC-500 Backup 2026-01-02"]
+    assert rc_store.load_snapshot(second['dest'])['files'] == rc_store.load_snapshot(first['dest'])['files']
+
+
+def test_folder_backup_manifest(tmp_path, pedal):
+    dest = str(tmp_path / "Boss RC-500 Backup 2026-01-01")
+    result = rc_core.backup_pedal(pedal, dest, slots=[1, 2, 3])
+    metadata, tracks, source = rc_core.load_manifest(dest)
+    assert source == pedal
+    assert set(metadata) <= {1, 2, 3}
+    assert tracks == sorted(result['tracks'], key=lambda t: (t['slot'], str(t['track'])))
+    assert all(os.path.exists(os.path.join(dest, t['file'])) for t in tracks)
+
+
+def test_transcoded_backup_manifest_sizes(tmp_path, pedal):
+    pytest.importorskip("numpy")
+    dest = str(tmp_path / "Boss RC-500 Backup 2026-01-01")
+    result = rc_core.backup_pedal(pedal, dest, export_format="16-bit PCM", sample_rate=22050)
+    _, tracks, _ = rc_core.load_manifest(dest)
+    sizes = {t['file']: os.path.getsize(os.path.join(dest, t['file'])) for t in tracks}
+    assert tracks and {t['file']: t['size'] for t in tracks} == sizes
+    assert result['bytes'] == sum(sizes.values()) < sum(len(d) for d in wave_contents(pedal).values())
+
+
+def test_folder_restore_includes_silent_folder(tmp_path, pedal, empty_pedal):
+    pytest.importorskip("numpy")
+    quiet = sorted(wave_contents(pedal))[:2]
+    for name in quiet:
+        silence(os.path.join(pedal, name))
+    dest = str(tmp_path / "Boss RC-500 Backup 2026-01-01")
+    result = rc_core.backup_pedal(pedal, dest, silent_folder=rc_core.SILENT_FOLDER, threshold=-60)
+    moved = sorted(t['file'] for t in result['tracks'] if t['silent'])
+    assert len(moved) == 2 and all(f.startswith(rc_core.SILENT_FOLDER + "/") for f in moved)
+
+    restored = rc_core.restore_backup(dest, empty_pedal)
+    assert not restored['errors']
+    assert wave_contents(empty_pedal) == wave_contents(pedal)
+
+    other = tmp_path / "other" / "ROLAND" / "WAVE"
+    other.mkdir(parents=True)
+    restored = rc_core.restore_backup(dest, str(other), skip_silent=True)
+    assert sorted(restored['skipped']) == moved
+    assert set(wave_contents(str(other))) == set(wave_contents(pedal)) - set(quiet)
@@ -0,0 +1,105 @@
+"""The command line front end: exit codes and --json output."""
+
+import os
+import json
+
+import pytest
+
+import BossRC500CLI as rc_cli
+import BossRC500Emulator as rc_emulator
+from conftest import wave_contents
+
+
+@pytest.fixture(autouse=True)
+def no_saved_tuning(tmp_path, monkeypatch):
+    monkeypatch.setenv("RC500_TUNING", str(tmp_path / "tuning.json"))
+    monkeypatch.delenv("RC500_DRIVE", raising=False)
+
+
+def run(capsys, *argv):
+    """(exit code, JSON result) of one CLI call."""
+    code = rc_cli.main(["--json", *argv])
+    payload = json.loads(capsys.readouterr().out)
+    assert payload['exit_code'] == code
+    return code, payload
+
+
+def test_scan(capsys, pedal):
+    code, payload = run(capsys, "--pedal", pedal, "scan")
+    assert code == rc_cli.EXIT_OK
+    assert payload['command'] == "scan" and payload['pedal'] == pedal
+    assert len(payload['tracks']) == len(wave_contents(pedal))
+
+    code, payload = run(capsys, "--pedal", pedal, "scan", "--slots", "7-8")
+    assert code == rc_cli.EXIT_NO_MATCH and payload['tracks'] == []
+
+
+def test_errors(capsys, tmp_path, pedal):
+    code, payload = run(capsys, "--pedal", str(tmp_path / "nowhere"), "scan")
+    assert code == rc_cli.EXIT_ERROR and "not found" in payload['error']
+    assert run(capsys, "--pedal", pedal, "scan", "--slots", "x")[0] == rc_cli.EXIT_ERROR
+    assert run(capsys, "--pedal", pedal, "restore", str(tmp_path / "missing"))[0] == rc_cli.EXIT_ERROR
+
+
+def test_log_goes_to_stderr_with_json(capsys, pedal):
+    rc_cli.main(["--json", "--pedal", pedal, "scan"])
+    out, err = capsys.readouterr()
+    json.loads(out)
+    assert "tracks in" in err
+
+
+def test_delete_needs_yes(capsys, pedal):
+    before = wave_contents(pedal)
+    assert run(capsys, "--pedal", pedal, "delete", "--slots", "1-2")[0] == rc_cli.EXIT_ERROR
+    code, payload = run(capsys, "--pedal", pedal, "delete", "--slots", "1-2", "--dry-run")
+    assert code == rc_cli.EXIT_OK and payload['would_delete']
+    assert wave_contents(pedal) == before
+
+    code, payload = run(capsys, "--pedal", pedal, "delete", "--slots", "1-2", "--yes")
+    assert code == rc_cli.EXIT_OK
+    assert sorted(payload['deleted']) == sorted({k.split("/")[0] for k in before if k[:3] in ("001", "002")})
+    assert not any(name[:3] in ("001", "002") for name in wave_contents(pedal))
+    assert run(capsys, "--pedal", pedal, "delete", "--slots", "1-2", "--yes")[0] == rc_cli.EXIT_NO_MATCH
+
+
+def test_backup_and_restore(capsys, tmp_path, pedal, empty_pedal):
+    dest = str(tmp_path / "Boss RC-500 Backup 2026-01-01")
+    code, payload = run(capsys, "--pedal", pedal, "--no-tune", "backup", dest, "--archive", "zip")
+    assert code == rc_cli.EXIT_OK and payload['dest'] == dest + ".zip"
+
+    code, payload = run(capsys, "--pedal", empty_pedal, "--jobs", "2", "restore", dest + ".zip")
+    assert code == rc_cli.EXIT_OK and not payload['errors']
+    assert wave_contents(empty_pedal) == wave_contents(pedal)
+
+
+def test_clone_with_a_failing_pedal_is_partial(capsys, tmp_path, pedal):
+    targets = []
+    for name in ("good", "bad"):
+        wave_dir = tmp_path / name / "ROLAND" / "WAVE"
+        wave_dir.mkdir(parents=True)
+        targets.append(str(wave_dir))
+    assert run(capsys, "clone", pedal, *targets)[0] == rc_cli.EXIT_ERROR  # no --yes
+
+    with rc_emulator.PedalEmulator(str(tmp_path / "bad"), disconnect_after=1):
+        code, payload = run(capsys, "clone", pedal, *targets, "--yes")
+    assert code == rc_cli.EXIT_PARTIAL
+    assert [r['ok'] for r in payload['targets'].values()] == [True, False]
+
+
+def test_sync(capsys, tmp_path, pedal):
+    library = str(tmp_path / "library")
+    code, payload = run(capsys, "--pedal", pedal, "sync", library, "--dry-run")
+    assert code == rc_cli.EXIT_OK and payload['pending'] and not payload['applied']
+    assert not [f for f in os.listdir(library) if f.endswith(".wav")]
+
+    code, payload = run(capsys, "--pedal", pedal, "--no-tune", "sync", library)
+    assert code == rc_cli.EXIT_OK and payload['applied']
+    assert len([f for f in os.listdir(library) if f.endswith(".wav")]) == len(wave_contents(pedal))
+
+    # Deleting from the pedal needs --yes
+    os.remove(os.path.join(library, sorted(f for f in os.listdir(library) if f.endswith(".wav"))[0]))
+    before = wave_contents(pedal)
+    assert run(capsys, "--pedal", pedal, "sync", library, "--mode", "both", "--deletes")[0] == rc_cli.EXIT_ERROR
+    assert wave_contents(pedal) == before
+    assert run(capsys, "--pedal", pedal, "sync", library, "--mode", "both", "--deletes", "--yes")[0] == rc_cli.EXIT_OK
+    assert len(wave_contents(pedal)) == len(before) - 1
@@ -0,0 +1,62 @@
+"""Cloning onto several pedals: read-back verification and a pedal failing part way."""
+
+import os
+
+import BossRC500Clone as rc_clone
+import BossRC500Emulator as rc_emulator
+from conftest import wave_contents
+
+
+def make_targets(tmp_path, count):
+    targets = []
+    for i in range(count):
+        wave_dir = tmp_path / f"target{i}" / "ROLAND" / "WAVE"
+        wave_dir.mkdir(parents=True)
+        targets.append(str(wave_dir))
+    return targets
+
+
+def test_clone_to_several_pedals(tmp_path, pedal):
+    targets = make_targets(tmp_path, 3)
+    # A stale track on one target goes, as the source doesn't have it
+    os.makedirs(os.path.join(targets[0], "050_1"))
+    result = rc_clone.clone(pedal, targets)
+    assert result['files'] == len(wave_contents(pedal))
+    for t in targets:
+        assert result['targets'][t]['ok']
+        assert wave_contents(t) == wave_contents(pedal)
+    assert result['targets'][targets[0]]['removed'] == ["050_1"]
+
+
+def test_verify_catches_a_bad_copy(tmp_path, pedal, monkeypatch):
+    good, bad = make_targets(tmp_path, 2)
+    verify = rc_clone.TargetWriter.verify
+
+    def corrupt_then_verify(writer, digests):
+        if writer.wave_dir == bad:
+            with open(writer.path(writer.files[0]), "r+b") as f:
+                f.seek(-1, os.SEEK_END)
+                last = f.read(1)
+                f.seek(-1, os.SEEK_END)
+                f.write(bytes([last[0] ^ 0xFF]))
+        verify(writer, digests)
+
+    monkeypatch.setattr(rc_clone.TargetWriter, "verify", corrupt_then_verify)
+    result = rc_clone.clone(pedal, [good, bad])
+    assert result['targets'][good]['ok'] and not result['targets'][good]['mismatched']
+    assert not result['targets'][bad]['ok']
+    assert len(result['targets'][bad]['mismatched']) == 1
+
+
+def test_failing_pedal_does_not_stop_the_others(tmp_path, pedal):
+    good, bad = make_targets(tmp_path, 2)
+    total = sum(len(data) for data in wave_contents(pedal).values())
+    with rc_emulator.PedalEmulator(os.path.dirname(os.path.dirname(bad)), disconnect_after=total // 3) as emulator:
+        result = rc_clone.clone(pedal, [good, bad])
+    assert emulator.stats['disconnects'] == 1
+
+    assert result['targets'][good]['ok']
+    assert wave_contents(good) == wave_contents(pedal)
+    failed = result['targets'][bad]
+    assert not failed['ok'] and failed['error']
+    assert 0 < failed['files'] < result['files']
@@ -0,0 +1,78 @@
+"""The daemon's HTTP API: session token, Host header and content type checks."""
+
+import json
+import socket
+import threading
+import http.client
+
+import pytest
+
+import BossRC500Daemon as rc_daemon
+
+
+@pytest.fixture
+def server(pedal, tmp_path):
+    """A daemon serving the fake pedal on a free local port. Returns (port, token)."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    daemon = rc_daemon.Daemon(pedal, [str(tmp_path / "backups")])
+    daemon.index.refresh()
+    httpd, token = rc_daemon.serve(daemon, "127.0.0.1", port)
+    threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True).start()
+    yield port, token
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def call(port, method, path, headers, body=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        conn.request(method, path, body=body, headers=headers)
+        resp = conn.getresponse()
+        return resp.status, json.loads(resp.read())
+    finally:
+        conn.close()
+
+
+def test_token_is_required(server, pedal):
+    port, token = server
+    host = f"127.0.0.1:{port}"
+    status, payload = call(port, "GET", "/status", {'Host': host, rc_daemon.TOKEN_HEADER: token})
+    assert status == 200 and payload['pedal'] == pedal
+
+    assert call(port, "GET", "/status", {'Host': host})[0] == 403
+    assert call(port, "GET", "/status", {'Host': host, rc_daemon.TOKEN_HEADER: token[:-1]})[0] == 403
+    # Nothing happens on a refused POST either
+    assert call(port, "POST", "/delete", {'Host': host, 'Content-Type': "application/json"},
+                json.dumps({'slots': "1", 'confirm': True}))[0] == 403
+
+
+@pytest.mark.parametrize("host, allowed", [
+    ("127.0.0.1", True), ("localhost", True),
+    ("evil.example.com", False), ("127.0.0.1.nip.io", False), ("localhost:1", False),
+])
+def test_host_header_is_checked(server, host, allowed):
+    port, token = server
+    host = host if ":" in host else f"{host}:{port}"
+    status, payload = call(port, "GET", "/status", {'Host': host, rc_daemon.TOKEN_HEADER: token})
+    assert status == (200 if allowed else 403)
+
+
+def test_post_needs_json(server):
+    port, token = server
+    headers = {'Host': f"localhost:{port}", rc_daemon.TOKEN_HEADER: token, 'Content-Type': "text/plain"}
+    assert call(port, "POST", "/refresh", headers, "{}")[0] == 415
+
+
+def test_client_sends_the_token(server, pedal):
+    port, token = server
+    url = f"http://127.0.0.1:{port}"
+    assert rc_daemon.DaemonClient(url, token=token).status()['pedal'] == pedal
+    with pytest.raises(rc_daemon.DaemonError):
+        rc_daemon.DaemonClient(url, token="wrong").status()
+
+
+def test_remote_listen_needs_a_token():
+    with pytest.raises(ValueError):
+        rc_daemon.serve(rc_daemon.Daemon(), "0.0.0.0", 8500)
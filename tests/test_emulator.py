@@ -0,0 +1,74 @@
+"""The pedal emulator: throttling, disconnects and leaving other paths alone."""
+
+import os
+import time
+import builtins
+
+import pytest
+
+import BossRC500Emulator as rc_emulator
+
+
+def first_track(wave_dir):
+    folder = sorted(os.listdir(wave_dir))[0]
+    return os.path.join(wave_dir, folder, f"{folder}.WAV")
+
+
+def read_all(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_bandwidth_and_latency(pedal, tmp_path):
+    track = first_track(pedal)
+    size = os.path.getsize(track)
+    bandwidth = size * 5  # about 0.2 s for the file
+    with rc_emulator.PedalEmulator(pedal, latency=0.01, bandwidth=bandwidth) as emulator:
+        start = time.perf_counter()
+        data = read_all(track)
+        elapsed = time.perf_counter() - start
+        os.listdir(pedal)
+        # Files outside the pedal folder are not throttled
+        ops = emulator.stats['ops']
+        outside = tmp_path / "outside.bin"
+        outside.write_bytes(data)
+        assert read_all(str(outside)) == data
+        assert emulator.stats['ops'] == ops
+
+    assert data == read_all(track)
+    assert emulator.stats['bytes_read'] == size
+    assert elapsed >= size / bandwidth * 0.9
+    # open + one per 64 KB block (+ the final empty read) + listdir
+    blocks = -(-size // rc_emulator.BLOCK_SIZE)
+    assert emulator.stats['ops'] >= 1 + blocks + 1
+    assert emulator.stats['waited'] >= emulator.stats['ops'] * 0.01
+
+
+def test_disconnect_after_bytes(pedal):
+    track = first_track(pedal)
+    with rc_emulator.PedalEmulator(pedal, disconnect_after=os.path.getsize(track) // 2) as emulator:
+        with pytest.raises(rc_emulator.DeviceDisconnected):
+            read_all(track)
+        # Everything on the pedal fails from then on, also listings
+        with pytest.raises(OSError):
+            os.listdir(pedal)
+    assert emulator.stats['disconnects'] == 1
+    assert emulator.stats['failed_ops'] >= 1
+
+
+def test_reconnect(pedal):
+    track = first_track(pedal)
+    with rc_emulator.PedalEmulator(pedal, disconnect_after=1, reconnect_after=0.1):
+        with pytest.raises(rc_emulator.DeviceDisconnected):
+            read_all(track)
+        time.sleep(0.15)
+        assert read_all(track)
+
+
+def test_uninstall_restores_file_functions(pedal):
+    original_open, original_listdir = builtins.open, os.listdir
+    emulator = rc_emulator.PedalEmulator(pedal, disconnect_after=0).install()
+    assert builtins.open is not original_open
+    emulator.uninstall()
+    assert builtins.open is original_open and os.listdir is original_listdir
+    assert read_all(first_track(pedal))
@@ -0,0 +1,136 @@
+"""Which backups prune picks, and what it leaves alone."""
+
+import json
+import os
+import zipfile
+
+import pytest
+
+import BossRC500Core as rc_core
+import BossRC500Prune as rc_prune
+import BossRC500Store as rc_store
+from conftest import wave_contents
+
+
+def make_folder(root, name, size=1000):
+    """A dated backup folder holding one file of size bytes."""
+    path = os.path.join(root, name)
+    os.makedirs(path)
+    with open(os.path.join(path, "001_Loop_Track_1.wav"), "wb") as f:
+        f.write(os.urandom(size))
+    return path
+
+
+def set_snapshot_date(path, generated):
+    snapshot = rc_store.load_snapshot(path)
+    snapshot['generated'] = generated
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f)
+
+
+@pytest.fixture
+def backups(tmp_path):
+    """Five dated backup folders next to things that aren't backups."""
+    root = str(tmp_path / "backups")
+    for day in range(1, 6):
+        make_folder(root, f"Boss RC-500 Backup 2026-01-0{day}")
+    # A sync library has a manifest but isn't a dated backup
+    library = os.path.join(root, "Library")
+    os.makedirs(library)
+    rc_core.write_manifest(library, {}, [])
+    with zipfile.ZipFile(os.path.join(root, "MyTaxes.zip"), "w") as zf:
+        zf.writestr("2025.pdf", b"receipts")
+    os.makedirs(os.path.join(root, "Photos"))
+    return root
+
+
+def names(found):
+    return [os.path.basename(b['path']) for b in found]
+
+
+def test_find_backups_only_takes_backups(backups):
+    assert names(rc_prune.find_backups(backups)) == [f"Boss RC-500 Backup 2026-01-0{day}" for day in range(5, 0, -1)]
+
+
+def test_indexed_archive_is_a_backup(tmp_path, pedal, backups):
+    rc_core.backup_pedal(pedal, os.path.join(backups, "Nightly"), archive="zip")
+    found = rc_prune.find_backups(backups)
+    assert found[0]['kind'] == "archive" and names(found)[0] == "Nightly.zip"
+
+
+def test_keep_last(backups):
+    plan = rc_prune.plan_prune(backups, last=2)
+    assert names(plan['kept']) == ["Boss RC-500 Backup 2026-01-05", "Boss RC-500 Backup 2026-01-04"]
+    assert len(plan['expired']) == 3
+    assert plan['freed'] > 0
+
+
+def test_daily_keeps_newest_of_each_day(tmp_path):
+    root = str(tmp_path)
+    for name in ("Boss RC-500 Backup 2026-01-01 090000", "Boss RC-500 Backup 2026-01-01 180000",
+                 "Boss RC-500 Backup 2026-01-02 090000"):
+        make_folder(root, name)
+    plan = rc_prune.plan_prune(root, last=0, daily=2)
+    assert names(plan['kept']) == ["Boss RC-500 Backup 2026-01-02 090000", "Boss RC-500 Backup 2026-01-01 180000"]
+    assert names(plan['expired']) == ["Boss RC-500 Backup 2026-01-01 090000"]
+
+
+def test_newest_is_always_kept(backups):
+    plan = rc_prune.plan_prune(backups, last=0)
+    assert names(plan['kept']) == ["Boss RC-500 Backup 2026-01-05"]
+    assert plan['kept'][0]['keep'] == ["newest"]
+
+
+def test_size_budget_removes_oldest_first(tmp_path):
+    root = str(tmp_path)
+    for day in range(1, 5):
+        make_folder(root, f"Boss RC-500 Backup 2026-01-0{day}", size=100000)
+    plan = rc_prune.plan_prune(root, last=4, max_bytes=250000)
+    assert names(plan['kept']) == ["Boss RC-500 Backup 2026-01-04", "Boss RC-500 Backup 2026-01-03"]
+    assert all("budget" in b['reason'] for b in plan['expired'])
+
+
+def test_hardlinked_copies_free_nothing(tmp_path):
+    root = str(tmp_path)
+    first = make_folder(root, "Boss RC-500 Backup 2026-01-01")
+    second = os.path.join(root, "Boss RC-500 Backup 2026-01-02")
+    os.makedirs(second)
+    os.link(os.path.join(first, "001_Loop_Track_1.wav"), os.path.join(second, "001_Loop_Track_1.wav"))
+    plan = rc_prune.plan_prune(root, last=1)
+    assert names(plan['expired']) == ["Boss RC-500 Backup 2026-01-01"]
+    assert plan['freed'] == 0
+
+
+def test_dry_run_deletes_nothing(backups):
+    before = sorted(os.listdir(backups))
+    result = rc_prune.prune(backups, last=1, dry_run=True)
+    assert len(result['expired']) == 4 and not result['deleted']
+    assert sorted(os.listdir(backups)) == before
+
+
+def test_prune_leaves_other_files(backups):
+    result = rc_prune.prune(backups, last=2)
+    assert len(result['deleted']) == 3 and not result['errors']
+    assert sorted(os.listdir(backups)) == ["Boss RC-500 Backup 2026-01-04", "Boss RC-500 Backup 2026-01-05",
+                                           "Library", "MyTaxes.zip", "Photos"]
+
+
+def test_prune_snapshots_keeps_shared_chunks(tmp_path, pedal, empty_pedal):
+    root = str(tmp_path / "backups")
+    old = rc_core.backup_pedal(pedal, os.path.join(root, "Old"), archive=rc_core.STORE_ARCHIVE)
+    new = rc_core.backup_pedal(pedal, os.path.join(root, "New"), slots=[1, 2, 3], archive=rc_core.STORE_ARCHIVE)
+    set_snapshot_date(old['dest'], "2026-01-01 09:00:00")
+    set_snapshot_date(new['dest'], "2026-01-02 09:00:00")
+
+    result = rc_prune.prune(root, last=1)
+    assert result['deleted'] == [old['dest']]
+    assert result['chunks'] > 0
+
+    rc_core.restore_backup(new['dest'], empty_pedal)
+    expected = {k: v for k, v in wave_contents(pedal).items() if int(k[:3]) in (1, 2, 3)}
+    assert wave_contents(empty_pedal) == expected
+
+
+@pytest.mark.parametrize("text, size", [("500M", 500 * 1024 ** 2), ("1.5G", int(1.5 * 1024 ** 3)), ("2048", 2048)])
+def test_parse_size(text, size):
+    assert rc_prune.parse_size(text) == size
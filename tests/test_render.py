@@ -0,0 +1,46 @@
+"""Mixdowns and stems of one memory."""
+
+import os
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import BossRC500Audio as rc_audio
+
+
+@pytest.fixture
+def memory(pedal):
+    """The track paths of the first memory with two tracks."""
+    folders = sorted(os.listdir(pedal))
+    for slot in sorted({f[:3] for f in folders}):
+        tracks = [os.path.join(pedal, f, f + ".WAV") for f in folders if f.startswith(slot + "_")]
+        if len(tracks) == 2:
+            return tracks
+    pytest.skip("fixture pedal has no two-track memory")
+
+
+def test_mix_and_stems(tmp_path, memory):
+    mix, stems = str(tmp_path / "mix.wav"), str(tmp_path / "stems.wav")
+    result = rc_audio.render_memory(memory, mix, stems)
+    longest = max(rc_audio.read_wav_info(p)['frames'] for p in memory)
+    assert result['frames'] == longest
+    assert rc_audio.read_wav_info(mix)['channels'] == 2
+    assert rc_audio.read_wav_info(stems)['channels'] == result['channels'] == 4
+    assert rc_audio.read_wav_info(stems)['frames'] == longest
+
+
+def test_files_closed_when_stems_fail(tmp_path, memory, monkeypatch):
+    closed = []
+    for cls in (rc_audio.WavWriter, rc_audio._LoopReader):
+        def close(self, close=cls.close):
+            closed.append(self)
+            close(self)
+        monkeypatch.setattr(cls, "close", close)
+
+    mix = str(tmp_path / "mix.wav")
+    with pytest.raises(OSError):
+        rc_audio.render_memory(memory, mix, str(tmp_path / "missing" / "stems.wav"))
+    assert [w.path for w in closed if isinstance(w, rc_audio.WavWriter)] == [mix]
+    assert sum(isinstance(r, rc_audio._LoopReader) for r in closed) == len(memory)
+    assert rc_audio.read_wav_info(mix)['frames'] == 0
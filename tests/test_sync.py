@@ -0,0 +1,138 @@
+"""The sync plan between a pedal and a library folder."""
+
+import os
+import shutil
+import ntpath
+from types import SimpleNamespace
+
+import pytest
+
+import BossRC500Core as rc_core
+import BossRC500Sync as rc_sync
+
+
+def sides(wave_dir, library_dir):
+    """(pedal, library, names) as a sync scans them."""
+    _, pedal, names, library = rc_sync.scan_sides(wave_dir, library_dir)
+    return pedal, library, names
+
+
+def plan(wave_dir, library_dir, mode, deletes=False):
+    pedal, library, names = sides(wave_dir, library_dir)
+    state = rc_sync.SyncState(library_dir, {'pedal': wave_dir, 'library': library_dir})
+    return rc_sync.plan_sync(pedal, library, names, library_dir, mode, state, deletes)
+
+
+def synced(wave_dir, library_dir):
+    """Copies the pedal into the library and records the sync, like an applied TO_LIBRARY sync."""
+    for a in plan(wave_dir, library_dir, rc_sync.TO_LIBRARY):
+        shutil.copy2(a['src'], a['dst'])
+    pedal, library, _ = sides(wave_dir, library_dir)
+    state = rc_sync.SyncState(library_dir, {'pedal': wave_dir, 'library': library_dir})
+    state.record(pedal, library)
+    state.save()
+    return pedal, library
+
+
+def change(path, data=b"\x01\x02\x03\x04"):
+    with open(path, "r+b") as f:
+        f.seek(-len(data), os.SEEK_END)
+        f.write(data)
+
+
+def kinds(actions):
+    return {(a['slot'], a['track']): a['action'] for a in actions}
+
+
+@pytest.fixture
+def library(tmp_path):
+    path = tmp_path / "library"
+    path.mkdir()
+    return str(path)
+
+
+def test_empty_library_backs_up_everything(pedal, library):
+    actions = plan(pedal, library, rc_sync.TO_LIBRARY)
+    pedal_tracks, _, names = sides(pedal, library)
+    assert set(kinds(actions).values()) == {rc_sync.BACKUP}
+    assert {a['dst'] for a in actions} == {os.path.join(library, n) for n in names.values()}
+    assert len(actions) == len(pedal_tracks)
+
+
+@pytest.mark.parametrize("mode", rc_sync.SYNC_MODES)
+def test_nothing_to_do_after_sync(pedal, library, mode):
+    synced(pedal, library)
+    assert plan(pedal, library, mode, deletes=True) == []
+
+
+def test_two_way_follows_the_changed_side(pedal, library):
+    pedal_tracks, library_tracks = synced(pedal, library)
+    on_pedal, in_library, both = sorted(pedal_tracks)[:3]
+    change(pedal_tracks[on_pedal])
+    change(library_tracks[in_library])
+    change(pedal_tracks[both])
+    change(library_tracks[both], b"\x05\x06\x07\x08")
+
+    assert kinds(plan(pedal, library, rc_sync.TWO_WAY)) == {
+        on_pedal: rc_sync.BACKUP, in_library: rc_sync.RESTORE, both: rc_sync.CONFLICT}
+
+
+def test_one_way_modes_overwrite(pedal, library):
+    pedal_tracks, library_tracks = synced(pedal, library)
+    key = sorted(pedal_tracks)[0]
+    change(library_tracks[key])
+    assert kinds(plan(pedal, library, rc_sync.TO_LIBRARY)) == {key: rc_sync.BACKUP}
+    assert kinds(plan(pedal, library, rc_sync.TO_PEDAL)) == {key: rc_sync.RESTORE}
+
+
+def test_deletes_follow_the_side_that_deleted(pedal, library):
+    pedal_tracks, library_tracks = synced(pedal, library)
+    gone_from_pedal, gone_from_library = sorted(pedal_tracks)[:2]
+    shutil.rmtree(os.path.dirname(pedal_tracks[gone_from_pedal]))
+    os.remove(library_tracks[gone_from_library])
+
+    assert kinds(plan(pedal, library, rc_sync.TWO_WAY, deletes=True)) == {
+        gone_from_pedal: rc_sync.DELETE_LIBRARY, gone_from_library: rc_sync.DELETE_PEDAL}
+    # Without deletes the missing copies come back instead
+    assert kinds(plan(pedal, library, rc_sync.TWO_WAY)) == {
+        gone_from_pedal: rc_sync.RESTORE, gone_from_library: rc_sync.BACKUP}
+
+
+def test_renamed_memory_renames_library_file(pedal, library):
+    pedal_tracks, library_tracks = synced(pedal, library)
+    key = sorted(pedal_tracks)[0]
+    old_name = os.path.join(library, f"{key[0]:03d}_Old Name_Track_{key[1]}.wav")
+    os.replace(library_tracks[key], old_name)
+
+    actions = plan(pedal, library, rc_sync.TO_LIBRARY)
+    assert [(a['action'], a['src']) for a in actions] == [(rc_sync.RENAME, old_name)]
+    assert plan(pedal, library, rc_sync.TO_PEDAL) == []
+
+
+def test_run_sync_applies_and_records(pedal, library):
+    result = rc_sync.run_sync(pedal, library, rc_sync.TO_LIBRARY, apply=True)
+    assert result['applied'] and not result['errors']
+    pedal_tracks, library_tracks, _ = sides(pedal, library)
+    assert set(library_tracks) == set(pedal_tracks)
+    assert os.path.exists(os.path.join(library, rc_core.MANIFEST_NAME))
+    assert rc_sync.run_sync(pedal, library, rc_sync.TWO_WAY, deletes=True, apply=True)['pending'] is False
+
+
+def test_run_sync_asks_before_deleting_from_the_pedal(pedal, library):
+    pedal_tracks, library_tracks = synced(pedal, library)
+    os.remove(library_tracks[sorted(library_tracks)[0]])
+    asked = []
+    result = rc_sync.run_sync(pedal, library, rc_sync.TWO_WAY, deletes=True, apply=True,
+                              confirm=lambda plan: asked.append(plan['counts']))
+    assert asked == [{rc_sync.DELETE_PEDAL: 1}]
+    assert not result['applied']
+    assert set(sides(pedal, library)[0]) == set(pedal_tracks)
+
+
+def test_cache_key_with_roots_on_other_drives(monkeypatch):
+    monkeypatch.setattr(rc_sync, "os", SimpleNamespace(path=ntpath, sep="\\"))
+    state = rc_sync.SyncState.__new__(rc_sync.SyncState)
+    state.roots = {'pedal': "E:\\ROLAND\\WAVE", 'library': "D:\\Library"}
+    assert state.cache_key("D:\\Library\\001_1.WAV") == "library:001_1.WAV"
+    assert state.cache_key("E:\\ROLAND\\WAVE\\001_1\\001_1.WAV") == "pedal:001_1/001_1.WAV"
+    assert state.cache_key("C:\\Other\\x.WAV") == "C:\\Other\\x.WAV"
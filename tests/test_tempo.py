@@ -0,0 +1,44 @@
+"""Tempo estimation on generated click loops."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import BossRC500Audio as rc_audio
+import BossRC500Fixture as rc_fixture
+
+
+def write_clicks(path, bpm, seconds, sample_rate=rc_fixture.SAMPLE_RATE):
+    """A stereo float loop with a short noise burst on every beat."""
+    frames = int(seconds * sample_rate)
+    audio = np.zeros((frames, rc_fixture.CHANNELS), dtype=np.float32)
+    length = int(0.01 * sample_rate)
+    burst = np.random.default_rng(1).uniform(-1, 1, length) * np.exp(-np.arange(length) / (length / 5))
+    for beat in np.arange(0, seconds, 60.0 / bpm):
+        start = int(beat * sample_rate)
+        end = min(frames, start + length)
+        audio[start:end] += burst[:end - start, None]
+    with open(path, "wb") as f:
+        f.write(rc_fixture.wav_header(frames, sample_rate=sample_rate))
+        f.write(audio.astype("<f4").tobytes())
+    return str(path)
+
+
+@pytest.mark.parametrize("bpm, seconds", [(120, 4.0), (120, 2.0), (90, 4.0), (180, 1.0), (100, 7.2)])
+def test_short_loop_tempo(tmp_path, bpm, seconds):
+    result = rc_audio.estimate_tempo(write_clicks(tmp_path / "loop.wav", bpm, seconds))
+    assert result['bpm'] == pytest.approx(bpm, abs=0.5)
+    assert result['beats'] == round(seconds * bpm / 60)
+
+
+def test_loop_shorter_than_two_beats(tmp_path):
+    # One and a half beats at 60 BPM can't be measured, only guessed
+    result = rc_audio.estimate_tempo(write_clicks(tmp_path / "loop.wav", 60, 1.5))
+    assert result['confidence'] < 0.2
+
+
+def test_silent_loop(tmp_path):
+    path = tmp_path / "silent.wav"
+    frames = rc_fixture.SAMPLE_RATE * 2
+    path.write_bytes(rc_fixture.wav_header(frames) + bytes(frames * rc_fixture.CHANNELS * 4))
+    assert rc_audio.estimate_tempo(str(path))['bpm'] is None